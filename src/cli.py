@@ -0,0 +1,277 @@
+"""
+Headless command line interface to the script library, for cron and CI.
+
+    python3 src/cli.py list [--category CATEGORY] [--json]
+    python3 src/cli.py show NAME [--category CATEGORY] [--version N] [--info]
+    python3 src/cli.py run NAME [NAME ...] [--version N] [--jobs N] [--timeout S] [--json] [-- ARGS]
+    python3 src/cli.py run --category CATEGORY --all [--jobs N] [--json]
+    python3 src/cli.py pipeline list [--json]
+    python3 src/cli.py pipeline run NAME [--json]
+    python3 src/cli.py search QUERY [--regex] [--case-sensitive] [--limit N] [--json]
+
+Scripts are named as they were saved, optionally as CATEGORY/NAME, and run
+from the current directory exactly like the GUI runs them. Exit status is 0
+when every script exited with 0.
+"""
+import os
+import sys
+import re
+import json
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from services.script_manager import ScriptManager
+from services.headless import run_headless
+from services.run_history import RunHistory
+from services.run_metrics import RunMetrics
+from services.pipeline import Pipeline, PipelineError, PipelineRunner, resolve_sources
+
+class ScriptNotFound(Exception):
+    pass
+
+def find_script(manager, name, category=None):
+    """Return (filepath, metadata) of the saved script called name"""
+    matches = manager.find_scripts(name, category)
+    if not matches:
+        raise ScriptNotFound(f"No script named '{name}'" + (f" in category '{category}'" if category else ''))
+    if len(matches) > 1:
+        categories = ', '.join(sorted(metadata.get('category', '?') for _, metadata in matches))
+        raise ScriptNotFound(f"'{name}' exists in several categories ({categories}); use CATEGORY/NAME")
+    return matches[0]
+
+def command_list(manager, args):
+    scripts = sorted(manager.list_scripts(args.category),
+                     key=lambda s: (s[1].get('category', ''), s[1].get('name', '')))
+    if args.json:
+        print(json.dumps([dict(metadata, filepath=filepath) for filepath, metadata in scripts], indent=2))
+        return 0
+    for filepath, metadata in scripts:
+        print(f"{metadata.get('category', ''):<12} {metadata.get('name', ''):<30} "
+              f"v{metadata.get('current_version', '?'):<4} {metadata.get('description', '')}")
+    return 0
+
+def command_show(manager, args):
+    filepath, _ = find_script(manager, args.name, args.category)
+    content, metadata, versions = manager.load_script(filepath, args.version)
+    if content is None:
+        raise ScriptNotFound(f"Cannot read '{args.name}'")
+    if args.version is not None and not 1 <= args.version <= len(versions):
+        raise ScriptNotFound(f"'{metadata.get('name')}' has no version {args.version}")
+    if args.info:
+        info = dict(metadata, filepath=filepath,
+                    versions=[{k: v for k, v in version.items() if k != 'content'} for version in versions])
+        print(json.dumps(info, indent=2))
+    else:
+        sys.stdout.write(content)
+    return 0
+
+def command_search(manager, args):
+    try:
+        results = manager.search_scripts(args.query, args.regex, args.case_sensitive, args.limit)
+    except re.error as e:
+        print(f"Error: invalid regular expression: {e}", file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0 if results else 1
+    for result in results:
+        metadata = result['metadata']
+        print(f"{metadata.get('category', '')}/{metadata.get('name', '')} ({result['hit_count']} lines"
+              f"{', metadata' if result['metadata_match'] else ''})")
+        for hit in result['hits']:
+            where = 'current' if hit['current'] else f"v{hit['first_version']}-v{hit['last_version']}"
+            print(f"    {hit['line_number']:>5} [{where}] {hit['text'].strip()}")
+    return 0 if results else 1
+
+def run_one(filepath, metadata, content, version, argv, timeout):
+    name = metadata.get('name', os.path.splitext(os.path.basename(filepath))[0])
+    result = run_headless(content, filename=os.path.join(os.getcwd(), f"{name}.py"),
+                          argv=argv, timeout=timeout, limits=metadata.get('limits'))
+    result.update({
+        'script': name,
+        'category': metadata.get('category'),
+        'version': version,
+        'filepath': filepath
+    })
+    return result
+
+def command_run(manager, args, argv):
+    if args.all:
+        if not args.category:
+            raise ScriptNotFound("--all needs --category")
+        targets = sorted(manager.list_scripts(args.category), key=lambda s: s[1].get('name', ''))
+    elif args.names:
+        targets = [find_script(manager, name, args.category) for name in args.names]
+    else:
+        raise ScriptNotFound("Name at least one script, or use --category with --all")
+
+    jobs = []
+    for filepath, metadata in targets:
+        content, metadata, versions = manager.load_script(filepath, args.version)
+        if args.version and not 1 <= args.version <= len(versions):
+            raise ScriptNotFound(f"'{metadata.get('name')}' has no version {args.version}")
+        version = args.version or metadata.get('current_version', len(versions))
+        jobs.append((filepath, metadata, content, version))
+
+    history = None if args.no_history else RunHistory()
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = [pool.submit(run_one, *job, argv, args.timeout) for job in jobs]
+        results = []
+        for future, (filepath, metadata, content, version) in zip(futures, jobs):
+            result = future.result()
+            metrics = RunMetrics(result['duration'], result['usage'])
+            result['metrics'] = metrics.to_dict()
+            if history is not None:
+                history.record(result['script'], content, result['exit_code'], metrics, mode='headless',
+                               filepath=filepath, version=version,
+                               output=result['stdout'] + result['stderr'])
+            if not args.json:
+                report_result(result, single=len(jobs) == 1)
+            results.append(result)
+
+    if args.json:
+        for result in results:
+            del result['usage']
+        print(json.dumps(results, indent=2))
+    return 0 if all(result['exit_code'] == 0 for result in results) else 1
+
+def command_pipeline(manager, args):
+    if args.action == 'list':
+        pipelines = [definition for _, definition in manager.list_pipelines()]
+        if args.json:
+            print(json.dumps(pipelines, indent=2))
+            return 0
+        for definition in pipelines:
+            print(f"{definition.get('name', ''):<30} {len(definition.get('nodes', [])):>3} nodes  "
+                  f"{definition.get('description', '')}")
+        return 0
+
+    if not args.name:
+        raise ScriptNotFound("Name the pipeline to run")
+    definition = manager.load_pipeline(args.name)
+    if definition is None:
+        raise ScriptNotFound(f"No pipeline named '{args.name}'")
+    pipeline = Pipeline.from_dict(definition)
+    try:
+        pipeline.validate()
+        sources = resolve_sources(manager, pipeline)
+    except PipelineError as e:
+        raise ScriptNotFound(str(e))
+
+    lock = threading.Lock()
+    captured = {'stdout': [], 'stderr': []}
+    def write(stream, text):
+        with lock:
+            if args.json:
+                captured[stream].append(text)
+            else:
+                stream = sys.stdout if stream == 'stdout' else sys.stderr
+                stream.write(text)
+                stream.flush()
+
+    def report_node(event):
+        if event['exit_code'] is not None and not args.json:
+            write('stderr', f"{event['node']} ({event['script']}): {event['status'].lower()}, "
+                            f"exit {event['exit_code']} in {event['duration']:.2f}s\n")
+
+    runner = PipelineRunner(
+        pipeline, sources,
+        on_output=lambda node_id, text: write('stdout', text),
+        on_error=lambda node_id, text: write('stderr', ''.join(
+            f"[{node_id}] {line}" for line in text.splitlines(True))),
+        on_node=report_node)
+    exit_code = runner.run()
+    if args.json:
+        print(json.dumps({
+            'pipeline': pipeline.name,
+            'exit_code': exit_code,
+            'stdout': ''.join(captured['stdout']),
+            'stderr': ''.join(captured['stderr']),
+            'nodes': [{
+                'node': node.node_id,
+                'script': node.definition.get('script'),
+                'status': node.status,
+                'exit_code': node.exit_code,
+                'metrics': RunMetrics(node.duration, node.usage).to_dict()
+            } for node in runner.nodes.values()]
+        }, indent=2))
+    return exit_code
+
+def report_result(result, single=False):
+    """Print a finished run; a single script's output is passed through unchanged"""
+    if single:
+        sys.stdout.write(result['stdout'])
+        sys.stderr.write(result['stderr'])
+    if result.get('limit_exceeded'):
+        status = f"killed: exceeded {result['limit_exceeded']}"
+    else:
+        status = 'timed out' if result['timed_out'] else f"exit {result['exit_code']}"
+    print(f"{result['category']}/{result['script']} v{result['version']}: {status} "
+          f"in {result['duration']:.2f}s", file=sys.stderr if single else sys.stdout)
+    if not single and result['exit_code'] != 0 and result['stderr']:
+        for line in result['stderr'].rstrip('\n').splitlines()[-10:]:
+            print(f"    {line}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='bbrun-cli', description="Run saved scripts without the GUI.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = commands.add_parser('list', help="List saved scripts")
+    list_parser.add_argument('--category', '-c')
+    list_parser.add_argument('--json', action='store_true')
+
+    show_parser = commands.add_parser('show', help="Print a script's source or metadata")
+    show_parser.add_argument('name')
+    show_parser.add_argument('--category', '-c')
+    show_parser.add_argument('--version', '-v', type=int)
+    show_parser.add_argument('--info', action='store_true', help="Print metadata and version list as JSON")
+
+    run_parser = commands.add_parser('run', help="Run one or more scripts (arguments after --)")
+    run_parser.add_argument('names', nargs='*')
+    run_parser.add_argument('--category', '-c')
+    run_parser.add_argument('--all', action='store_true', help="Run every script in --category")
+    run_parser.add_argument('--version', '-v', type=int)
+    run_parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 2)
+    run_parser.add_argument('--timeout', type=float)
+    run_parser.add_argument('--json', action='store_true')
+    run_parser.add_argument('--no-history', action='store_true', help="Do not record runs in the run history")
+
+    pipeline_parser = commands.add_parser('pipeline', help="List or run saved pipelines")
+    pipeline_parser.add_argument('action', choices=['list', 'run'])
+    pipeline_parser.add_argument('name', nargs='?')
+    pipeline_parser.add_argument('--json', action='store_true',
+                                 help="Print definitions, or the run's output and node results, as JSON")
+
+    search_parser = commands.add_parser('search', help="Search the content of every version and script metadata")
+    search_parser.add_argument('query')
+    search_parser.add_argument('--regex', '-e', action='store_true')
+    search_parser.add_argument('--case-sensitive', '-s', action='store_true')
+    search_parser.add_argument('--limit', '-n', type=int, default=100)
+    search_parser.add_argument('--json', action='store_true')
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    script_argv = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, script_argv = argv[:split], argv[split + 1:]
+
+    args = build_parser().parse_args(argv)
+    manager = ScriptManager()
+    try:
+        if args.command == 'list':
+            return command_list(manager, args)
+        if args.command == 'show':
+            return command_show(manager, args)
+        if args.command == 'search':
+            return command_search(manager, args)
+        if args.command == 'pipeline':
+            return command_pipeline(manager, args)
+        return command_run(manager, args, script_argv)
+    except ScriptNotFound as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+if __name__ == '__main__':
+    sys.exit(main())
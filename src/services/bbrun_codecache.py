@@ -0,0 +1,144 @@
+"""
+Compiled-code cache for bbrun_runner.py.
+
+Code objects are marshalled to ~/.python_executor/cache, keyed by a hash of
+the source and the filename it is compiled under, and namespaced by the
+interpreter's cache tag so different Python versions never share entries.
+Warm workers also keep the most recently used code objects in memory.
+The disk is left alone when the cache is not persistent, as for stdin runs,
+and when the cache directory belongs to another user, as for sudo runs.
+Only the standard library may be used here.
+"""
+import collections
+import hashlib
+import importlib.util
+import marshal
+import os
+import sys
+import time
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.python_executor', 'cache')
+MIN_SOURCE_BYTES = 8 * 1024        # smaller sources compile faster than a cache lookup
+MAX_CACHE_BYTES = 128 * 1024 * 1024
+MAX_AGE_SECONDS = 30 * 24 * 3600
+MEMORY_ENTRIES = 32
+
+class CodeCache:
+    """Compile source, reusing code objects from memory or disk when possible"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_age=MAX_AGE_SECONDS,
+                 min_source_bytes=MIN_SOURCE_BYTES, persistent=True):
+        self.cache_dir = cache_dir
+        self.persistent = persistent and owned_by_current_user(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.min_source_bytes = min_source_bytes
+        self.prefix = f"{sys.implementation.cache_tag}-"
+        self.memory = collections.OrderedDict()
+
+    def compile(self, source, filename):
+        if len(source) < self.min_source_bytes:
+            return compile(source, filename, 'exec')
+
+        key = hashlib.sha256(f"{filename}\0{source}".encode('utf-8', 'surrogateescape')).hexdigest()
+        code = self.memory.get(key)
+        if code is None and self.persistent:
+            code = self._load(key)
+        if code is None:
+            code = compile(source, filename, 'exec')
+            if self.persistent:
+                self._store(key, code)
+
+        self.memory[key] = code
+        self.memory.move_to_end(key)
+        while len(self.memory) > MEMORY_ENTRIES:
+            self.memory.popitem(last=False)
+        return code
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{self.prefix}{key}.code")
+
+    def _load(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        magic = importlib.util.MAGIC_NUMBER
+        if not data.startswith(magic):
+            return None
+        try:
+            code = marshal.loads(data[len(magic):])
+        except (EOFError, ValueError, TypeError):
+            return None
+        # The modification time doubles as the last-used time for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return code
+
+    def _store(self, key, code):
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(importlib.util.MAGIC_NUMBER + marshal.dumps(code))
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self):
+        """Drop entries unused for max_age, then the least recently used beyond max_bytes"""
+        entries = []
+        now = time.time()
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith('.code'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.max_age:
+                _unlink(path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            _unlink(path)
+            total -= size
+
+def owned_by_current_user(path):
+    """True if path, or the closest of its parents that exists, belongs to this process's user"""
+    path = os.path.abspath(path)
+    while True:
+        try:
+            return os.stat(path).st_uid == os.geteuid()
+        except FileNotFoundError:
+            parent = os.path.dirname(path)
+            if parent == path:
+                return False
+            path = parent
+        except OSError:
+            return False
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
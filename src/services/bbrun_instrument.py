@@ -0,0 +1,247 @@
+"""
+Child-side instrumentation for bbrun_runner.py.
+
+Each instrument wraps the execution of the user's code with start() and
+stop(), then builds a JSON-serialisable report that the runner sends back to
+the GUI. Instruments may also stream intermediate records while the code runs
+through send(). Only the standard library may be used here.
+"""
+import os
+import sys
+import time
+import threading
+
+_RUNNER_FILES = {
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bbrun_runner.py'),
+    os.path.abspath(__file__)
+}
+
+def is_runner_file(filename):
+    return os.path.abspath(filename) in _RUNNER_FILES if filename else False
+
+class Instrument:
+    """Base class: an instrument that records nothing"""
+    report_type = None
+    send = staticmethod(lambda record: None)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def report(self):
+        return None
+
+class FunctionProfiler(Instrument):
+    """Deterministic function-level profile using cProfile"""
+    report_type = 'profile'
+
+    def __init__(self, filename=None, limit=200):
+        import cProfile
+        self.limit = limit
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+
+    def report(self):
+        import pstats
+        stats = pstats.Stats(self.profiler).stats
+        functions = []
+        for (filename, line, name), (primitive_calls, calls, self_time, cumulative_time, _) in stats.items():
+            if is_runner_file(filename):
+                continue
+            functions.append({
+                'file': filename,
+                'line': line,
+                'name': name,
+                'calls': calls,
+                'primitive_calls': primitive_calls,
+                'self_time': self_time,
+                'cumulative_time': cumulative_time
+            })
+
+        total_time = sum(f['self_time'] for f in functions)
+        functions.sort(key=lambda f: f['cumulative_time'], reverse=True)
+        return {
+            'type': self.report_type,
+            'total_time': total_time,
+            'functions': functions[:self.limit]
+        }
+
+class LineProfiler(Instrument):
+    """
+    Hit counts and time per line of the script itself.
+    Time between two line events is charged to the earlier line, so calls into
+    other modules count towards the script line that made them. Uses
+    sys.monitoring on Python 3.12+ and sys.settrace otherwise.
+    """
+    report_type = 'lines'
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.hits = {}
+        self.times = {}
+        self._last_line = None
+        self._last_time = 0.0
+        self._monitoring = getattr(sys, 'monitoring', None)
+        self._tool_id = None
+
+    def _record(self, line):
+        now = time.perf_counter()
+        if self._last_line is not None:
+            self.times[self._last_line] = self.times.get(self._last_line, 0.0) + now - self._last_time
+        self.hits[line] = self.hits.get(line, 0) + 1
+        self._last_line = line
+        self._last_time = time.perf_counter()
+
+    def start(self):
+        if self._monitoring is not None:
+            self._start_monitoring()
+        else:
+            sys.settrace(self._trace)
+
+    def _start_monitoring(self):
+        monitoring = self._monitoring
+        for tool_id in (monitoring.PROFILER_ID, monitoring.OPTIMIZER_ID):
+            try:
+                monitoring.use_tool_id(tool_id, 'bbrun')
+            except ValueError:
+                continue
+            self._tool_id = tool_id
+            break
+        else:
+            # Another tool owns the slots; fall back to tracing
+            self._monitoring = None
+            sys.settrace(self._trace)
+            return
+
+        def on_line(code, line):
+            if code.co_filename != self.filename:
+                return monitoring.DISABLE
+            self._record(line)
+
+        monitoring.register_callback(self._tool_id, monitoring.events.LINE, on_line)
+        monitoring.set_events(self._tool_id, monitoring.events.LINE)
+
+    def _trace(self, frame, event, arg):
+        if frame.f_code.co_filename != self.filename:
+            return None
+        return self._trace_lines
+
+    def _trace_lines(self, frame, event, arg):
+        if event == 'line':
+            self._record(frame.f_lineno)
+        return self._trace_lines
+
+    def stop(self):
+        if self._monitoring is not None and self._tool_id is not None:
+            self._monitoring.set_events(self._tool_id, 0)
+            self._monitoring.register_callback(self._tool_id, self._monitoring.events.LINE, None)
+            self._monitoring.free_tool_id(self._tool_id)
+        else:
+            sys.settrace(None)
+        if self._last_line is not None:
+            self.times[self._last_line] = (self.times.get(self._last_line, 0.0)
+                                           + time.perf_counter() - self._last_time)
+            self._last_line = None
+
+    def report(self):
+        return {
+            'type': self.report_type,
+            'total_time': sum(self.times.values()),
+            'lines': {str(line): [hits, self.times.get(line, 0.0)]
+                      for line, hits in self.hits.items()}
+        }
+
+class MemoryProfiler(Instrument):
+    """
+    Traces allocations with tracemalloc. Streams a 'memory_sample' record with
+    current and peak traced memory every sample_interval seconds, and reports
+    the top allocation sites grouped by line when the code finishes.
+    """
+    report_type = 'memory'
+
+    def __init__(self, filename=None, sample_interval=0.5, limit=100):
+        self.filename = filename
+        self.sample_interval = sample_interval
+        self.limit = limit
+        self.timeline = []
+        self.snapshot = None
+        self._started = 0.0
+        self._stop_sampling = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        import tracemalloc
+        # Start the sampler first so its own setup is not traced
+        self._started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._sample_loop, name='bbrun-memory', daemon=True)
+        self._sampler.start()
+        tracemalloc.start()
+
+    def _sample(self):
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+        sample = [round(time.perf_counter() - self._started, 3), current, peak]
+        self.timeline.append(sample)
+        return sample
+
+    def _sample_loop(self):
+        while not self._stop_sampling.wait(self.sample_interval):
+            sample = self._sample()
+            if sample is None:
+                continue
+            time_offset, current, peak = sample
+            self.send({'type': 'memory_sample', 'time': time_offset, 'current': current, 'peak': peak})
+
+    def stop(self):
+        import tracemalloc
+        self._stop_sampling.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self._sample()
+        self.snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+    def report(self):
+        import tracemalloc
+        ignored = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        ignored += [tracemalloc.Filter(False, path) for path in _RUNNER_FILES]
+        statistics = self.snapshot.filter_traces(ignored).statistics('lineno')
+
+        sites = []
+        for stat in statistics[:self.limit]:
+            frame = stat.traceback[0]
+            sites.append({
+                'file': frame.filename,
+                'line': frame.lineno,
+                'size': stat.size,
+                'count': stat.count
+            })
+        return {
+            'type': self.report_type,
+            'peak': max((peak for _, _, peak in self.timeline), default=0),
+            'total_size': sum(stat.size for stat in statistics),
+            'sites': sites,
+            'timeline': self.timeline
+        }
+
+INSTRUMENTS = {
+    'profile': FunctionProfiler,
+    'lines': LineProfiler,
+    'memory': MemoryProfiler
+}
+
+def create(name, filename=None, send=None):
+    """Build the named instrument, or a no-op one when name is empty"""
+    instrument = INSTRUMENTS[name](filename) if name else Instrument()
+    if send is not None:
+        instrument.send = send
+    return instrument
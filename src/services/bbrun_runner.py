@@ -0,0 +1,598 @@
+"""
+Child-side runner for bbrun.
+
+This file is executed directly by the interpreter (never imported by the GUI),
+so it must only depend on the standard library. In worker mode it reads JSON
+requests from stdin, one per line, and writes JSON records to stdout:
+
+    {"type": "ready", "pid": 123}
+    {"type": "stdout", "data": "..."}
+    {"type": "stderr", "data": "..."}
+    {"type": "done", "id": 1, "exit_code": 0, "duration": 0.01}
+
+A "run" request executes in a fresh __main__ module, while "exec" requests
+share one persistent __main__ module for the lifetime of the worker.
+A request may name modules to drop from sys.modules first ("invalidate") and
+ask for "modules" records listing the local modules it has imported so far
+("report_modules"). After a "run" the modules imported from under its cwd are
+dropped, so the next run imports their current source, unless it asks to
+"keep_modules" as watch mode does.
+
+The records go out on a private duplicate of the original stdout. Before any
+user code runs, fds 1 and 2 are pointed at pipes whose data is forwarded as
+"stdout" and "stderr" records, so output written at the C level or by child
+processes can never end up inside a protocol line.
+
+{"op": "interrupt", "id": 1} raises KeyboardInterrupt in request 1 if it is
+still running. {"op": "preload", "modules": [...], "budget": bytes} imports
+modules for later runs and answers with a "preloaded" record.
+
+In stdin mode the source is read from stdin and executed once with plain
+stdout/stderr, so a run never touches the filesystem:
+
+    python3 -u bbrun_runner.py --stdin --filename /path/name.py -- arg1 arg2
+
+With --file the source is read from the given path instead. Single runs end
+by writing JSON records to stderr, each on its own line prefixed with
+RECORD_MARKER: instrument records (--instrument profile|lines|memory) and
+finally {"type": "metrics", "usage": {...}}.
+
+--process-group makes the run the leader of a new process group so the parent
+can signal it together with its children. --limits '{"memory_mb": 512,
+"cpu_seconds": 60}' caps address space and CPU time; exceeding one sends
+{"type": "limit_exceeded", "message": "..."} before the run ends.
+"""
+import builtins
+import codecs
+import contextlib
+import fcntl
+import importlib
+import importlib.util
+import io
+import json
+import linecache
+import os
+import queue
+import resource
+import select
+import signal
+import sys
+import termios
+import threading
+import time
+import traceback
+import types
+
+import bbrun_codecache
+import bbrun_instrument
+
+RECORD_MARKER = '\x1e'
+
+_protocol_out = sys.stdout
+_protocol_lock = threading.Lock()
+code_cache = bbrun_codecache.CodeCache()
+memory_limit_mb = None
+_RUNNER_FILES = {__file__, bbrun_codecache.__file__}
+
+def emit(record):
+    """Write a single protocol record to the parent"""
+    line = json.dumps(record) + '\n'
+    with _protocol_lock:
+        _protocol_out.write(line)
+        _protocol_out.flush()
+
+class StreamProxy:
+    """File-like object that forwards writes to the parent as protocol records"""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.encoding = 'utf-8'
+        self.errors = 'replace'
+
+    def write(self, data):
+        if data:
+            emit({'type': self.kind, 'data': str(data)})
+        return len(data)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+    def fileno(self):
+        # C extensions and subprocesses write to the captured descriptors
+        return 1 if self.kind == 'stdout' else 2
+
+class FdCapture:
+    """
+    Points a file descriptor at a pipe and forwards whatever is written to it
+    as protocol records of kind, from a thread of its own.
+    """
+
+    def __init__(self, fd, kind):
+        self.kind = kind
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.lock = threading.Lock()
+        self.read_fd, write_fd = os.pipe()
+        os.dup2(write_fd, fd)
+        os.close(write_fd)
+        threading.Thread(target=self._forward, name=f'bbrun-{kind}', daemon=True).start()
+
+    def _forward(self):
+        while True:
+            select.select([self.read_fd], [], [])
+            # Data only leaves the pipe under the lock, see flush()
+            with self.lock:
+                data = os.read(self.read_fd, 65536)
+                if not data:
+                    return
+                text = self.decoder.decode(data)
+                if text:
+                    emit({'type': self.kind, 'data': text})
+
+    def flush(self):
+        """Wait until everything written to the descriptor so far has been forwarded"""
+        available = bytearray(4)
+        while True:
+            with self.lock:
+                fcntl.ioctl(self.read_fd, termios.FIONREAD, available)
+                if int.from_bytes(available, sys.byteorder) == 0:
+                    return
+            time.sleep(0.001)
+
+def capture_output():
+    """Move the protocol off fd 1 and capture fds 1 and 2; returns the captures"""
+    global _protocol_out
+    # os.dup() is not inheritable, so child processes never see the protocol
+    _protocol_out = os.fdopen(os.dup(1), 'w', encoding='utf-8')
+    return [FdCapture(1, 'stdout'), FdCapture(2, 'stderr')]
+
+def register_source(filename, source):
+    """Make the source visible to traceback/linecache without writing a file"""
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+def new_main_module():
+    module = types.ModuleType('__main__')
+    module.__dict__['__builtins__'] = builtins
+    return module
+
+def execute(source, filename, argv, module=None, instrument=None):
+    """
+    Execute source as __main__ and return its exit code.
+    Tracebacks are printed to sys.stderr with the runner frames removed.
+    """
+    instrument = instrument or bbrun_instrument.Instrument()
+    if module is None:
+        module = new_main_module()
+    namespace = module.__dict__
+    namespace['__file__'] = filename
+
+    saved_main = sys.modules.get('__main__')
+    saved_argv = sys.argv
+    sys.modules['__main__'] = module
+    sys.argv = [filename] + list(argv)
+    register_source(filename, source)
+
+    exit_code = 0
+    try:
+        code = code_cache.compile(source, filename)
+        instrument.start()
+        try:
+            exec(code, namespace)
+        finally:
+            instrument.stop()
+    except SystemExit as e:
+        exit_code = exit_code_from(e)
+    except BaseException:
+        exc_type, exc_value, tb = sys.exc_info()
+        # Skip the runner's own frames so the traceback starts in user code
+        while tb is not None and tb.tb_frame.f_code.co_filename in _RUNNER_FILES:
+            tb = tb.tb_next
+        traceback.print_exception(exc_type, exc_value, tb)
+        exit_code = 130 if exc_type is KeyboardInterrupt else 1
+        if exc_type is MemoryError and memory_limit_mb:
+            write_record({'type': 'limit_exceeded', 'message': f"memory limit of {memory_limit_mb} MB"})
+    finally:
+        sys.argv = saved_argv
+        if saved_main is not None:
+            sys.modules['__main__'] = saved_main
+
+    return exit_code
+
+def usage_snapshot():
+    """Resource usage of this process and its waited-for children"""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss_scale = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'user_cpu': own.ru_utime + children.ru_utime,
+        'system_cpu': own.ru_stime + children.ru_stime,
+        'max_rss': max(own.ru_maxrss, children.ru_maxrss) * rss_scale,
+        'block_input': own.ru_inblock + children.ru_inblock,
+        'block_output': own.ru_oublock + children.ru_oublock,
+        'voluntary_switches': own.ru_nvcsw + children.ru_nvcsw,
+        'involuntary_switches': own.ru_nivcsw + children.ru_nivcsw
+    }
+
+def usage_delta(before, after):
+    """Usage consumed between two snapshots; peak RSS cannot be reset so it is kept"""
+    delta = {key: after[key] - before[key] for key in after}
+    delta['max_rss'] = after['max_rss']
+    return delta
+
+def write_record(record):
+    """Send a marked record on stderr, bypassing any user replacement of sys.stderr"""
+    data = (RECORD_MARKER + json.dumps(record) + '\n').encode()
+    while data:
+        data = data[os.write(2, data):]
+
+def exit_code_from(system_exit):
+    code = system_exit.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+def local_modules(cwd):
+    """Imported modules whose files live under cwd, as {name: path}"""
+    prefix = os.path.join(os.path.abspath(cwd), '')
+    modules = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if name != '__main__' and isinstance(path, str) and os.path.abspath(path).startswith(prefix):
+            modules[name] = os.path.abspath(path)
+    return modules
+
+class ModuleReporter:
+    """Send the local modules a run has imported while it runs, and once more at the end"""
+    INTERVAL = 0.5
+
+    def __init__(self, request_id, cwd):
+        self.request_id = request_id
+        self.cwd = cwd
+        self.last = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name='bbrun-modules', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.report()
+
+    def _loop(self):
+        while not self._stop.wait(self.INTERVAL):
+            self.report()
+
+    def report(self):
+        modules = local_modules(self.cwd)
+        if modules != self.last:
+            self.last = modules
+            emit({'type': 'modules', 'id': self.request_id, 'modules': modules})
+
+def invalidate_module(name):
+    """Forget a module so the next import runs its source again"""
+    module = sys.modules.pop(name, None)
+    if module is None:
+        return
+    # 'from pkg import mod' would otherwise find the old module on its package
+    parent, _, child = name.rpartition('.')
+    if parent in sys.modules and getattr(sys.modules[parent], child, None) is module:
+        delattr(sys.modules[parent], child)
+    # An edit within the same second and of the same size passes the pyc check
+    cached = getattr(module, '__cached__', None)
+    if cached:
+        try:
+            os.remove(cached)
+        except OSError:
+            pass
+
+def flush_output(captures):
+    """Forward pending output before a record that ends a request"""
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+    for capture in captures:
+        capture.flush()
+
+def drop_local_modules(cwd):
+    """Forget the modules imported from under cwd; they are the user's own and may change"""
+    for name in local_modules(cwd):
+        invalidate_module(name)
+
+def handle_run(request, module=None, captures=()):
+    """Run one request and report completion, in a clean namespace unless module is given"""
+    cwd = request.get('cwd') or os.getcwd()
+    try:
+        os.chdir(cwd)
+    except OSError as e:
+        emit({'type': 'stderr', 'data': f"Cannot change directory to {cwd}: {e}\n"})
+    sys.path[0] = cwd
+
+    # Pad with blank lines so a selection reports its real line numbers
+    source = '\n' * (request.get('first_line', 1) - 1) + request.get('code', '')
+
+    # Modules whose files changed are imported afresh by this run
+    for name in request.get('invalidate', []):
+        invalidate_module(name)
+
+    # Extra environment variables only last for this request
+    env = request.get('env') or {}
+    saved_env = {name: os.environ.get(name) for name in env}
+    os.environ.update(env)
+
+    reporter = ModuleReporter(request.get('id'), cwd) if request.get('report_modules') else None
+    if reporter is not None:
+        reporter.start()
+
+    usage_before = usage_snapshot()
+    start = time.perf_counter()
+    try:
+        exit_code = execute(source,
+                            request.get('filename', '<bbrun>'),
+                            request.get('argv', []),
+                            module)
+    finally:
+        if reporter is not None:
+            reporter.stop()
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    flush_output(captures)
+    emit({
+        'type': 'done',
+        'id': request.get('id'),
+        'exit_code': exit_code,
+        'duration': time.perf_counter() - start,
+        'metrics': usage_delta(usage_before, usage_snapshot())
+    })
+
+def read_requests(stream, requests, current):
+    """
+    Read requests on a thread of their own so an "interrupt" can reach code that
+    is still running: it raises KeyboardInterrupt in the request it names.
+    Privileged workers need this because the parent cannot signal them.
+    """
+    for line in stream:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            continue
+        if request.get('op') == 'interrupt':
+            if request.get('id') is not None and request.get('id') == current.get('id'):
+                os.kill(os.getpid(), signal.SIGINT)
+            continue
+        requests.put(request)
+    if current.get('id') is not None:
+        # The parent closed the pipe mid-run; nobody is left to read the output
+        os._exit(1)
+    requests.put(None)
+
+def current_rss():
+    """Resident set size of this process in bytes"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        rss_scale = 1 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * rss_scale
+
+def is_local_module(name, cwd):
+    """True for modules that live under cwd; those are the user's own and may change"""
+    try:
+        # Only the top-level name, finding a submodule would import its package
+        spec = importlib.util.find_spec(name.partition('.')[0])
+    except (ImportError, ValueError):
+        return False
+    origin = spec.origin if spec is not None else None
+    return bool(origin) and os.path.abspath(origin).startswith(os.path.join(cwd, ''))
+
+def handle_preload(request, baseline_rss):
+    """
+    Import modules ahead of the runs that will need them, stopping once the
+    worker has grown by more than the request's memory budget.
+    """
+    cwd = request.get('cwd') or os.getcwd()
+    budget = request.get('budget', 0)
+    loaded, failed, skipped = [], [], []
+    over_budget = False
+    for name in request.get('modules', []):
+        if name in sys.modules:
+            loaded.append(name)
+            continue
+        over_budget = over_budget or current_rss() - baseline_rss > budget
+        if over_budget:
+            skipped.append(name)
+            continue
+        if is_local_module(name, cwd):
+            skipped.append(name)
+            continue
+        try:
+            # Whatever the import prints is not part of any run
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                importlib.import_module(name)
+            loaded.append(name)
+        except Exception:
+            failed.append(name)
+    emit({
+        'type': 'preloaded',
+        'id': request.get('id'),
+        'loaded': loaded,
+        'failed': failed,
+        'skipped': skipped,
+        'over_budget': over_budget,
+        'rss': current_rss()
+    })
+
+def worker_loop():
+    """Serve run requests from stdin until it is closed"""
+    captures = capture_output()
+    sys.stdout = StreamProxy('stdout')
+    sys.stderr = StreamProxy('stderr')
+    sys.stdin = open(os.devnull)
+    stream = os.fdopen(os.dup(0), 'r')
+    os.dup2(sys.stdin.fileno(), 0)
+
+    kernel_module = None
+    baseline_rss = current_rss()
+    requests = queue.Queue()
+    current = {'id': None}
+    threading.Thread(target=read_requests, args=(stream, requests, current), daemon=True).start()
+
+    emit({'type': 'ready', 'pid': os.getpid()})
+    while True:
+        try:
+            request = requests.get()
+        except KeyboardInterrupt:
+            # An interrupt that arrived after the code finished
+            continue
+        if request is None:
+            break
+
+        op = request.get('op')
+        if op == 'exit':
+            break
+        try:
+            current['id'] = request.get('id')
+            try:
+                if op == 'run':
+                    try:
+                        handle_run(request, captures=captures)
+                    finally:
+                        if not request.get('keep_modules'):
+                            drop_local_modules(request.get('cwd') or os.getcwd())
+                elif op == 'exec':
+                    if kernel_module is None:
+                        kernel_module = new_main_module()
+                    handle_run(request, kernel_module, captures)
+                elif op == 'preload':
+                    handle_preload(request, baseline_rss)
+            finally:
+                current['id'] = None
+        except KeyboardInterrupt:
+            flush_output(captures)
+            emit({'type': 'done', 'id': request.get('id'), 'exit_code': 130, 'duration': 0.0})
+
+def run_from_stdin(filename, argv, instrument_name=None):
+    """Read the whole script from stdin, then execute it as __main__"""
+    source = sys.stdin.buffer.read().decode('utf-8', errors='replace')
+    # The script gets an empty stdin rather than the rest of the pipe
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    sys.stdin = open(0, closefd=False)
+    return run_once(source, filename, argv, instrument_name)
+
+def run_from_file(path, argv, instrument_name=None, filename=None):
+    """Execute a script file, reporting it under filename when one is given"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        source = f.read()
+    return run_once(source, filename or path, argv, instrument_name)
+
+def run_once(source, filename, argv, instrument_name=None):
+    instrument = bbrun_instrument.create(instrument_name, filename, send=write_record)
+    exit_code = execute(source, filename, argv, instrument=instrument)
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+
+    try:
+        report = instrument.report()
+    except Exception as e:
+        report = None
+        print(f"Error building {instrument_name} report: {e}", file=sys.__stderr__)
+    if report:
+        write_record(report)
+    write_record({'type': 'metrics', 'usage': usage_snapshot()})
+    return exit_code
+
+def apply_limits(limits):
+    """Set resource limits for this process and the children it starts"""
+    global memory_limit_mb
+    memory_mb = limits.get('memory_mb')
+    if memory_mb:
+        size = int(memory_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (size, size))
+        memory_limit_mb = memory_mb
+    cpu_seconds = limits.get('cpu_seconds')
+    if cpu_seconds:
+        # SIGXCPU at the soft limit, SIGKILL shortly after if it is ignored
+        cpu_seconds = int(cpu_seconds)
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 2))
+
+        def on_cpu_limit(signum, frame):
+            write_record({'type': 'limit_exceeded', 'message': f"CPU time limit of {cpu_seconds}s"})
+            write_record({'type': 'metrics', 'usage': usage_snapshot()})
+            os._exit(128 + signum)
+        signal.signal(signal.SIGXCPU, on_cpu_limit)
+
+def parse_args(args):
+    """Split runner options from the script's own arguments after '--'"""
+    options = {'worker': False, 'stdin': False, 'file': None, 'filename': None,
+               'instrument': None, 'process_group': False, 'limits': None}
+    script_argv = []
+    if '--' in args:
+        split = args.index('--')
+        args, script_argv = args[:split], args[split + 1:]
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '--worker':
+            options['worker'] = True
+        elif arg == '--stdin':
+            options['stdin'] = True
+        elif arg == '--process-group':
+            options['process_group'] = True
+        elif arg == '--limits' and i + 1 < len(args):
+            i += 1
+            options['limits'] = json.loads(args[i])
+        elif arg == '--file' and i + 1 < len(args):
+            i += 1
+            options['file'] = args[i]
+        elif arg == '--instrument' and i + 1 < len(args):
+            i += 1
+            options['instrument'] = args[i]
+        elif arg == '--filename' and i + 1 < len(args):
+            i += 1
+            options['filename'] = args[i]
+        i += 1
+    return options, script_argv
+
+def main():
+    # Never let user code import modules that happen to live next to the runner
+    sys.path[0] = os.getcwd()
+
+    options, script_argv = parse_args(sys.argv[1:])
+    if options['stdin']:
+        # A stdin run writes nothing to disk, compiled code included
+        code_cache.persistent = False
+    if options['process_group']:
+        os.setpgrp()
+    if options['limits']:
+        apply_limits(options['limits'])
+    if options['worker']:
+        worker_loop()
+    elif options['stdin']:
+        sys.exit(run_from_stdin(options['filename'] or '<stdin>', script_argv, options['instrument']))
+    elif options['file']:
+        sys.exit(run_from_file(options['file'], script_argv, options['instrument'], options['filename']))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+import math
+import statistics
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+def percentile(values, fraction):
+    """Linearly interpolated percentile of values, fraction between 0 and 1"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def summarize(values):
+    """min/median/p95/stdev/mean of a list of timings in seconds"""
+    if not values:
+        return None
+    return {
+        'min': min(values),
+        'median': statistics.median(values),
+        'p95': percentile(values, 0.95),
+        'stdev': statistics.stdev(values) if len(values) > 1 else 0.0,
+        'mean': statistics.fmean(values)
+    }
+
+class BenchmarkVariant:
+    """One version of the code being benchmarked and its measured timings"""
+
+    def __init__(self, label, code):
+        self.label = label
+        self.code = code
+        self.wall_times = []
+        self.cpu_times = []
+        self.failures = 0
+        self.last_error = ''
+
+    @property
+    def wall(self):
+        return summarize(self.wall_times)
+
+    @property
+    def cpu(self):
+        return summarize(self.cpu_times)
+
+class Benchmark(QObject):
+    """
+    Runs each variant repeatedly through the ScriptExecutor, one run at a time.
+    Variants are interleaved round by round so drift in machine load affects
+    all of them alike. Warmup rounds are run first and not measured.
+    """
+    progress = pyqtSignal(int, int)  # completed runs, total runs
+    finished = pyqtSignal()
+
+    def __init__(self, executor, variants, runs=10, warmup=1, parent=None, **run_options):
+        super().__init__(parent)
+        self.executor = executor
+        self.variants = [BenchmarkVariant(label, code) for label, code in variants]
+        self.runs = runs
+        self.warmup = warmup
+        self.run_options = run_options
+        self.cancelled = False
+        self.exit_code = None
+        self.duration = 0.0
+        self.metrics = None
+        self.current = None
+        self.schedule = [(variant, round_number >= warmup)
+                         for round_number in range(warmup + runs)
+                         for variant in self.variants]
+        self.total = len(self.schedule)
+
+    def start(self):
+        self._next()
+
+    def is_running(self):
+        return self.exit_code is None
+
+    def cancel(self):
+        self.cancelled = True
+        self.schedule = []
+        if self.current is not None:
+            self.current.cancel()
+        else:
+            self._finish()
+
+    def kill(self):
+        self.cancelled = True
+        self.schedule = []
+        if self.current is not None:
+            self.current.kill()
+        else:
+            self._finish()
+
+    def _next(self):
+        if not self.schedule:
+            self._finish()
+            return
+        variant, measured = self.schedule.pop(0)
+        errors = []
+        self.current = self.executor.run_script(
+            variant.code,
+            lambda data: None,
+            error_callback=errors.append,
+            finished_callback=lambda exit_code, duration: self._on_run_finished(
+                variant, measured, exit_code, duration, errors),
+            **self.run_options
+        )
+
+    def _on_run_finished(self, variant, measured, exit_code, duration, errors):
+        run, self.current = self.current, None
+        if self.cancelled:
+            self._finish()
+            return
+
+        if exit_code != 0:
+            variant.failures += 1
+            variant.last_error = ''.join(errors)[-2000:]
+        elif measured:
+            metrics = run.metrics
+            variant.wall_times.append(metrics.wall_time if metrics is not None else duration)
+            if metrics is not None and metrics.available:
+                variant.cpu_times.append(metrics.cpu_time)
+        self.duration += duration
+        self.progress.emit(self.total - len(self.schedule), self.total)
+        QTimer.singleShot(0, self._next)
+
+    def _finish(self):
+        if self.exit_code is not None:
+            return
+        self.exit_code = 0 if not any(v.failures for v in self.variants) else 1
+        self.finished.emit()
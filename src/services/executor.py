@@ -1,29 +1,369 @@
 import os
-from PyQt5.QtCore import QProcess  # Change from PySide2 to PyQt5
+import json
+import time
+import codecs
+import signal
+import shutil
+import tempfile
+from PyQt5.QtCore import QObject, QProcess, QProcessEnvironment, QSettings, QTimer, pyqtSignal  # Change from PySide2 to PyQt5
+from .headless import RUNNER_PATH, RECORD_MARKER
+from .worker_pool import WorkerPool, WorkerRun
+from .privileged import PrivilegedWorker, ExpiredSudoSession
+from .run_metrics import RunMetrics
+
+MODE_FRESH = 'fresh'
+MODE_STDIN = 'stdin'
+MODE_WARM = 'warm'
+
+EXECUTION_MODES = {
+    MODE_FRESH: 'Fresh Process',
+    MODE_STDIN: 'In-Memory (stdin)',
+    MODE_WARM: 'Warm Worker Pool'
+}
+
+LIMIT_FIELDS = ('memory_mb', 'cpu_seconds', 'wall_seconds', 'output_mb')
+
+class ScriptRun(QObject):
+    """
+    A single script execution that streams its output through Qt signals.
+    The runner leads its own process group, so stop and kill reach any
+    children it started. limits (see LIMIT_FIELDS, 0 or missing for none)
+    kill the group when exceeded and set limit_exceeded to the reason.
+    """
+    output_received = pyqtSignal(str)
+    error_received = pyqtSignal(str)
+    finished = pyqtSignal(int, float)  # exit code, duration in seconds
+    report_received = pyqtSignal(dict)  # instrument reports such as 'profile'
+
+    KILL_GRACE_MS = 3000
+
+    def __init__(self, code, mode=MODE_FRESH, filename=None, argv=None,
+                 instrument=None, env=None, limits=None, parent=None):
+        super().__init__(parent)
+        self.code = code
+        self.mode = mode
+        self.filename = filename or os.path.join(os.getcwd(), 'script.py')
+        self.argv = argv or []
+        self.instrument = instrument
+        self.env = env or {}
+        self.limits = {k: v for k, v in (limits or {}).items() if k in LIMIT_FIELDS and v}
+        self.limit_exceeded = None
+        self._output_bytes = 0
+        self.temp_dir = None
+        self.temp_filename = None
+        self.exit_code = None
+        self.duration = 0.0
+        self.metrics = None
+        self.cancelled = False
+        self._start_time = None
+        self._usage = None
+        self._stderr_tail = ''
+        self._stdout_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._stderr_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+        self._kill_timer = QTimer(self)
+        self._kill_timer.setSingleShot(True)
+        self._kill_timer.timeout.connect(self.kill)
+
+        self._wall_timer = QTimer(self)
+        self._wall_timer.setSingleShot(True)
+        self._wall_timer.timeout.connect(
+            lambda: self._exceeded(f"wall-clock limit of {self.limits['wall_seconds']:g}s"))
+
+        self.process = QProcess(self)
+        self.process.readyReadStandardOutput.connect(self._read_stdout)
+        self.process.readyReadStandardError.connect(self._read_stderr)
+        self.process.finished.connect(self._on_finished)
+        self.process.errorOccurred.connect(self._on_error)
+
+    def start(self):
+        """Start the interpreter without blocking"""
+        # The script runs from the current directory and can still import local modules
+        cwd = os.getcwd()
+        env = QProcessEnvironment.systemEnvironment()
+        python_path = env.value('PYTHONPATH')
+        env.insert('PYTHONPATH', os.pathsep.join(p for p in (cwd, python_path) if p))
+        for name, value in self.env.items():
+            env.insert(name, value)
+        self.process.setProcessEnvironment(env)
+        self.process.setWorkingDirectory(cwd)
+
+        self._start_time = time.monotonic()
+        if self.limits.get('wall_seconds'):
+            self._wall_timer.start(int(self.limits['wall_seconds'] * 1000))
+        if self.mode == MODE_STDIN:
+            self._start_from_stdin()
+        else:
+            self._start_from_file()
+
+    def _start_from_stdin(self):
+        """Pipe the source to the runner so nothing is written to disk"""
+        self.process.start("python3", ["-u", RUNNER_PATH, "--stdin", "--filename", self.filename]
+                           + self._runner_options() + ["--"] + self.argv)
+        self.process.write(self.code.encode('utf-8'))
+        self.process.closeWriteChannel()
+
+    def _start_from_file(self):
+        # Each run gets its own directory so concurrent runs never clobber each other
+        self.temp_dir = tempfile.mkdtemp(prefix='bbrun_')
+        self.temp_filename = os.path.join(self.temp_dir, 'script.py')
+        with open(self.temp_filename, 'w') as temp_file:
+            temp_file.write(self.code)
+
+        self.process.start("python3", ["-u", RUNNER_PATH, "--file", self.temp_filename,
+                                       "--filename", self.filename]
+                           + self._runner_options() + ["--"] + self.argv)
+
+    def _runner_options(self):
+        options = ["--process-group"]
+        if self.instrument:
+            options += ["--instrument", self.instrument]
+        runner_limits = {k: self.limits[k] for k in ('memory_mb', 'cpu_seconds') if k in self.limits}
+        if runner_limits:
+            options += ["--limits", json.dumps(runner_limits)]
+        return options
+
+    def is_running(self):
+        return self.process.state() != QProcess.NotRunning
+
+    def cancel(self):
+        """Ask the process to terminate, killing it if it does not exit in time"""
+        if not self.is_running():
+            return
+        self.cancelled = True
+        self._signal_group(signal.SIGTERM)
+        self._kill_timer.start(self.KILL_GRACE_MS)
+
+    def kill(self):
+        """Kill the process and its children immediately"""
+        if self.is_running():
+            self.cancelled = True
+            self._signal_group(signal.SIGKILL)
+
+    def _signal_group(self, sig):
+        pid = self.process.processId()
+        try:
+            # Until the runner has made itself a group leader, signal it alone
+            if pid and os.getpgid(pid) == pid:
+                os.killpg(pid, sig)
+                return
+        except OSError:
+            pass
+        if sig == signal.SIGKILL:
+            self.process.kill()
+        else:
+            self.process.terminate()
+
+    def _exceeded(self, reason):
+        """Record the first limit exceeded; the group is killed if it is still running"""
+        if self.limit_exceeded is None:
+            self.limit_exceeded = reason
+        if self.is_running():
+            self._signal_group(signal.SIGKILL)
+
+    def _limit_output(self, data):
+        """Pass on output up to the output limit, killing the run once it is reached"""
+        limit = self.limits.get('output_mb')
+        if not limit or not data:
+            return data
+        limit_bytes = int(limit * 1024 * 1024)
+        allowed = limit_bytes - self._output_bytes
+        encoded = data.encode('utf-8', errors='replace')
+        self._output_bytes += len(encoded)
+        if self._output_bytes > limit_bytes:
+            self._exceeded(f"output limit of {limit:g} MB")
+            # Cut at the byte limit; a character split there is dropped
+            return encoded[:max(allowed, 0)].decode('utf-8', errors='ignore')
+        return data
+
+    def _read_stdout(self):
+        data = self._limit_output(self._stdout_decoder.decode(self.process.readAllStandardOutput().data()))
+        if data:
+            self.output_received.emit(data)
+
+    def _read_stderr(self):
+        data = self._stderr_tail + self._stderr_decoder.decode(self.process.readAllStandardError().data())
+        self._stderr_tail = ''
+
+        # The runner reports usage and instrument results as marked lines on stderr
+        text = ''
+        while True:
+            marker = data.find(RECORD_MARKER)
+            if marker < 0:
+                text += data
+                break
+            record, newline, rest = data[marker + 1:].partition('\n')
+            text += data[:marker]
+            if not newline:
+                self._stderr_tail = data[marker:]
+                break
+            self._parse_record(record)
+            data = rest
+
+        text = self._limit_output(text)
+        if text:
+            self.error_received.emit(text)
+
+    def _parse_record(self, line):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            self.error_received.emit(RECORD_MARKER + line + '\n')
+            return
+        if record.get('type') == 'metrics':
+            self._usage = record.get('usage')
+        elif record.get('type') == 'limit_exceeded':
+            self.limit_exceeded = self.limit_exceeded or record.get('message')
+        else:
+            self.report_received.emit(record)
+
+    def _on_error(self, error):
+        if error == QProcess.FailedToStart:
+            self.error_received.emit(f"Failed to start process: {self.process.errorString()}\n")
+            self._on_finished(-1, QProcess.CrashExit)
+
+    def _on_finished(self, exit_code, exit_status):
+        if self.exit_code is not None:
+            return
+        self._kill_timer.stop()
+        self._wall_timer.stop()
+        if self._start_time is not None:
+            self.duration = time.monotonic() - self._start_time
+        self.exit_code = exit_code if exit_status == QProcess.NormalExit else -1
+        if self.limit_exceeded and self.exit_code == 0:
+            # The script got to exit first, but its output was cut off
+            self.exit_code = -1
+        if self._stderr_tail:
+            self.error_received.emit(self._stderr_tail)
+            self._stderr_tail = ''
+        self.metrics = RunMetrics(self.duration, self._usage)
+
+        if self.temp_dir:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+        self.finished.emit(self.exit_code, self.duration)
 
 class ScriptExecutor:
-    @staticmethod
-    def run_script(code, output_callback, sudo=False, password=None):
-        temp_filename = "temp_script.py"
-        with open(temp_filename, 'w') as temp_file:
-            temp_file.write(code)
+    def __init__(self):
+        self.active_runs = set()
+        self.settings = QSettings('PythonExecutor', 'Executor')
+        self.worker_pool = None
+        self.privileged_worker = None
+        self.default_mode = self.settings.value('execution_mode', MODE_FRESH)
+        if self.default_mode not in EXECUTION_MODES:
+            self.default_mode = MODE_FRESH
+        if self.default_mode == MODE_WARM:
+            self.get_worker_pool()
+
+    def set_default_mode(self, mode):
+        """Select the execution mode used when run_script is not given one"""
+        self.default_mode = mode
+        self.settings.setValue('execution_mode', mode)
+        if mode == MODE_WARM:
+            self.get_worker_pool()
+
+    def get_worker_pool(self):
+        """Return the warm worker pool, starting it on first use"""
+        if self.worker_pool is None:
+            self.worker_pool = WorkerPool()
+            self.worker_pool.start()
+        return self.worker_pool
 
-        process = QProcess()
+    def has_sudo_session(self):
+        """True while a privileged worker is authenticated or authenticating"""
+        return self.privileged_worker is not None and self.privileged_worker.is_alive()
 
-        if sudo and password:
-            sudo_command = f"echo {password} | sudo -S python3 {temp_filename}"
-            process.start("bash", ["-c", sudo_command])
+    def get_privileged_worker(self, password=None):
+        """
+        Return the privileged worker, starting and authenticating a new one with
+        password if there is no live one. The password is not kept. Without a
+        password, e.g. for a queued job whose session has ended, runs fail.
+        """
+        if self.has_sudo_session():
+            return self.privileged_worker
+        if password is None:
+            return ExpiredSudoSession("sudo session expired; run with sudo again to authenticate\n")
+        if self.privileged_worker is not None:
+            self.privileged_worker.deleteLater()
+        self.privileged_worker = PrivilegedWorker(password)
+        self.privileged_worker.start()
+        return self.privileged_worker
+
+    def end_sudo_session(self):
+        if self.privileged_worker is not None:
+            self.privileged_worker.shutdown()
+            self.privileged_worker.deleteLater()
+            self.privileged_worker = None
+
+    def configure_worker_pool(self, size, max_runs, preload_mb=None):
+        self.settings.setValue('worker_pool_size', size)
+        self.settings.setValue('worker_max_runs', max_runs)
+        if preload_mb is not None:
+            self.settings.setValue('preload_memory_mb', preload_mb)
+        if self.worker_pool is not None:
+            if preload_mb is not None:
+                self.worker_pool.preload_budget = preload_mb * 1024 * 1024
+            self.worker_pool.resize(size, max_runs)
+
+    def preload(self, modules):
+        """Let warm workers import modules a script is about to need"""
+        if self.default_mode == MODE_WARM and self.worker_pool is not None:
+            self.worker_pool.preload(modules)
+
+    def run_script(self, code, output_callback, sudo=False, password=None,
+                   error_callback=None, finished_callback=None, mode=None,
+                   filename=None, argv=None, instrument=None, report_callback=None, env=None,
+                   limits=None):
+        """
+        Start executing code asynchronously.
+        Output is streamed to the callbacks as it arrives. Returns the run object.
+        filename becomes the script's __file__ in stdin and warm modes.
+        env holds extra environment variables for the script.
+        Instrumented runs and runs with resource limits always get a process of
+        their own. Sudo runs go to the privileged worker, which password
+        authenticates when it has to be started; limits do not apply to them.
+        """
+        mode = mode or self.default_mode
+        if (instrument or any((limits or {}).values())) and mode == MODE_WARM:
+            mode = MODE_STDIN
+        if sudo:
+            run = WorkerRun(self.get_privileged_worker(password), code, mode='sudo',
+                            filename=filename or os.path.join(os.getcwd(), 'script.py'),
+                            argv=argv, env=env)
+        elif mode != MODE_WARM:
+            run = ScriptRun(code, mode=mode, filename=filename, argv=argv,
+                            instrument=instrument, env=env, limits=limits)
         else:
-            process.start("python3", [temp_filename])
+            run = WorkerRun(self.get_worker_pool(), code,
+                            filename=filename or '<bbrun>', argv=argv, env=env)
+
+        return self.execute_run(run, output_callback, error_callback, finished_callback,
+                                report_callback)
 
-        process.waitForFinished()
+    def execute_run(self, run, output_callback, error_callback=None, finished_callback=None,
+                    report_callback=None):
+        """Connect a prepared run (e.g. from a PersistentKernel) to callbacks and start it"""
+        run.output_received.connect(output_callback)
+        run.error_received.connect(error_callback or output_callback)
+        if finished_callback:
+            run.finished.connect(finished_callback)
+        if report_callback and hasattr(run, 'report_received'):
+            run.report_received.connect(report_callback)
+        run.finished.connect(lambda *_: self._release(run))
 
-        output = process.readAllStandardOutput().data().decode()
-        error = process.readAllStandardError().data().decode()
+        # Keep a reference so the run is not garbage collected while active
+        self.active_runs.add(run)
+        run.start()
+        return run
 
-        os.remove(temp_filename)
+    def _release(self, run):
+        self.active_runs.discard(run)
+        run.deleteLater()
 
-        if output:
-            output_callback(f"Output:\n{output}")
-        if error:
-            output_callback(f"Error:\n{error}")
+    def cancel_all(self):
+        """Kill every running script, used when the window closes"""
+        for run in list(self.active_runs):
+            run.kill()
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+        self.end_sudo_session()
@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import signal
+import threading
+import subprocess
+
+RUNNER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bbrun_runner.py')
+RECORD_MARKER = '\x1e'
+
+def split_records(stderr):
+    """Separate the runner's marker records from the script's own stderr"""
+    records = []
+    text = ''
+    while True:
+        marker = stderr.find(RECORD_MARKER)
+        if marker < 0:
+            text += stderr
+            break
+        text += stderr[:marker]
+        record, newline, stderr = stderr[marker + 1:].partition('\n')
+        try:
+            records.append(json.loads(record))
+        except ValueError:
+            text += RECORD_MARKER + record + newline
+    return text, records
+
+class OutputBudget:
+    """Byte budget shared by a run's stdout and stderr; limit_bytes None means no limit"""
+
+    def __init__(self, limit_bytes, on_exceeded):
+        self.remaining = limit_bytes
+        self.exceeded = False
+        self.on_exceeded = on_exceeded
+        self.lock = threading.Lock()
+
+    def take(self, data):
+        """The part of data that is still within the budget"""
+        if self.remaining is None:
+            return data
+        with self.lock:
+            kept = data[:max(self.remaining, 0)]
+            self.remaining -= len(data)
+            exceeded = self.remaining < 0 and not self.exceeded
+            self.exceeded = self.exceeded or exceeded
+        if exceeded:
+            self.on_exceeded()
+        return kept
+
+def drain(stream, chunks, budget):
+    """Read a pipe to its end, keeping what fits in the budget"""
+    for data in iter(lambda: stream.read1(65536), b''):
+        data = budget.take(data)
+        if data:
+            chunks.append(data)
+    stream.close()
+
+def kill_group(process):
+    # The script may have started children of its own
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        process.kill()
+
+def run_headless(code, filename=None, argv=None, timeout=None, cwd=None, env=None, limits=None):
+    """
+    Run code once through the child runner without Qt, piping the source over
+    stdin. Returns a dict with exit_code, duration, stdout, stderr, usage,
+    timed_out and limit_exceeded. limits may set memory_mb, cpu_seconds,
+    wall_seconds and output_mb; the run is killed as a process group when one
+    is exceeded, and output beyond output_mb is dropped rather than buffered.
+    """
+    cwd = cwd or os.getcwd()
+    filename = filename or os.path.join(cwd, 'script.py')
+    env = dict(os.environ if env is None else env)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (cwd, env.get('PYTHONPATH')) if p)
+    limits = {k: v for k, v in (limits or {}).items() if v}
+    command = ['python3', '-u', RUNNER_PATH, '--stdin', '--filename', filename]
+    runner_limits = {k: limits[k] for k in ('memory_mb', 'cpu_seconds') if k in limits}
+    if runner_limits:
+        command += ['--limits', json.dumps(runner_limits)]
+    command += ['--'] + list(argv or [])
+    wall_limit = limits.get('wall_seconds')
+    if wall_limit and (timeout is None or wall_limit < timeout):
+        timeout = wall_limit
+    else:
+        wall_limit = None
+    output_limit = limits.get('output_mb')
+
+    start = time.monotonic()
+    timed_out = False
+    limit_exceeded = None
+    stdout, stderr = [], []
+    try:
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, cwd=cwd, env=env, start_new_session=True)
+    except OSError as e:
+        process = None
+        exit_code = -1
+        stderr.append(f"Error starting python3: {e}\n".encode())
+    if process is not None:
+        budget = OutputBudget(int(output_limit * 1024 * 1024) if output_limit else None,
+                              lambda: kill_group(process))
+        readers = [threading.Thread(target=drain, args=(stream, chunks, budget), daemon=True)
+                   for stream, chunks in ((process.stdout, stdout), (process.stderr, stderr))]
+        for reader in readers:
+            reader.start()
+        try:
+            process.stdin.write(code.encode('utf-8'))
+            process.stdin.close()
+        except OSError:
+            # The runner died before reading all of its source
+            pass
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            if wall_limit:
+                limit_exceeded = f"wall-clock limit of {wall_limit:g}s"
+            kill_group(process)
+            process.wait()
+        for reader in readers:
+            reader.join()
+        exit_code = process.returncode
+        if budget.exceeded:
+            limit_exceeded = limit_exceeded or f"output limit of {output_limit:g} MB"
+            if exit_code == 0:
+                # The script got to exit first, but its output was cut off
+                exit_code = -1
+    duration = time.monotonic() - start
+    stdout, stderr = b''.join(stdout), b''.join(stderr)
+
+    stderr, records = split_records(stderr.decode('utf-8', errors='replace'))
+    usage = {}
+    for record in records:
+        if record.get('type') == 'metrics':
+            usage = record.get('usage', {})
+        elif record.get('type') == 'limit_exceeded':
+            limit_exceeded = limit_exceeded or record.get('message')
+    return {
+        'exit_code': exit_code,
+        'duration': duration,
+        'stdout': stdout.decode('utf-8', errors='replace'),
+        'stderr': stderr,
+        'usage': usage,
+        'timed_out': timed_out,
+        'limit_exceeded': limit_exceeded
+    }
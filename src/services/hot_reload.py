@@ -0,0 +1,159 @@
+import os
+import ast
+from PyQt5.QtCore import QFileSystemWatcher, QTimer, pyqtSignal
+from .kernel import PersistentKernel
+from .worker_pool import WorkerRun
+
+def imported_names(source, name, is_package):
+    """
+    Every absolute module name the module called name may import, relative
+    imports resolved. Importing a.b.c also runs a and a.b, so those are included.
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return set()
+    package = name if is_package else name.rpartition('.')[0]
+    candidates = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            candidates.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split('.') if package else []
+                base = '.'.join(parts[:len(parts) - (node.level - 1)])
+                module = '.'.join(p for p in (base, node.module) if p)
+            else:
+                module = node.module or ''
+            candidates.append(module)
+            # 'from pkg import mod' may name a submodule
+            candidates.extend(f"{module}.{alias.name}" for alias in node.names)
+
+    names = set()
+    for candidate in candidates:
+        parts = candidate.split('.')
+        names.update('.'.join(parts[:i]) for i in range(1, len(parts) + 1))
+    names.discard(name)
+    return names
+
+class DependencyGraph:
+    """Which local modules import which, rebuilt from the files a run loaded"""
+
+    def __init__(self):
+        self.paths = {}      # module name -> file
+        self.imports = {}    # module name -> local modules it imports
+        self._parsed = {}    # module name -> ((path, mtime), names it imports)
+
+    def update(self, modules):
+        """Take {name: path} of the loaded local modules, re-parsing only changed files"""
+        self.paths = dict(modules)
+        known = set(modules)
+        for name, path in modules.items():
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            if self._parsed.get(name, (None,))[0] != (path, mtime):
+                try:
+                    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                        source = f.read()
+                except OSError:
+                    continue
+                is_package = os.path.basename(path) == '__init__.py'
+                self._parsed[name] = ((path, mtime), imported_names(source, name, is_package))
+        for name in list(self._parsed):
+            if name not in known:
+                del self._parsed[name]
+        self.imports = {name: names & known for name, (_, names) in self._parsed.items()}
+
+    def dependents(self, names):
+        """names plus every module that imports one of them, directly or not"""
+        affected = set(names)
+        pending = list(names)
+        while pending:
+            changed = pending.pop()
+            for name, imports in self.imports.items():
+                if changed in imports and name not in affected:
+                    affected.add(name)
+                    pending.append(name)
+        return affected
+
+    def affected_by(self, paths):
+        paths = {os.path.abspath(path) for path in paths}
+        return self.dependents([name for name, path in self.paths.items() if path in paths])
+
+class HotReloadSession(PersistentKernel):
+    """
+    Watch mode for a tab: every run executes the script in a fresh __main__ of
+    the same worker, so imported modules stay loaded. When a watched file
+    changes, only that module and the local modules depending on it are
+    dropped before the next run, and rerun_requested is emitted.
+    """
+    rerun_requested = pyqtSignal(list)  # names of the modules that will be reloaded
+
+    DEBOUNCE_MS = 300
+
+    def __init__(self, script_path=None, parent=None):
+        super().__init__(parent)
+        self.script_path = script_path
+        self.graph = DependencyGraph()
+        self.invalidated = set()
+        self.rerun_pending = False
+        self._changed_paths = set()
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._on_file_changed)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.timeout.connect(self._on_changes_settled)
+        self._watch_paths()
+
+    def start(self):
+        if self.worker is None:
+            super().start()
+            self.worker.record_received.connect(self._on_record)
+
+    def set_script_path(self, path):
+        self.script_path = path
+        self._watch_paths()
+
+    def run(self, code, filename='<watch>', argv=None, env=None):
+        """Create a run of code that reloads the modules invalidated since the last one"""
+        invalidate, self.invalidated = sorted(self.invalidated), set()
+        self.rerun_pending = False
+        return WorkerRun(self, code, filename=filename, argv=argv, env=env, op='run', mode='watch',
+                         request_options={'invalidate': invalidate, 'report_modules': True,
+                                          'keep_modules': True})
+
+    def _on_record(self, record):
+        if record.get('type') == 'modules':
+            self.graph.update(record.get('modules', {}))
+            self._watch_paths()
+
+    def _watch_paths(self):
+        paths = set(self.graph.paths.values())
+        if self.script_path:
+            paths.add(self.script_path)
+        stale = set(self.watcher.files()) - paths
+        if stale:
+            self.watcher.removePaths(list(stale))
+        # Editors that save by renaming replace the file, which drops it from the watcher
+        missing = [path for path in paths - set(self.watcher.files()) if os.path.exists(path)]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def _on_file_changed(self, path):
+        self._changed_paths.add(path)
+        self._debounce.start(self.DEBOUNCE_MS)
+
+    def _on_changes_settled(self):
+        paths, self._changed_paths = self._changed_paths, set()
+        self._watch_paths()
+        reloaded = self.graph.affected_by(paths)
+        self.invalidated |= reloaded
+        self.rerun_pending = True
+        self.rerun_requested.emit(sorted(reloaded))
+
+    def _on_worker_died(self, worker):
+        # A new worker imports everything afresh
+        self.invalidated = set()
+        super()._on_worker_died(worker)
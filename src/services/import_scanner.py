@@ -0,0 +1,60 @@
+import re
+import ast
+import sys
+
+IMPORT_LINE = re.compile(r'^[ \t]*(import|from)[ \t]+\S.*$', re.MULTILINE)
+FROM_MODULE = re.compile(r'^from[ \t]+([\w.]+)[ \t]+import\b')
+
+def scan_imports(source):
+    """
+    Return the absolute module names imported by source, in order of first use.
+    For 'from a.b import c' that is 'a.b'; c may be a name rather than a module.
+    Code that does not parse (it is usually being edited) is scanned line by line.
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        tree = None
+    if tree is None:
+        nodes = []
+        for match in IMPORT_LINE.finditer(source):
+            line = match.group(0).strip()
+            try:
+                nodes.extend(ast.parse(line).body)
+            except SyntaxError:
+                # e.g. the first line of a parenthesized multi-line import
+                from_module = FROM_MODULE.match(line)
+                if from_module:
+                    nodes.append(ast.ImportFrom(module=from_module.group(1), names=[], level=0))
+    else:
+        nodes = ast.walk(tree)
+
+    modules = []
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+            modules.append(node.module)
+    return [name for name in dict.fromkeys(modules)
+            if name != '__future__' and name.split('.')[0] not in sys.builtin_module_names]
+
+class ImportScanner:
+    """
+    Incremental scanner for one editor buffer: the AST is only parsed again when
+    the import lines of the source have changed since the last scan.
+    """
+
+    def __init__(self):
+        self.signature = None
+        self.modules = []
+
+    def scan(self, source):
+        """Return (modules, changed)"""
+        signature = tuple(match.group(0).strip() for match in IMPORT_LINE.finditer(source))
+        if signature == self.signature:
+            return self.modules, False
+        self.signature = signature
+        modules = scan_imports(source)
+        changed = modules != self.modules
+        self.modules = modules
+        return modules, changed
@@ -0,0 +1,99 @@
+import os
+import signal
+from collections import deque
+from PyQt5.QtCore import QObject, pyqtSignal
+from .worker_pool import WorkerProcess, WorkerRun
+
+class PersistentKernel(QObject):
+    """
+    A long-lived worker that keeps its globals between runs.
+    Used by a CodeEditorTab to run selections against retained state.
+    """
+    state_changed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.worker = None
+        self.execution_count = 0
+        self._waiting = deque()
+
+    def start(self):
+        if self.worker is not None:
+            return
+        self.worker = WorkerProcess(self)
+        self.worker.ready.connect(self._dispatch)
+        self.worker.died.connect(self._on_worker_died)
+        self.worker.start()
+        self.state_changed.emit('starting')
+
+    def is_alive(self):
+        return self.worker is not None and self.worker.is_alive()
+
+    def is_busy(self):
+        return self.worker is not None and self.worker.busy
+
+    def run(self, code, filename='<kernel>', first_line=1):
+        """Create a run that executes code against the kernel's retained globals"""
+        self.execution_count += 1
+        return WorkerRun(self, code, filename=filename, op='exec', first_line=first_line)
+
+    def acquire(self, callback):
+        self._waiting.append(callback)
+        self.start()
+        self._dispatch()
+
+    def withdraw(self, callback):
+        try:
+            self._waiting.remove(callback)
+        except ValueError:
+            pass
+
+    def release(self, worker):
+        worker.busy = False
+        self.state_changed.emit('idle')
+        self._dispatch()
+
+    def interrupt(self, worker=None, run_id=None):
+        """Raise KeyboardInterrupt in the running code without losing state"""
+        worker = worker or self.worker
+        if worker is not None and worker.busy and worker.pid:
+            try:
+                os.kill(worker.pid, signal.SIGINT)
+            except OSError as e:
+                print(f"Error interrupting kernel: {e}")
+
+    def kill(self, worker):
+        worker.kill()
+
+    def restart(self):
+        """Discard all retained state and start a fresh kernel"""
+        self.shutdown()
+        self.execution_count = 0
+        self.start()
+
+    def shutdown(self):
+        worker = self.worker
+        self.worker = None
+        if worker is not None:
+            worker.died.disconnect(self._on_worker_died)
+            worker.kill()
+            worker.process.waitForFinished(1000)
+            # Let any run attached to this worker see it die
+            worker.died.emit(worker)
+            worker.deleteLater()
+        self.state_changed.emit('stopped')
+
+    def _dispatch(self, *_):
+        worker = self.worker
+        if worker is None or not worker.is_ready or worker.busy or not self._waiting:
+            return
+        worker.busy = True
+        self.state_changed.emit('busy')
+        self._waiting.popleft()(worker)
+
+    def _on_worker_died(self, worker):
+        self.worker = None
+        worker.deleteLater()
+        self.state_changed.emit('died')
+        if self._waiting:
+            self.start()
@@ -0,0 +1,177 @@
+import os
+import csv
+import json
+import shlex
+from PyQt5.QtCore import QObject, pyqtSignal
+
+ROW_PENDING = 'Pending'
+ROW_RUNNING = 'Running'
+ROW_PASSED = 'Passed'
+ROW_FAILED = 'Failed'
+ROW_CANCELLED = 'Cancelled'
+
+OUTPUT_TAIL = 2000
+
+def load_parameter_rows(path):
+    """
+    Read parameter rows from a CSV file with a header line, or from a JSON
+    list of objects or of lists. Returns a list of dicts; list rows are keyed
+    by position ('0', '1', ...).
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        if os.path.splitext(path)[1].lower() == '.json':
+            data = json.load(f)
+            if isinstance(data, dict):
+                data = data.get('rows', [])
+            rows = []
+            for item in data:
+                if isinstance(item, dict):
+                    rows.append({str(k): '' if v is None else str(v) for k, v in item.items()})
+                elif isinstance(item, (list, tuple)):
+                    rows.append({str(i): str(v) for i, v in enumerate(item)})
+                else:
+                    rows.append({'0': str(item)})
+            return rows
+        return [{k: v or '' for k, v in row.items() if k is not None} for row in csv.DictReader(f)]
+
+def default_template(columns):
+    """Pass every non-environment column as --name value, positional columns as is"""
+    parts = []
+    for column in columns:
+        if column.startswith('$'):
+            continue
+        if column.isdigit():
+            parts.append(f"{{{column}}}")
+        else:
+            parts.append(f"--{column} {{{column}}}")
+    return ' '.join(parts)
+
+def expand_row(row, template):
+    """
+    Build (argv, env) for a row. The template is split like a shell command
+    and every {column} is replaced per argument, so values may contain spaces.
+    Columns named $NAME become environment variables.
+    """
+    values = {k: v for k, v in row.items() if not k.startswith('$')}
+    argv = [part.format_map(values) for part in shlex.split(template)]
+    env = {k[1:]: v for k, v in row.items() if k.startswith('$') and len(k) > 1}
+    return argv, env
+
+class MatrixRow:
+    """One parameter set of a matrix run and its outcome"""
+
+    def __init__(self, index, params, argv, env):
+        self.index = index
+        self.params = params
+        self.argv = argv
+        self.env = env
+        self.status = ROW_PENDING
+        self.exit_code = None
+        self.duration = 0.0
+        self.output = ''
+        self.run = None
+
+    def append_output(self, text):
+        self.output = (self.output + text)[-OUTPUT_TAIL:]
+
+class MatrixRun(QObject):
+    """
+    Runs one script once per parameter row through the ScriptExecutor, with at
+    most max_parallel rows running at a time.
+    """
+    row_updated = pyqtSignal(object)
+    finished = pyqtSignal()
+
+    def __init__(self, executor, code, rows, template, max_parallel=4, parent=None, **run_options):
+        super().__init__(parent)
+        self.executor = executor
+        self.code = code
+        self.rows = []
+        for index, params in enumerate(rows, 1):
+            argv, env = expand_row(params, template)
+            self.rows.append(MatrixRow(index, params, argv, env))
+        self.max_parallel = max(1, max_parallel)
+        self.run_options = run_options
+        self.cancelled = False
+        self.exit_code = None
+        self.duration = 0.0
+        self.metrics = None
+
+    def start(self):
+        self._schedule()
+
+    def is_running(self):
+        return self.exit_code is None
+
+    def cancel(self, kill=False):
+        self.cancelled = True
+        for row in self.rows:
+            if row.status == ROW_PENDING:
+                row.status = ROW_CANCELLED
+                self.row_updated.emit(row)
+            elif row.status == ROW_RUNNING and kill:
+                row.run.kill()
+            elif row.status == ROW_RUNNING:
+                row.run.cancel()
+        self._check_finished()
+
+    def kill(self):
+        self.cancel(kill=True)
+
+    def counts(self):
+        counts = {}
+        for row in self.rows:
+            counts[row.status] = counts.get(row.status, 0) + 1
+        return counts
+
+    def _schedule(self):
+        running = sum(1 for row in self.rows if row.status == ROW_RUNNING)
+        for row in self.rows:
+            if running >= self.max_parallel:
+                break
+            if row.status == ROW_PENDING:
+                self._start(row)
+                running += 1
+        self._check_finished()
+
+    def _start(self, row):
+        row.status = ROW_RUNNING
+        run = self.executor.run_script(
+            self.code,
+            row.append_output,
+            error_callback=row.append_output,
+            finished_callback=lambda exit_code, duration: self._on_row_finished(row, exit_code, duration),
+            argv=row.argv,
+            env=row.env,
+            **self.run_options
+        )
+        # A process that fails to start finishes before run_script returns
+        if row.status == ROW_RUNNING:
+            row.run = run
+            self.row_updated.emit(row)
+
+    def _on_row_finished(self, row, exit_code, duration):
+        row.exit_code = exit_code
+        row.duration = duration
+        limit = getattr(row.run, 'limit_exceeded', None)
+        if limit:
+            row.append_output(f"Killed: exceeded {limit}\n")
+        row.run = None
+        if self.cancelled:
+            row.status = ROW_CANCELLED
+        else:
+            row.status = ROW_PASSED if exit_code == 0 else ROW_FAILED
+        self.duration += duration
+        self.row_updated.emit(row)
+        if self.cancelled:
+            self._check_finished()
+        else:
+            self._schedule()
+
+    def _check_finished(self):
+        if self.exit_code is not None:
+            return
+        if any(row.status in (ROW_PENDING, ROW_RUNNING) for row in self.rows):
+            return
+        self.exit_code = 0 if all(row.status == ROW_PASSED for row in self.rows) else 1
+        self.finished.emit()
@@ -0,0 +1,291 @@
+import os
+import time
+import codecs
+import shutil
+import tempfile
+import threading
+import subprocess
+from .headless import RUNNER_PATH, split_records
+
+NODE_WAITING = 'Waiting'
+NODE_RUNNING = 'Running'
+NODE_FINISHED = 'Finished'
+NODE_FAILED = 'Failed'
+NODE_CANCELLED = 'Cancelled'
+
+class PipelineError(Exception):
+    pass
+
+class Pipeline:
+    """
+    A DAG of saved scripts. Each edge streams the stdout of one node into the
+    stdin of another; a node with several inputs receives their lines
+    interleaved as they arrive, and a node with several outputs sends each
+    line to all of them. Output of nodes without outgoing edges is the
+    output of the pipeline.
+    """
+
+    def __init__(self, name, nodes=None, edges=None, description=''):
+        self.name = name
+        self.description = description
+        self.nodes = nodes or []   # dicts: id, script, version, arguments
+        self.edges = edges or []   # [from_id, to_id]
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('name', ''), [dict(node) for node in data.get('nodes', [])],
+                   [list(edge) for edge in data.get('edges', [])], data.get('description', ''))
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'description': self.description,
+            'nodes': self.nodes,
+            'edges': self.edges
+        }
+
+    def node_ids(self):
+        return [node['id'] for node in self.nodes]
+
+    def inputs(self, node_id):
+        return [source for source, target in self.edges if target == node_id]
+
+    def outputs(self, node_id):
+        return [target for source, target in self.edges if source == node_id]
+
+    def validate(self):
+        """Raise PipelineError unless node ids are unique, edges valid and the graph acyclic"""
+        ids = self.node_ids()
+        if not ids:
+            raise PipelineError("The pipeline has no nodes")
+        if len(set(ids)) != len(ids):
+            raise PipelineError("Node ids must be unique")
+        for node in self.nodes:
+            if not node.get('script'):
+                raise PipelineError(f"Node '{node['id']}' has no script")
+        for source, target in self.edges:
+            if source not in ids or target not in ids:
+                raise PipelineError(f"Edge {source} -> {target} refers to an unknown node")
+            if source == target:
+                raise PipelineError(f"Node '{source}' cannot feed itself")
+        self.topological_order()
+
+    def topological_order(self):
+        remaining = {node_id: len(self.inputs(node_id)) for node_id in self.node_ids()}
+        ready = [node_id for node_id, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            node_id = ready.pop(0)
+            order.append(node_id)
+            for target in self.outputs(node_id):
+                remaining[target] -= 1
+                if remaining[target] == 0:
+                    ready.append(target)
+        if len(order) != len(remaining):
+            raise PipelineError("The pipeline contains a cycle")
+        return order
+
+def resolve_sources(manager, pipeline):
+    """
+    Load the code of every node from the ScriptManager.
+    Returns {node_id: (code, filename)}, raising PipelineError for missing scripts.
+    """
+    sources = {}
+    for node in pipeline.nodes:
+        matches = manager.find_scripts(node['script'])
+        if len(matches) != 1:
+            problem = 'not found' if not matches else 'ambiguous, use CATEGORY/NAME'
+            raise PipelineError(f"Script '{node['script']}' of node '{node['id']}' is {problem}")
+        filepath, metadata = matches[0]
+        content, _, versions = manager.load_script(filepath, node.get('version') or None)
+        if node.get('version') and not 1 <= node['version'] <= len(versions):
+            raise PipelineError(f"Script '{node['script']}' has no version {node['version']}")
+        sources[node['id']] = (content, os.path.join(os.getcwd(), f"{metadata.get('name', node['id'])}.py"))
+    return sources
+
+class _Node:
+    def __init__(self, node_id, definition):
+        self.node_id = node_id
+        self.definition = definition
+        self.process = None
+        self.status = NODE_WAITING
+        self.exit_code = None
+        self.start_time = None
+        self.duration = 0.0
+        self.usage = None
+        self.open_inputs = 0
+        self.stdin_lock = threading.Lock()
+        self.stdin_open = False
+
+class PipelineRunner:
+    """
+    Runs every node of a pipeline at once as its own runner process and pumps
+    data along the edges with one thread per stream, so downstream nodes start
+    consuming while upstream nodes are still producing. Callbacks are invoked
+    from those threads:
+
+        on_output(node_id, text)  stdout of nodes without outgoing edges
+        on_error(node_id, text)   stderr of any node, in whole lines
+        on_node(event)            dict describing a node status change
+    """
+
+    def __init__(self, pipeline, sources, cwd=None, on_output=None, on_error=None, on_node=None):
+        self.pipeline = pipeline
+        self.sources = sources
+        self.cwd = cwd or os.getcwd()
+        self.on_output = on_output or (lambda node_id, text: None)
+        self.on_error = on_error or (lambda node_id, text: None)
+        self.on_node = on_node or (lambda event: None)
+        self.nodes = {node['id']: _Node(node['id'], node) for node in pipeline.nodes}
+        self.cancelled = False
+
+    def run(self):
+        """Run the pipeline to completion and return its exit code"""
+        self.pipeline.validate()
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(p for p in (self.cwd, env.get('PYTHONPATH')) if p)
+        temp_dir = tempfile.mkdtemp(prefix='bbrun_pipeline_')
+        threads = []
+        try:
+            for index, node_id in enumerate(self.pipeline.topological_order()):
+                if self.cancelled:
+                    break
+                self._start_node(self.nodes[node_id], index, temp_dir, env)
+            for node in self.nodes.values():
+                if node.process is None:
+                    # Nodes that never started must not keep their consumers waiting
+                    self._input_finished(node)
+                    continue
+                for pump in (self._pump_stdout, self._pump_stderr):
+                    thread = threading.Thread(target=pump, args=(node,), daemon=True)
+                    thread.start()
+                    threads.append(thread)
+            for thread in threads:
+                thread.join()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        for node in self.nodes.values():
+            if node.status == NODE_WAITING:
+                self._set_status(node, NODE_CANCELLED)
+        for node_id in self.pipeline.topological_order():
+            exit_code = self.nodes[node_id].exit_code
+            if exit_code:
+                return exit_code
+        return 130 if self.cancelled else 0
+
+    def _start_node(self, node, index, temp_dir, env):
+        code, filename = self.sources[node.node_id]
+        path = os.path.join(temp_dir, f"{index}.py")
+        with open(path, 'w') as f:
+            f.write(code)
+        node.open_inputs = len(self.pipeline.inputs(node.node_id))
+        argv = node.definition.get('arguments') or []
+        command = ['python3', '-u', RUNNER_PATH, '--file', path, '--filename', filename, '--'] + list(argv)
+        node.start_time = time.monotonic()
+        try:
+            node.process = subprocess.Popen(
+                command, cwd=self.cwd, env=env,
+                stdin=subprocess.PIPE if node.open_inputs else subprocess.DEVNULL,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError as e:
+            self.on_error(node.node_id, f"Error starting python3: {e}\n")
+            node.exit_code = -1
+            self._set_status(node, NODE_FAILED)
+            return
+        node.stdin_open = node.open_inputs > 0
+        self._set_status(node, NODE_RUNNING)
+
+    def _read_lines(self, stream):
+        """Yield decoded text from a pipe, cut after the last complete line"""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        pending = ''
+        while True:
+            chunk = stream.read1(65536) if hasattr(stream, 'read1') else stream.read(65536)
+            if not chunk:
+                break
+            pending += decoder.decode(chunk)
+            cut = pending.rfind('\n') + 1
+            if cut:
+                yield pending[:cut]
+                pending = pending[cut:]
+        pending += decoder.decode(b'', final=True)
+        if pending:
+            yield pending
+
+    def _pump_stdout(self, node):
+        targets = [self.nodes[t] for t in self.pipeline.outputs(node.node_id)]
+        for text in self._read_lines(node.process.stdout):
+            if not targets:
+                self.on_output(node.node_id, text)
+            data = text.encode('utf-8')
+            for target in targets:
+                self._feed(target, data)
+        self._input_finished(node)
+
+    def _input_finished(self, node):
+        """Close the stdin of consumers whose producers have all finished"""
+        for target in (self.nodes[t] for t in self.pipeline.outputs(node.node_id)):
+            with target.stdin_lock:
+                target.open_inputs -= 1
+                if target.open_inputs <= 0:
+                    self._close_stdin(target)
+
+    def _feed(self, target, data):
+        with target.stdin_lock:
+            if not target.stdin_open:
+                return
+            try:
+                target.process.stdin.write(data)
+                target.process.stdin.flush()
+            except (BrokenPipeError, ValueError, OSError):
+                # The consumer exited early; drop the rest of its input
+                self._close_stdin(target)
+
+    def _close_stdin(self, node):
+        if node.stdin_open and node.process is not None:
+            node.stdin_open = False
+            try:
+                node.process.stdin.close()
+            except OSError:
+                pass
+
+    def _pump_stderr(self, node):
+        """Forward stderr, collect the runner's metrics record, then wait for the node to exit"""
+        for text in self._read_lines(node.process.stderr):
+            output, records = split_records(text)
+            for record in records:
+                if record.get('type') == 'metrics':
+                    node.usage = record.get('usage')
+            if output:
+                self.on_error(node.node_id, output)
+
+        exit_code = node.process.wait()
+        node.duration = time.monotonic() - node.start_time
+        node.exit_code = exit_code
+        if self.cancelled and exit_code != 0:
+            status = NODE_CANCELLED
+        else:
+            status = NODE_FINISHED if exit_code == 0 else NODE_FAILED
+        self._set_status(node, status)
+
+    def _set_status(self, node, status):
+        node.status = status
+        self.on_node({
+            'type': 'pipeline_node',
+            'node': node.node_id,
+            'script': node.definition.get('script'),
+            'status': status,
+            'exit_code': node.exit_code,
+            'duration': node.duration,
+            'usage': node.usage
+        })
+
+    def cancel(self, kill=False):
+        self.cancelled = True
+        for node in self.nodes.values():
+            if node.process is not None and node.process.poll() is None:
+                if kill:
+                    node.process.kill()
+                else:
+                    node.process.terminate()
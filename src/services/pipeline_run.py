@@ -0,0 +1,80 @@
+import time
+import threading
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from .pipeline import PipelineRunner, PipelineError, NODE_WAITING
+
+class PipelineRun(QObject):
+    """
+    Runs a PipelineRunner on a background thread and re-emits its callbacks
+    as Qt signals on the GUI thread, with the same interface as ScriptRun.
+    """
+    output_received = pyqtSignal(str)
+    error_received = pyqtSignal(str)
+    finished = pyqtSignal(int, float)
+    report_received = pyqtSignal(dict)  # 'pipeline' reports with the status of every node
+
+    _event = pyqtSignal(str, object)
+
+    def __init__(self, pipeline, sources, parent=None):
+        super().__init__(parent)
+        self.pipeline = pipeline
+        self.runner = PipelineRunner(
+            pipeline, sources,
+            on_output=lambda node_id, text: self._event.emit('output', text),
+            on_error=lambda node_id, text: self._event.emit('error', self._label(node_id, text)),
+            on_node=lambda event: self._event.emit('report', event))
+        self.mode = 'pipeline'
+        self.exit_code = None
+        self.duration = 0.0
+        self.metrics = None
+        self.cancelled = False
+        self.node_events = {node['id']: {'node': node['id'], 'script': node.get('script'), 'status': NODE_WAITING,
+                                         'exit_code': None, 'duration': 0.0, 'usage': None}
+                            for node in pipeline.nodes}
+        self._thread = None
+        self._event.connect(self._dispatch, Qt.QueuedConnection)
+
+    def _label(self, node_id, text):
+        return ''.join(f"[{node_id}] {line}" for line in text.splitlines(True))
+
+    def start(self):
+        self._start_time = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='bbrun-pipeline', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            exit_code = self.runner.run()
+        except PipelineError as e:
+            self._event.emit('error', f"{e}\n")
+            exit_code = 1
+        self._event.emit('finished', exit_code)
+
+    def _dispatch(self, kind, value):
+        if kind == 'output':
+            self.output_received.emit(value)
+        elif kind == 'error':
+            self.error_received.emit(value)
+        elif kind == 'report':
+            self.node_events[value['node']] = value
+            self.report_received.emit(self.report())
+        elif kind == 'finished':
+            self.exit_code = value
+            self.duration = time.monotonic() - self._start_time
+            self.finished.emit(self.exit_code, self.duration)
+
+    def report(self):
+        return {'type': 'pipeline', 'name': self.pipeline.name, 'nodes': list(self.node_events.values())}
+
+    def is_running(self):
+        return self._thread is not None and self.exit_code is None
+
+    def cancel(self):
+        if self.is_running():
+            self.cancelled = True
+            self.runner.cancel()
+
+    def kill(self):
+        if self.is_running():
+            self.cancelled = True
+            self.runner.cancel(kill=True)
@@ -0,0 +1,160 @@
+from collections import deque
+from PyQt5.QtCore import QObject, QProcess, QTimer, pyqtSignal
+from .headless import RUNNER_PATH
+from .worker_pool import WorkerProcess
+
+class SudoWorkerProcess(WorkerProcess):
+    """A worker started through sudo, which reads the password from its stdin"""
+
+    def __init__(self, password, parent=None):
+        super().__init__(parent)
+        self._password = password
+
+    def start(self):
+        # -k makes sudo always read the password line, so it never reaches the worker
+        # as a request; -p '' keeps the prompt out of stderr
+        self.process.start("sudo", ["-S", "-k", "-p", "", "python3", "-u", RUNNER_PATH, "--worker"])
+        self.process.write((self._password + '\n').encode())
+        self._password = None
+
+class ExpiredSudoSession:
+    """
+    Stands in for a privileged worker that is gone when a queued sudo run
+    starts. There is no password to start a new one, so every run fails.
+    """
+
+    def __init__(self, message):
+        self.message = message
+        self._waiting = deque()
+
+    def acquire(self, callback):
+        # Fail from the event loop, like a worker would, not inside run.start()
+        self._waiting.append(callback)
+        QTimer.singleShot(0, self._fail_waiting)
+
+    def withdraw(self, callback):
+        try:
+            self._waiting.remove(callback)
+        except ValueError:
+            pass
+
+    def _fail_waiting(self):
+        waiting, self._waiting = self._waiting, deque()
+        for callback in waiting:
+            callback(None, self.message)
+
+class PrivilegedWorker(QObject):
+    """
+    A single warm worker running as root for "Run with Sudo". It is authenticated
+    once and then serves runs one at a time until it is shut down or killed.
+    The GUI cannot signal a root process, so runs are interrupted with an
+    "interrupt" request and killed by closing the worker's stdin.
+    """
+    state_changed = pyqtSignal(str)
+
+    AUTH_TIMEOUT_MS = 20000
+
+    def __init__(self, password, parent=None):
+        super().__init__(parent)
+        self.worker = SudoWorkerProcess(password, self)
+        self.worker.ready.connect(self._on_ready)
+        self.worker.record_received.connect(self._on_startup_record)
+        self.worker.died.connect(self._on_worker_died)
+        self.authenticated = False
+        self._startup_errors = ''
+        self._waiting = deque()
+        self._auth_timer = QTimer(self)
+        self._auth_timer.setSingleShot(True)
+        self._auth_timer.timeout.connect(self._on_auth_timeout)
+
+    def start(self):
+        self.worker.start()
+        self._auth_timer.start(self.AUTH_TIMEOUT_MS)
+        self.state_changed.emit('authenticating')
+
+    def is_alive(self):
+        return self.worker is not None and self.worker.is_alive()
+
+    def acquire(self, callback):
+        self._waiting.append(callback)
+        self._dispatch()
+
+    def withdraw(self, callback):
+        try:
+            self._waiting.remove(callback)
+        except ValueError:
+            pass
+
+    def release(self, worker):
+        worker.busy = False
+        self.state_changed.emit('idle')
+        self._dispatch()
+
+    def interrupt(self, worker, run_id=None):
+        """Raise KeyboardInterrupt in the run; the worker stays authenticated"""
+        if worker.busy:
+            worker.send({'op': 'interrupt', 'id': run_id})
+
+    def kill(self, worker):
+        """End the worker and the run in it; the next sudo run authenticates again"""
+        worker.process.closeWriteChannel()
+        worker.kill()
+
+    def shutdown(self):
+        worker = self.worker
+        if worker is None:
+            return
+        worker.stop()
+        if not worker.process.waitForFinished(1000):
+            self.kill(worker)
+
+    def _dispatch(self, *_):
+        worker = self.worker
+        if worker is None or not worker.is_ready or worker.busy or not self._waiting:
+            return
+        worker.busy = True
+        self.state_changed.emit('busy')
+        self._waiting.popleft()(worker)
+
+    def _on_ready(self, worker):
+        self._auth_timer.stop()
+        self.authenticated = True
+        worker.record_received.disconnect(self._on_startup_record)
+        self.state_changed.emit('idle')
+        self._dispatch()
+
+    def _on_startup_record(self, record):
+        # Before the worker is ready, stderr can only come from sudo itself
+        if record.get('type') in ('stdout', 'stderr'):
+            self._startup_errors += record.get('data', '')
+            if 'try again' in self._startup_errors or 'incorrect password' in self._startup_errors:
+                self._fail("sudo rejected the password")
+
+    def _on_auth_timeout(self):
+        self._fail("sudo did not accept the password in time")
+
+    def _fail(self, message):
+        details = self._startup_errors.strip()
+        if details:
+            message = f"{message}: {details}"
+        worker = self.worker
+        self.worker = None
+        waiting, self._waiting = self._waiting, deque()
+        if worker is not None:
+            worker.died.disconnect(self._on_worker_died)
+            worker.kill()
+            worker.process.waitForFinished(1000)
+            worker.deleteLater()
+        self.state_changed.emit('failed')
+        for callback in waiting:
+            callback(None, message + '\n')
+
+    def _on_worker_died(self, worker):
+        if not self.authenticated:
+            if worker.process.error() == QProcess.FailedToStart:
+                self._startup_errors += worker.process.errorString()
+            self._fail("sudo exited before the worker started")
+            return
+        self.worker = None
+        worker.deleteLater()
+        self.state_changed.emit('stopped')
@@ -0,0 +1,135 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+from pathlib import Path
+
+def interpreter_identity(python='python3'):
+    """Path, size and mtime of the interpreter scripts run with, without starting it"""
+    path = shutil.which(python) or python
+    try:
+        real_path = os.path.realpath(path)
+        stat = os.stat(real_path)
+        return f"{real_path}:{stat.st_size}:{stat.st_mtime_ns}"
+    except OSError:
+        return path
+
+def format_age(seconds):
+    for unit, size in (('d', 86400), ('h', 3600), ('min', 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)} {unit} ago"
+    return f"{int(seconds)} s ago"
+
+class CachedResult:
+    """Output of a successful run replayed from the ResultCache"""
+
+    def __init__(self, data, path):
+        self.exit_code = data.get('exit_code', 0)
+        self.duration = data.get('duration', 0.0)
+        self.created = data.get('created', 0)
+        self.segments = data.get('segments', [])
+        self.path = path
+
+    @property
+    def age(self):
+        return time.time() - self.created
+
+class ResultCache:
+    """
+    On-disk cache of script output keyed by the source, arguments, declared
+    input files and interpreter. Least recently used entries are evicted when
+    the cache grows beyond max_bytes.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=64 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / '.python_executor' / 'result_cache'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def key(self, code, argv=None, input_files=None, cwd=None, python='python3'):
+        """Hash everything that determines the output of a deterministic script"""
+        cwd = cwd or os.getcwd()
+        digest = hashlib.sha256()
+        for part in (code, '\0'.join(argv or []), cwd, interpreter_identity(python)):
+            digest.update(part.encode('utf-8', 'surrogateescape'))
+            digest.update(b'\0')
+        for name in input_files or []:
+            path = os.path.join(cwd, os.path.expanduser(name))
+            digest.update(path.encode('utf-8', 'surrogateescape'))
+            digest.update(self._file_digest(path))
+        return digest.hexdigest()
+
+    def _file_digest(self, path):
+        try:
+            stat = os.stat(path)
+            file_digest = hashlib.sha256(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    file_digest.update(block)
+            return file_digest.digest()
+        except OSError:
+            return b'missing'
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key):
+        """Return the CachedResult for key, or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # The modification time doubles as the last-used time for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return CachedResult(data, path)
+
+    def put(self, key, segments, exit_code, duration):
+        """Store the (stream, text) output segments of a run"""
+        data = {
+            'created': time.time(),
+            'exit_code': exit_code,
+            'duration': duration,
+            'segments': segments
+        }
+        path = self._path(key)
+        temp_path = path.with_suffix('.tmp')
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Error writing result cache: {e}")
+            return
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                path.unlink()
+            except OSError:
+                pass
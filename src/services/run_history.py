@@ -0,0 +1,172 @@
+import sqlite3
+import hashlib
+import datetime
+import statistics
+from pathlib import Path
+from .run_metrics import RunMetrics
+
+def content_hash(code):
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+class RunHistory:
+    """
+    SQLite store of past runs keyed by script path, version number and content
+    hash. Scripts that were never saved are keyed by their tab name instead.
+    Regressions are only looked for among uninstrumented runs of one mode, as
+    profilers and cold or warm starts change the wall time on their own.
+    """
+    OUTPUT_LIMIT = 16 * 1024
+    # A version is flagged when its median wall time is this much slower
+    # than the runs of the versions before it
+    REGRESSION_RATIO = 1.25
+    REGRESSION_MIN_SECONDS = 0.05
+    REGRESSION_MIN_RUNS = 3
+    BASELINE_RUNS = 30
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            script TEXT,
+            filepath TEXT,
+            version INTEGER,
+            content_hash TEXT,
+            mode TEXT,
+            instrument TEXT,
+            exit_code INTEGER,
+            wall_time REAL,
+            user_cpu REAL,
+            system_cpu REAL,
+            max_rss INTEGER,
+            block_input INTEGER,
+            block_output INTEGER,
+            voluntary_switches INTEGER,
+            involuntary_switches INTEGER,
+            output TEXT,
+            regression TEXT
+        );
+        CREATE INDEX IF NOT EXISTS runs_by_filepath ON runs(filepath, id);
+        CREATE INDEX IF NOT EXISTS runs_by_script ON runs(script, id);
+        CREATE INDEX IF NOT EXISTS runs_by_hash ON runs(content_hash, id);
+    """
+
+    def __init__(self, db_file=None):
+        data_dir = Path.home() / '.python_executor'
+        self.db_file = Path(db_file) if db_file else data_dir / 'run_history.db'
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_file))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(self.SCHEMA)
+
+    def _insert(self, timestamp, script, filepath, version, code_hash, mode, instrument, exit_code,
+                metrics, output, regression):
+        usage = [getattr(metrics, field) if metrics.available else None for field in RunMetrics.FIELDS]
+        cursor = self.connection.execute(
+            f"INSERT INTO runs (timestamp, script, filepath, version, content_hash, mode, instrument, "
+            f"exit_code, wall_time, {', '.join(RunMetrics.FIELDS)}, output, regression) "
+            f"VALUES ({', '.join('?' * (11 + len(RunMetrics.FIELDS)))})",
+            [timestamp, script, filepath, version, code_hash, mode, instrument, exit_code,
+             metrics.wall_time, *usage, output, regression])
+        return cursor.lastrowid
+
+    def record(self, script, code, exit_code, metrics, mode=None, filepath=None,
+               version=None, output='', instrument=None):
+        """
+        Store a finished run and return (run_id, regression) where regression
+        is a description of a slowdown of this version, or None.
+        """
+        code_hash = content_hash(code)
+        if output and len(output) > self.OUTPUT_LIMIT:
+            output = '...\n' + output[-self.OUTPUT_LIMIT:]
+        try:
+            with self.connection:
+                run_id = self._insert(datetime.datetime.now().isoformat(), script, filepath, version,
+                                      code_hash, mode, instrument, exit_code, metrics, output, None)
+                regression = self.check_regression(script, filepath, code_hash, version, mode, instrument)
+                if regression:
+                    self.connection.execute("UPDATE runs SET regression = ? WHERE id = ?",
+                                            (regression, run_id))
+            return run_id, regression
+        except Exception as e:
+            print(f"Error recording run: {e}")
+            return None, None
+
+    def _key(self, script, filepath):
+        return ("filepath = ?", filepath) if filepath else ("filepath IS NULL AND script = ?", script)
+
+    def runs(self, script=None, filepath=None, code_hash=None, version=None,
+             failed_only=False, limit=200, offset=0):
+        """Query stored runs, newest first. Every filter is optional."""
+        conditions, params = [], []
+        if filepath or script:
+            condition, value = self._key(script, filepath)
+            conditions.append(condition)
+            params.append(value)
+        if code_hash:
+            conditions.append("content_hash = ?")
+            params.append(code_hash)
+        if version is not None:
+            conditions.append("version = ?")
+            params.append(version)
+        if failed_only:
+            conditions.append("exit_code != 0")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        try:
+            rows = self.connection.execute(
+                f"SELECT * FROM runs {where} ORDER BY id DESC LIMIT ? OFFSET ?",
+                [*params, limit, offset]).fetchall()
+        except Exception as e:
+            print(f"Error reading run history: {e}")
+            return []
+        return [self._to_dict(row) for row in rows]
+
+    def _to_dict(self, row):
+        entry = dict(row)
+        usage = {field: entry.pop(field) for field in RunMetrics.FIELDS}
+        if any(value is None for value in usage.values()):
+            usage = None
+        entry['metrics'] = RunMetrics(entry['wall_time'] or 0.0, usage)
+        return entry
+
+    def _wall_times(self, script, filepath, code_hash, mode, same):
+        """
+        Recent successful, uninstrumented wall times in mode of this content,
+        or of the contents run before it
+        """
+        condition, value = self._key(script, filepath)
+        if same:
+            content_condition, params = "content_hash = ?", [code_hash]
+        else:
+            content_condition = ("content_hash != ? AND id < (SELECT MIN(id) FROM runs "
+                                 f"WHERE {condition} AND content_hash = ?)")
+            params = [code_hash, value, code_hash]
+        rows = self.connection.execute(
+            f"SELECT wall_time FROM runs WHERE {condition} AND exit_code = 0 "
+            f"AND mode IS ? AND instrument IS NULL AND {content_condition} ORDER BY id DESC LIMIT ?",
+            [value, mode, *params, self.BASELINE_RUNS]).fetchall()
+        return [row['wall_time'] for row in rows]
+
+    def check_regression(self, script, filepath, code_hash, version=None, mode=None, instrument=None):
+        """
+        Compare successful runs of this content against the most recent runs
+        of the contents the script had before it, in the same mode and without
+        instrumentation. Returns a message or None.
+        """
+        if instrument:
+            return None
+        current = self._wall_times(script, filepath, code_hash, mode, same=True)
+        baseline = self._wall_times(script, filepath, code_hash, mode, same=False)
+        if len(current) < self.REGRESSION_MIN_RUNS or len(baseline) < self.REGRESSION_MIN_RUNS:
+            return None
+
+        current_median = statistics.median(current)
+        baseline_median = statistics.median(baseline)
+        if (current_median > baseline_median * self.REGRESSION_RATIO
+                and current_median - baseline_median > self.REGRESSION_MIN_SECONDS):
+            label = f"Version {version}" if version else f"Content {code_hash[:8]}"
+            return (f"{label} is {current_median / baseline_median:.1f}x slower than its predecessors "
+                    f"(median {current_median:.2f}s vs {baseline_median:.2f}s)")
+        return None
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,42 @@
+class RunMetrics:
+    """Resource usage of a single run as reported by the child runner"""
+    FIELDS = ('user_cpu', 'system_cpu', 'max_rss', 'block_input', 'block_output',
+              'voluntary_switches', 'involuntary_switches')
+
+    def __init__(self, wall_time=0.0, usage=None):
+        self.wall_time = wall_time
+        usage = usage or {}
+        self.available = bool(usage)
+        for field in self.FIELDS:
+            setattr(self, field, usage.get(field, 0))
+
+    @property
+    def cpu_time(self):
+        return self.user_cpu + self.system_cpu
+
+    def summary(self):
+        """One line description for the output window and status bar"""
+        parts = [f"wall {self.wall_time:.2f}s"]
+        if self.available:
+            parts.append(f"cpu {self.user_cpu:.2f}s user + {self.system_cpu:.2f}s sys")
+            parts.append(f"peak RSS {format_bytes(self.max_rss)}")
+            parts.append(f"io {self.block_input}/{self.block_output} blocks in/out")
+            parts.append(f"ctx {self.voluntary_switches}/{self.involuntary_switches} vol/invol")
+        return ' | '.join(parts)
+
+    def to_dict(self):
+        data = {'wall_time': self.wall_time}
+        if self.available:
+            data.update({field: getattr(self, field) for field in self.FIELDS})
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        usage = {k: v for k, v in data.items() if k in cls.FIELDS}
+        return cls(data.get('wall_time', 0.0), usage)
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size} B"
+        size /= 1024
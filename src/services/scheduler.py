@@ -0,0 +1,179 @@
+import os
+import time
+import itertools
+from PyQt5.QtCore import QObject, QSettings, pyqtSignal
+
+JOB_QUEUED = 'Queued'
+JOB_RUNNING = 'Running'
+JOB_FINISHED = 'Finished'
+JOB_FAILED = 'Failed'
+JOB_CANCELLED = 'Cancelled'
+
+class Job:
+    """A queued or running script execution managed by the JobScheduler"""
+    _ids = itertools.count(1)
+
+    def __init__(self, scheduler, name, code, priority=0, run_options=None, callbacks=None):
+        self.scheduler = scheduler
+        self.job_id = next(self._ids)
+        self.name = name
+        self.code = code
+        self.priority = priority
+        self.run_options = run_options or {}
+        self.callbacks = callbacks or {}
+        self.status = JOB_QUEUED
+        self.run = None
+        self.exit_code = None
+        self.duration = 0.0
+        self.cancelled = False
+        self.submitted = time.time()
+
+    @property
+    def metrics(self):
+        return self.run.metrics if self.run is not None else None
+
+    @property
+    def mode(self):
+        return self.run.mode if self.run is not None else self.run_options.get('mode')
+
+    @property
+    def instrument(self):
+        return self.run_options.get('instrument')
+
+    @property
+    def limit_exceeded(self):
+        return getattr(self.run, 'limit_exceeded', None)
+
+    def is_running(self):
+        return self.status in (JOB_QUEUED, JOB_RUNNING)
+
+    def cancel(self):
+        self.scheduler.cancel(self)
+
+    def kill(self):
+        self.scheduler.cancel(self, kill=True)
+
+class JobScheduler(QObject):
+    """
+    Runs jobs through the ScriptExecutor with at most max_parallel running at once.
+    Queued jobs start in priority order, then in submission order.
+    """
+    job_added = pyqtSignal(object)
+    job_updated = pyqtSignal(object)
+
+    def __init__(self, executor, parent=None):
+        super().__init__(parent)
+        self.executor = executor
+        self.settings = QSettings('PythonExecutor', 'Executor')
+        self.max_parallel = int(self.settings.value('max_parallel_jobs', os.cpu_count() or 2))
+        self.jobs = []
+
+    def set_max_parallel(self, max_parallel):
+        self.max_parallel = max(1, max_parallel)
+        self.settings.setValue('max_parallel_jobs', self.max_parallel)
+        self._schedule()
+
+    def submit(self, name, code, priority=0, output_callback=None, error_callback=None,
+               finished_callback=None, report_callback=None, **run_options):
+        """Queue code for execution and return its Job"""
+        job = Job(self, name, code, priority, run_options, {
+            'output': output_callback,
+            'error': error_callback,
+            'finished': finished_callback,
+            'report': report_callback
+        })
+        self.jobs.append(job)
+        self.job_added.emit(job)
+        self._schedule()
+        return job
+
+    def cancel(self, job, kill=False):
+        if job.status == JOB_QUEUED:
+            job.cancelled = True
+            self._set_status(job, JOB_CANCELLED)
+            self._notify_finished(job)
+        elif job.status == JOB_RUNNING:
+            job.cancelled = True
+            if kill:
+                job.run.kill()
+            else:
+                job.run.cancel()
+
+    def set_priority(self, job, priority):
+        job.priority = priority
+        self.job_updated.emit(job)
+        self._schedule()
+
+    def queued_jobs(self):
+        return sorted((j for j in self.jobs if j.status == JOB_QUEUED),
+                      key=lambda j: (-j.priority, j.job_id))
+
+    def running_jobs(self):
+        return [j for j in self.jobs if j.status == JOB_RUNNING]
+
+    def queue_position(self, job):
+        """1-based position of a queued job, or 0 if it is not queued"""
+        queued = self.queued_jobs()
+        return queued.index(job) + 1 if job in queued else 0
+
+    def clear_finished(self):
+        self.jobs = [j for j in self.jobs if j.is_running()]
+
+    def _schedule(self):
+        # Starting a job can finish it and schedule again, so look at the queue afresh each time
+        while len(self.running_jobs()) < self.max_parallel:
+            queued = self.queued_jobs()
+            if not queued:
+                return
+            self._start(queued[0])
+
+    def _start(self, job):
+        self._set_status(job, JOB_RUNNING)
+        try:
+            job.run = self.executor.run_script(
+                job.code,
+                self._forward(job, 'output'),
+                error_callback=self._forward(job, 'error'),
+                finished_callback=lambda exit_code, duration: self._on_finished(job, exit_code, duration),
+                report_callback=self._forward(job, 'report'),
+                **job.run_options
+            )
+        except Exception as e:
+            # A job that cannot start must not hold its slot; the caller moves on to the next one
+            self._forward(job, 'error')(f"Could not start job: {e}\n")
+            job.exit_code = -1
+            self._set_status(job, JOB_FAILED)
+            self._notify_finished(job)
+
+    def _forward(self, job, name):
+        def forward(data):
+            callback = job.callbacks.get(name)
+            if callback:
+                callback(data)
+        return forward
+
+    def _on_finished(self, job, exit_code, duration):
+        job.exit_code = exit_code
+        job.duration = duration
+        if job.cancelled:
+            status = JOB_CANCELLED
+        else:
+            status = JOB_FINISHED if exit_code == 0 else JOB_FAILED
+        self._set_status(job, status)
+        self._notify_finished(job)
+        self._schedule()
+
+    def _notify_finished(self, job):
+        callback = job.callbacks.get('finished')
+        if callback:
+            callback(job.exit_code if job.exit_code is not None else -1, job.duration)
+
+    def _set_status(self, job, status):
+        job.status = status
+        self.job_updated.emit(job)
+
+    def shutdown(self):
+        for job in list(self.jobs):
+            if job.status == JOB_QUEUED:
+                job.cancelled = True
+                job.status = JOB_CANCELLED
@@ -0,0 +1,135 @@
+import os
+import json
+import sqlite3
+from pathlib import Path
+
+class ScriptCatalog:
+    """
+    SQLite index of the script library holding the metadata, version count
+    and size of every script, so listing scripts does not open script files.
+    A category is only rescanned when its directory's mtime has changed,
+    which every save does by renaming the header into place; a rescan then
+    re-reads just the files whose mtime or size changed. read_entry(filepath)
+    returns (metadata, version_count, size), or None when it cannot be read.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scripts (
+            filepath TEXT PRIMARY KEY,
+            category TEXT NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            file_size INTEGER NOT NULL,
+            metadata TEXT NOT NULL,
+            version_count INTEGER,
+            size INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS scripts_by_category ON scripts(category, filepath);
+        CREATE TABLE IF NOT EXISTS categories (
+            category TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, scripts_dir, read_entry, db_file=None):
+        self.scripts_dir = Path(scripts_dir)
+        self.read_entry = read_entry
+        data_dir = Path.home() / '.python_executor'
+        self.db_file = Path(db_file) if db_file else data_dir / 'script_catalog.db'
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_file))
+        self.connection.executescript(self.SCHEMA)
+        # category -> (directory mtime_ns, entries sorted by filepath)
+        self._listings = {}
+        # filepath -> (mtime_ns, file_size) the in-memory entry was read at
+        self._stats = {}
+
+    def entries(self, categories):
+        """
+        Entry dicts (filepath, category, metadata, version_count, size) of the
+        scripts in categories, bringing the catalog up to date on the way.
+        """
+        self._load([category for category in categories if category not in self._listings])
+        entries = []
+        for category in categories:
+            try:
+                mtime_ns = os.stat(self.scripts_dir / category).st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if self._listings[category][0] != mtime_ns:
+                with self.connection:
+                    self._listings[category] = (mtime_ns, self._scan(category))
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO categories (category, mtime_ns) VALUES (?, ?)",
+                        (category, mtime_ns))
+            entries.extend(self._listings[category][1])
+        return entries
+
+    def update(self, filepath, category, metadata, version_count, size):
+        """Record a script that was just written"""
+        filepath = str(filepath)
+        try:
+            stat = os.stat(filepath)
+            with self.connection:
+                entry = self._store(filepath, category, stat, metadata, version_count, size)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error updating script catalog: {e}")
+            return
+        self._stats[filepath] = (stat.st_mtime_ns, stat.st_size)
+        listing = self._listings.get(category)
+        if listing is not None:
+            entries = [e for e in listing[1] if e['filepath'] != filepath] + [entry]
+            # The save changed the directory's mtime; only a change by someone else calls for a rescan
+            try:
+                mtime_ns = os.stat(self.scripts_dir / category).st_mtime_ns
+            except OSError:
+                mtime_ns = listing[0]
+            self._listings[category] = (mtime_ns, sorted(entries, key=lambda e: e['filepath']))
+
+    def _load(self, categories):
+        """Read the stored listings of categories into memory"""
+        if not categories:
+            return
+        placeholders = ', '.join('?' * len(categories))
+        listings = {category: (None, []) for category in categories}
+        for category, mtime_ns in self.connection.execute(
+                f"SELECT category, mtime_ns FROM categories WHERE category IN ({placeholders})", categories):
+            listings[category] = (mtime_ns, [])
+        for filepath, category, mtime_ns, file_size, metadata, version_count, size in self.connection.execute(
+                f"SELECT filepath, category, mtime_ns, file_size, metadata, version_count, size FROM scripts "
+                f"WHERE category IN ({placeholders}) ORDER BY filepath", categories):
+            listings[category][1].append({'filepath': filepath, 'category': category,
+                                          'metadata': json.loads(metadata),
+                                          'version_count': version_count, 'size': size})
+            self._stats[filepath] = (mtime_ns, file_size)
+        self._listings.update(listings)
+
+    def _scan(self, category):
+        """Re-read the changed files of a category and drop the entries of removed ones"""
+        known = {entry['filepath']: entry for entry in self._listings[category][1]}
+        entries = []
+        for file in os.scandir(self.scripts_dir / category):
+            if not file.name.endswith('.json') or not file.is_file():
+                continue
+            stat = file.stat()
+            entry = known.get(file.path)
+            if entry is None or self._stats.get(file.path) != (stat.st_mtime_ns, stat.st_size):
+                entry = self.read_entry(file.path)
+                if entry is None:
+                    continue
+                entry = self._store(file.path, category, stat, *entry)
+                self._stats[file.path] = (stat.st_mtime_ns, stat.st_size)
+            entries.append(entry)
+        present = {entry['filepath'] for entry in entries}
+        removed = [filepath for filepath, in self.connection.execute(
+            "SELECT filepath FROM scripts WHERE category = ?", (category,)) if filepath not in present]
+        self.connection.executemany("DELETE FROM scripts WHERE filepath = ?", [(filepath,) for filepath in removed])
+        for filepath in removed:
+            self._stats.pop(filepath, None)
+        return sorted(entries, key=lambda entry: entry['filepath'])
+
+    def _store(self, filepath, category, stat, metadata, version_count, size):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO scripts (filepath, category, mtime_ns, file_size, metadata, "
+            "version_count, size) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (filepath, category, stat.st_mtime_ns, stat.st_size, json.dumps(metadata), version_count, size))
+        return {'filepath': filepath, 'category': category, 'metadata': metadata,
+                'version_count': version_count, 'size': size}
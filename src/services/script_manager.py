@@ -1,13 +1,29 @@
 import os
 import json
+import sqlite3
 from pathlib import Path
 import datetime
 import shutil
+from collections import OrderedDict
+from .version_store import (VersionStore, LogRecords, FORMAT, log_path, append_log, write_log,
+                            write_atomic)
+from .script_catalog import ScriptCatalog
+from .search_index import SearchIndex
 
 class ScriptManager:
+    # Contents of recently viewed versions kept in memory
+    VERSION_CACHE_SIZE = 64
+
     def __init__(self):
         self.scripts_dir = Path.home() / '.python_executor' / 'scripts'
         self.scripts_dir.mkdir(parents=True, exist_ok=True)
+        # Kept outside scripts_dir, whose subdirectories are categories
+        self.pipelines_dir = Path.home() / '.python_executor' / 'pipelines'
+        self.pipelines_dir.mkdir(parents=True, exist_ok=True)
+        self.catalog = ScriptCatalog(self.scripts_dir, self._catalog_entry)
+        self.search_index = SearchIndex()
+        self._version_cache = OrderedDict()
+        self._browsed = None  # (filepath, header mtime_ns, VersionStore) of the script last browsed
         
         # Initialize with default categories
         self.load_categories()
@@ -18,41 +34,92 @@ class ScriptManager:
             return False
 
         try:
-            # Load existing data
-            with open(filepath, 'r') as f:
-                script_data = json.load(f)
-            
-            versions = script_data.get('versions', [])
-            current_metadata = script_data.get('metadata', {})
-            
+            header, store = self._read_script(filepath)
+            current_metadata = header.get('metadata', {})
+            now = datetime.datetime.now().isoformat()
+
             # Update metadata
             current_metadata.update(metadata)
-            current_metadata['last_modified'] = datetime.datetime.now().isoformat()
-            current_metadata['current_version'] = len(versions) + 1
-            
-            # Create new version
-            new_version = {
-                'content': content,
-                'timestamp': datetime.datetime.now().isoformat(),
-                'version_number': len(versions) + 1
-            }
-            
-            # Add new version
-            versions.append(new_version)
-            
-            # Save updated data
-            script_data = {
-                'metadata': current_metadata,
-                'versions': versions
-            }
-            
-            with open(filepath, 'w') as f:
-                json.dump(script_data, f, indent=2)
-            
+            current_metadata['last_modified'] = now
+            current_metadata['current_version'] = store.append(content, now)
+
+            self._commit_version(filepath, current_metadata, header, store)
             return True
         except Exception as e:
             print(f"Error adding version: {e}")
-            return False        
+            return False
+
+    def _read_script(self, filepath):
+        """
+        Returns (header, VersionStore) of a script file. The header holds the
+        metadata and the size of the committed part of the version log; its
+        log_size is None for files in the older formats, which keep their
+        versions inline. The log is read lazily, so appending a version only
+        decodes the records back to the last snapshot.
+        """
+        with open(filepath, 'r') as f:
+            header = json.load(f)
+        if header.get('format') == FORMAT:
+            # Anything past the committed size is a torn or uncommitted record
+            records = LogRecords(log_path(filepath), header.get('log_size', 0))
+            header['log_size'] = records.size
+            return header, VersionStore(records)
+        header['log_size'] = None
+        return header, VersionStore.from_script_data(header)
+
+    def _commit_version(self, filepath, metadata, header, store):
+        """
+        Append the newest version to the script's log, then commit it by
+        replacing the header. A crash at any point leaves the previous save intact.
+        """
+        path = log_path(filepath)
+        log_size = header.get('log_size')
+        file_size = os.path.getsize(path) if os.path.exists(path) else None
+        if log_size is not None and file_size is not None and file_size >= log_size:
+            if file_size > log_size:
+                # Reclaim the dead bytes an interrupted save left past the committed records
+                os.truncate(path, log_size)
+            log_size = append_log(path, [store.records[-1]], log_size)
+        else:
+            # Write every version to a new log, for new scripts, older formats
+            # and logs that went missing
+            log_size = write_log(path, store.records)
+        script_header = {
+            'format': FORMAT,
+            'metadata': metadata,
+            'version_count': len(store),
+            'log_size': log_size
+        }
+        data = json.dumps(script_header, indent=2).encode('utf-8')
+        write_atomic(str(filepath), data)
+        self.catalog.update(filepath, Path(filepath).parent.name, metadata, len(store), len(data) + log_size)
+        self._index_versions(filepath, metadata, store)
+
+    def _index_versions(self, filepath, metadata, store):
+        """Add the versions of a script that the search index does not have yet"""
+        try:
+            indexed = self.search_index.version_count(filepath)
+            if indexed > len(store):
+                # The script was recreated with a shorter history
+                self.search_index.remove_scripts([filepath])
+                indexed = 0
+            self.search_index.update_script(filepath, metadata, store.iter_contents(indexed + 1))
+        except sqlite3.Error as e:
+            print(f"Error updating search index for {filepath}: {e}")
+
+    def _catalog_entry(self, filepath):
+        """(metadata, version count, size on disk) of a script file for the catalog"""
+        try:
+            with open(filepath, 'r') as f:
+                header = json.load(f)
+            size = os.path.getsize(filepath)
+            if header.get('format') == FORMAT:
+                version_count = header.get('version_count', header['metadata'].get('current_version'))
+                return header['metadata'], version_count, size + header.get('log_size', 0)
+            return header['metadata'], len(header.get('versions', [])), size
+        except Exception as e:
+            print(f"Error reading script {filepath}: {e}")
+            return None
 
     def load_categories(self):
         """Load existing categories from directory structure"""
@@ -97,45 +164,30 @@ class ScriptManager:
         script_file = category_dir / f"{safe_name}.json"
         
         # Load existing versions if they exist
-        versions = []
+        header, store = {}, VersionStore()
         if script_file.exists():
             try:
-                with open(script_file, 'r') as f:
-                    existing_data = json.load(f)
-                    versions = existing_data.get('versions', [])
-            except json.JSONDecodeError:
+                header, store = self._read_script(script_file)
+            except (json.JSONDecodeError, KeyError, ValueError):
                 # Handle corrupted file
-                versions = []
-        
-        # Create new version
-        new_version = {
-            'content': content,
-            'timestamp': datetime.datetime.now().isoformat(),
-            'version_number': len(versions) + 1
-        }
-        
-        # Add new version to versions list
-        versions.append(new_version)
-        
+                header, store = {}, VersionStore()
+
+        # Add new version
+        now = datetime.datetime.now().isoformat()
+        version_number = store.append(content, now)
+
         # Update metadata
         metadata.update({
             'name': safe_name,
             'category': category,
-            'last_modified': datetime.datetime.now().isoformat(),
-            'created': metadata.get('created', datetime.datetime.now().isoformat()),
-            'current_version': len(versions)
+            'last_modified': now,
+            'created': metadata.get('created', now),
+            'current_version': version_number
         })
-        
-        # Create complete script data
-        script_data = {
-            'metadata': metadata,
-            'versions': versions
-        }
-        
+
         # Save to file
         try:
-            with open(script_file, 'w') as f:
-                json.dump(script_data, f, indent=2)
+            self._commit_version(script_file, metadata, header, store)
             return str(script_file)
         except Exception as e:
             print(f"Error saving script: {e}")
@@ -144,56 +196,56 @@ class ScriptManager:
     def load_script(self, filepath, version=None):
         """
         Load a script and optionally a specific version.
-        Returns (content, metadata, versions)
+        Returns (content, metadata, versions) where versions are the headers
+        of all versions, without their content.
         """
         if not os.path.exists(filepath):
             return None, None, None
             
         try:
             with open(filepath, 'r') as f:
-                script_data = json.load(f)
+                metadata = json.load(f).get('metadata', {})
+            store = self._browse(filepath)
         except Exception as e:
             print(f"Error loading script {filepath}: {e}")
             return None, None, None
-            
-        versions = script_data.get('versions', [])
-        metadata = script_data.get('metadata', {})
-        
+
         if version is None:
-            version = metadata.get('current_version', len(versions))
-        
-        if versions and 1 <= version <= len(versions):
-            content = versions[version - 1]['content']
+            version = metadata.get('current_version', len(store))
+
+        if 1 <= version <= len(store):
+            content = self.get_version_content(filepath, version)
         else:
             content = ''
-            
-        return content, metadata, versions
+
+        return content, metadata, store.headers()
 
     def list_scripts(self, category=None):
         """
         List all scripts, optionally filtered by category.
         Returns list of (filepath, metadata) tuples.
         """
-        scripts = []
-        
-        if category:
-            categories = [category]
-        else:
-            categories = self.categories
-            
+        return [(entry['filepath'], entry['metadata']) for entry in self.list_script_entries(category)]
+
+    def list_script_entries(self, category=None):
+        """
+        Catalog entries of all scripts, optionally filtered by category: dicts
+        with filepath, category, metadata, version_count and size.
+        """
+        categories = [category] if category else self.categories
+        try:
+            return self.catalog.entries(categories)
+        except sqlite3.Error as e:
+            print(f"Error reading script catalog: {e}")
+        entries = []
         for cat in categories:
-            cat_dir = self.scripts_dir / cat
-            if cat_dir.exists():
-                for file in cat_dir.glob('*.json'):
-                    try:
-                        with open(file, 'r') as f:
-                            script_data = json.load(f)
-                            scripts.append((str(file), script_data['metadata']))
-                    except Exception as e:
-                        print(f"Error reading script {file}: {e}")
-                        continue
-                        
-        return scripts
+            for file in sorted((self.scripts_dir / cat).glob('*.json')):
+                entry = self._catalog_entry(str(file))
+                if entry is not None:
+                    metadata, version_count, size = entry
+                    entries.append({'filepath': str(file), 'category': cat, 'metadata': metadata,
+                                    'version_count': version_count, 'size': size})
+        return entries
 
     def get_script_versions(self, filepath):
         """Get all versions of a script"""
@@ -201,9 +253,147 @@ class ScriptManager:
             return []
             
         try:
-            with open(filepath, 'r') as f:
-                script_data = json.load(f)
-                return script_data.get('versions', [])
+            _, store = self._read_script(filepath)
+            return store.versions()
+        except Exception as e:
+            print(f"Error reading versions from {filepath}: {e}")
+            return []
+
+    def _browse(self, filepath):
+        """A VersionStore of the script that reads its log lazily"""
+        filepath = str(filepath)
+        mtime_ns = os.stat(filepath).st_mtime_ns
+        if self._browsed is not None and self._browsed[:2] == (filepath, mtime_ns):
+            return self._browsed[2]
+        with open(filepath, 'r') as f:
+            header = json.load(f)
+        if header.get('format') == FORMAT:
+            store = VersionStore(LogRecords(log_path(filepath), header.get('log_size', 0)))
+        else:
+            store = VersionStore.from_script_data(header)
+        self._browsed = (filepath, mtime_ns, store)
+        return store
+
+    def get_version_headers(self, filepath, offset=0, limit=None):
+        """
+        Headers of a page of a script's versions, oldest first, without their
+        content. Returns (headers, total number of versions).
+        """
+        try:
+            store = self._browse(filepath)
+            return store.headers(offset, limit), len(store)
         except Exception as e:
             print(f"Error reading versions from {filepath}: {e}")
-            return []
\ No newline at end of file
+            return [], 0
+
+    def get_version_content(self, filepath, version_number):
+        """Content of one version of a script, or None if it cannot be read"""
+        try:
+            store = self._browse(filepath)
+            if not 1 <= version_number <= len(store):
+                return None
+            record = store.records[version_number - 1]
+            key = (str(filepath), version_number, record.get('hash') or record['timestamp'])
+            content = self._version_cache.get(key)
+            if content is None:
+                content = store.content(version_number)
+                self._version_cache[key] = content
+                if len(self._version_cache) > self.VERSION_CACHE_SIZE:
+                    self._version_cache.popitem(last=False)
+            else:
+                self._version_cache.move_to_end(key)
+            return content
+        except Exception as e:
+            print(f"Error reading version {version_number} of {filepath}: {e}")
+            return None
+
+    def pending_search_updates(self):
+        """
+        Catalog entries of the scripts whose versions or metadata the search
+        index does not have yet. Scripts whose files are gone are dropped from it.
+        """
+        indexed = self.search_index.indexed_scripts()
+        pending = []
+        for entry in self.list_script_entries():
+            known = indexed.pop(entry['filepath'], None)
+            if known is None or known[0] != entry['version_count'] or json.loads(known[1]) != entry['metadata']:
+                pending.append(entry)
+        removed = [filepath for filepath in indexed if not os.path.exists(filepath)]
+        if removed:
+            self.search_index.remove_scripts(removed)
+        return pending
+
+    def index_script(self, filepath):
+        """Bring the search index up to date with one script"""
+        try:
+            with open(filepath, 'r') as f:
+                metadata = json.load(f).get('metadata', {})
+            self._index_versions(filepath, metadata, self._browse(filepath))
+        except Exception as e:
+            print(f"Error indexing script {filepath}: {e}")
+
+    def search_scripts(self, query, regex=False, case_sensitive=False, limit=100):
+        """Search the content of every version and the metadata of all scripts, see SearchIndex.search"""
+        for entry in self.pending_search_updates():
+            self.index_script(entry['filepath'])
+        return self.search_index.search(query, regex, case_sensitive, limit)
+
+    def find_scripts(self, name, category=None):
+        """
+        Find saved scripts by name, display name or CATEGORY/NAME.
+        Returns a list of (filepath, metadata) tuples.
+        """
+        if '/' in name and category is None:
+            category, name = name.split('/', 1)
+        safe_name = self._make_safe_filename(name)
+        return [(filepath, metadata) for filepath, metadata in self.list_scripts(category)
+                if name in (metadata.get('name'), metadata.get('display_name'))
+                or metadata.get('name') == safe_name]
+
+    def save_pipeline(self, definition):
+        """Save a pipeline definition dict. Returns its filepath."""
+        safe_name = self._make_safe_filename(definition.get('name', ''))
+        pipeline_file = self.pipelines_dir / f"{safe_name}.json"
+        now = datetime.datetime.now().isoformat()
+        definition = dict(definition, name=safe_name, last_modified=now)
+        definition.setdefault('created', now)
+        try:
+            with open(pipeline_file, 'w') as f:
+                json.dump(definition, f, indent=2)
+            return str(pipeline_file)
+        except Exception as e:
+            print(f"Error saving pipeline: {e}")
+            return None
+
+    def load_pipeline(self, name_or_path):
+        """Load a pipeline definition by name or filepath"""
+        path = Path(name_or_path)
+        if not path.exists():
+            path = self.pipelines_dir / f"{self._make_safe_filename(str(name_or_path))}.json"
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error loading pipeline {name_or_path}: {e}")
+            return None
+
+    def list_pipelines(self):
+        """Returns list of (filepath, definition) tuples"""
+        pipelines = []
+        for file in sorted(self.pipelines_dir.glob('*.json')):
+            try:
+                with open(file, 'r') as f:
+                    pipelines.append((str(file), json.load(f)))
+            except Exception as e:
+                print(f"Error reading pipeline {file}: {e}")
+        return pipelines
+
+    def delete_pipeline(self, filepath):
+        try:
+            os.remove(filepath)
+            return True
+        except OSError as e:
+            print(f"Error deleting pipeline {filepath}: {e}")
+            return False
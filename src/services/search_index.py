@@ -0,0 +1,210 @@
+import re
+import json
+import sqlite3
+from pathlib import Path
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+METADATA_FIELDS = ('name', 'display_name', 'category', 'description')
+SNIPPET_LENGTH = 160
+
+def required_literals(pattern, flags=0):
+    """
+    Literal substrings that every match of a regular expression contains,
+    longest first. Only runs of at least 3 characters are returned, the
+    shortest string a trigram index can look up.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return []
+    literals = ['']
+    for op, value in parsed:
+        if op == sre_parse.LITERAL:
+            literals[-1] += chr(value)
+        else:
+            literals.append('')
+    return sorted((literal for literal in literals if len(literal) >= 3), key=len, reverse=True)
+
+def snippet(text, start, end):
+    """(snippet, start, end): the line cut down to SNIPPET_LENGTH around the match"""
+    if len(text) <= SNIPPET_LENGTH:
+        return text, start, end
+    offset = max(0, min(start - SNIPPET_LENGTH // 3, len(text) - SNIPPET_LENGTH))
+    return text[offset:offset + SNIPPET_LENGTH], start - offset, min(end, offset + SNIPPET_LENGTH) - offset
+
+class SearchIndex:
+    """
+    Search index over the lines of every version of every saved script and
+    over script metadata. Each distinct line of a script is stored once with
+    the range of versions it was seen in and whether the current version has
+    it, so history only adds the lines that changed. Substring and regex
+    queries look up an FTS5 trigram index of those lines when SQLite has one,
+    and scan them otherwise; every candidate is checked with re.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scripts (
+            filepath TEXT PRIMARY KEY,
+            metadata TEXT NOT NULL,
+            version_count INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS lines (
+            id INTEGER PRIMARY KEY,
+            filepath TEXT NOT NULL,
+            text TEXT NOT NULL,
+            line_number INTEGER NOT NULL,
+            first_version INTEGER NOT NULL,
+            last_version INTEGER NOT NULL,
+            current INTEGER NOT NULL
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS lines_by_script ON lines(filepath, text);
+    """
+    # The text of a line never changes, so only inserts and deletes reach the index
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE lines_fts USING fts5(
+            text, content='lines', content_rowid='id', tokenize='trigram');
+        CREATE TRIGGER lines_fts_insert AFTER INSERT ON lines BEGIN
+            INSERT INTO lines_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+        CREATE TRIGGER lines_fts_delete AFTER DELETE ON lines BEGIN
+            INSERT INTO lines_fts(lines_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        END;
+        INSERT INTO lines_fts(lines_fts) VALUES ('rebuild');
+    """
+
+    def __init__(self, db_file=None):
+        data_dir = Path.home() / '.python_executor'
+        self.db_file = Path(db_file) if db_file else data_dir / 'search_index.db'
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_file))
+        self.connection.executescript(self.SCHEMA)
+        self.trigram_index = self._create_trigram_index()
+
+    def _create_trigram_index(self):
+        if self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'lines_fts'").fetchone() is not None:
+            return True
+        try:
+            self.connection.executescript(self.FTS_SCHEMA)
+            return True
+        except sqlite3.OperationalError as e:
+            # SQLite before 3.34 or built without FTS5
+            print(f"Search index without trigram lookup: {e}")
+            return False
+
+    def version_count(self, filepath):
+        """Number of versions of a script in the index"""
+        row = self.connection.execute("SELECT version_count FROM scripts WHERE filepath = ?",
+                                      (str(filepath),)).fetchone()
+        return row[0] if row else 0
+
+    def indexed_scripts(self):
+        """filepath -> (version_count, metadata JSON) of every indexed script"""
+        return {filepath: (version_count, metadata) for filepath, version_count, metadata in
+                self.connection.execute("SELECT filepath, version_count, metadata FROM scripts")}
+
+    def update_script(self, filepath, metadata, versions):
+        """
+        Add versions, an iterable of (version_number, content) in order and
+        newer than any indexed before, and store the script's metadata.
+        """
+        filepath = str(filepath)
+        entries = {}  # text -> [id, line_number, first_version, last_version, current]
+        for row in self.connection.execute(
+                "SELECT id, text, line_number, first_version, last_version, current "
+                "FROM lines WHERE filepath = ?", (filepath,)):
+            entries[row[1]] = [row[0], *row[2:]]
+        original = {text: tuple(entry) for text, entry in entries.items()}
+
+        version_count = None
+        seen = None
+        for version_number, content in versions:
+            version_count = version_number
+            seen = set()
+            for line_number, text in enumerate(content.splitlines(), 1):
+                if text in seen or not text.strip():
+                    continue
+                seen.add(text)
+                entry = entries.get(text)
+                if entry is None:
+                    entries[text] = [None, line_number, version_number, version_number, 1]
+                else:
+                    entry[1], entry[3] = line_number, version_number
+        if seen is not None:
+            for text, entry in entries.items():
+                entry[4] = 1 if text in seen else 0
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO lines (filepath, text, line_number, first_version, last_version, current) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(filepath, text, *entry[1:]) for text, entry in entries.items() if entry[0] is None])
+            self.connection.executemany(
+                "UPDATE lines SET line_number = ?, last_version = ?, current = ? WHERE id = ?",
+                [(entry[1], entry[3], entry[4], entry[0]) for text, entry in entries.items()
+                 if entry[0] is not None and tuple(entry) != original[text]])
+            if version_count is None:
+                self.connection.execute("UPDATE scripts SET metadata = ? WHERE filepath = ?",
+                                        (json.dumps(metadata), filepath))
+            else:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO scripts (filepath, metadata, version_count) VALUES (?, ?, ?)",
+                    (filepath, json.dumps(metadata), version_count))
+
+    def remove_scripts(self, filepaths):
+        with self.connection:
+            for filepath in filepaths:
+                self.connection.execute("DELETE FROM lines WHERE filepath = ?", (str(filepath),))
+                self.connection.execute("DELETE FROM scripts WHERE filepath = ?", (str(filepath),))
+
+    def search(self, query, regex=False, case_sensitive=False, limit=100, hits_per_script=20):
+        """
+        Scripts whose lines or metadata match query, best first. Each result
+        has filepath, metadata, score, metadata_match, hit_count and hits;
+        a hit has line_number, text (a snippet), start and end of the match
+        in it, current, first_version and last_version. Lines of the current
+        version come first. Raises re.error for an invalid regex.
+        """
+        flags = 0 if case_sensitive else re.IGNORECASE
+        pattern = query if regex else re.escape(query)
+        matcher = re.compile(pattern, flags)
+        literals = required_literals(pattern, flags)
+
+        columns = "lines.filepath, lines.text, lines.line_number, lines.first_version, " \
+                  "lines.last_version, lines.current"
+        if self.trigram_index and literals:
+            match = ' AND '.join('"' + literal.replace('"', '""') + '"' for literal in literals)
+            rows = self.connection.execute(
+                f"SELECT {columns} FROM lines_fts JOIN lines ON lines.id = lines_fts.rowid "
+                f"WHERE lines_fts MATCH ?", (match,))
+        else:
+            rows = self.connection.execute(f"SELECT {columns} FROM lines")
+
+        hits = {}
+        for filepath, text, line_number, first_version, last_version, current in rows:
+            found = matcher.search(text)
+            if found is None:
+                continue
+            text, start, end = snippet(text, found.start(), found.end())
+            hits.setdefault(filepath, []).append({
+                'line_number': line_number, 'text': text, 'start': start, 'end': end,
+                'current': bool(current), 'first_version': first_version, 'last_version': last_version})
+
+        results = []
+        for filepath, metadata in self.connection.execute("SELECT filepath, metadata FROM scripts"):
+            metadata = json.loads(metadata)
+            metadata_match = any(matcher.search(str(metadata.get(field) or '')) for field in METADATA_FIELDS)
+            script_hits = hits.get(filepath, [])
+            if not script_hits and not metadata_match:
+                continue
+            current_hits = sum(1 for hit in script_hits if hit['current'])
+            score = 2 * current_hits + (len(script_hits) - current_hits) + (10 if metadata_match else 0)
+            script_hits.sort(key=lambda hit: (not hit['current'], hit['line_number'] if hit['current']
+                                              else -hit['last_version']))
+            results.append({'filepath': filepath, 'metadata': metadata, 'score': score,
+                            'metadata_match': metadata_match, 'hit_count': len(script_hits),
+                            'hits': script_hits[:hits_per_script]})
+        results.sort(key=lambda result: (-result['score'], result['filepath']))
+        return results[:limit]
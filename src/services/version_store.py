@@ -0,0 +1,205 @@
+import os
+import json
+import zlib
+import base64
+import difflib
+from .run_history import content_hash
+
+FORMAT = 3
+SNAPSHOT_INTERVAL = 16
+LOG_SUFFIX = '.versions'
+
+def pack(value):
+    """JSON value -> compressed base64 text"""
+    return base64.b64encode(zlib.compress(json.dumps(value).encode('utf-8'))).decode('ascii')
+
+def unpack(data):
+    return json.loads(zlib.decompress(base64.b64decode(data)).decode('utf-8'))
+
+def make_delta(old, new):
+    """
+    Line delta that turns old into new: [start, end] copies lines of old,
+    a string is inserted as is.
+    """
+    old_lines = old.splitlines(True)
+    new_lines = new.splitlines(True)
+    delta = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            delta.append([i1, i2])
+        elif j2 > j1:
+            delta.append(''.join(new_lines[j1:j2]))
+    return delta
+
+def apply_delta(old, delta):
+    old_lines = old.splitlines(True)
+    return ''.join(''.join(old_lines[op[0]:op[1]]) if isinstance(op, list) else op for op in delta)
+
+class VersionStore:
+    """
+    The versions of one script as compact records. Every SNAPSHOT_INTERVAL-th
+    version is a compressed full copy and the ones in between are compressed
+    deltas against the previous version, so reading any version applies at
+    most SNAPSHOT_INTERVAL - 1 deltas. records is a list, or a LogRecords
+    that reads them from a version log as they are needed.
+    """
+
+    def __init__(self, records=None):
+        self.records = records or []
+        self._latest = None  # (version number, content) of the last version built
+
+    @classmethod
+    def from_script_data(cls, script_data):
+        """Read the versions kept inside a script file by the older formats"""
+        if script_data.get('format') == 2:
+            return cls(script_data.get('versions', []))
+        store = cls()
+        for version in script_data.get('versions', []):
+            store.append(version.get('content', ''), version.get('timestamp'))
+        return store
+
+    def __len__(self):
+        return len(self.records)
+
+    def headers(self, offset=0, limit=None):
+        """
+        Version headers (version_number, timestamp, size, hash) without the
+        content, oldest first. size and hash are None for versions saved
+        before they were recorded.
+        """
+        end = len(self.records) if limit is None else min(len(self.records), offset + limit)
+        return [header(self.records[i]) for i in range(max(offset, 0), end)]
+
+    def content(self, version_number):
+        if self._latest is not None and self._latest[0] == version_number:
+            return self._latest[1]
+        index = version_number - 1
+        start = index
+        while not self.records[start].get('snapshot'):
+            start -= 1
+        content = unpack(self.records[start]['data'])
+        for i in range(start + 1, index + 1):
+            content = apply_delta(content, unpack(self.records[i]['data']))
+        if version_number == len(self.records):
+            self._latest = (version_number, content)
+        return content
+
+    def versions(self):
+        """Every version as a dict with its content, each delta applied once"""
+        return [{'content': content, 'timestamp': self.records[number - 1]['timestamp'],
+                 'version_number': number} for number, content in self.iter_contents()]
+
+    def iter_contents(self, start=1):
+        """Yield (version_number, content) from version start on, each delta applied once"""
+        if not 1 <= start <= len(self.records):
+            return
+        content = self.content(start)
+        yield start, content
+        for index in range(start, len(self.records)):
+            record = self.records[index]
+            data = unpack(record['data'])
+            content = data if record.get('snapshot') else apply_delta(content, data)
+            yield index + 1, content
+
+    def append(self, content, timestamp):
+        """Add content as the next version and return its number"""
+        number = len(self.records) + 1
+        deltas = 0
+        for record in reversed(self.records):
+            if record.get('snapshot'):
+                break
+            deltas += 1
+        if not self.records or deltas >= SNAPSHOT_INTERVAL - 1:
+            record = {'snapshot': True, 'data': pack(content)}
+        else:
+            record = {'snapshot': False, 'data': pack(make_delta(self.content(number - 1), content))}
+        record.update(version_number=number, timestamp=timestamp,
+                      size=len(content.encode('utf-8')), hash=content_hash(content))
+        self.records.append(record)
+        self._latest = (number, content)
+        return number
+
+def header(record):
+    return {'version_number': record['version_number'], 'timestamp': record['timestamp'],
+            'size': record.get('size'), 'hash': record.get('hash')}
+
+class LogRecords:
+    """
+    The committed records of a version log as a sequence. Only the line
+    offsets are found up front; a record is parsed when it is indexed, so a
+    few versions can be read, or one appended, without decoding the whole
+    history. Appended records stay in memory until the caller writes them.
+    A missing log reads as empty.
+    """
+
+    def __init__(self, path, size):
+        try:
+            with open(path, 'rb') as f:
+                self.data = f.read(size)
+        except FileNotFoundError:
+            self.data = b''
+        self.offsets = [0]
+        position = self.data.find(b'\n')
+        while position >= 0:
+            self.offsets.append(position + 1)
+            position = self.data.find(b'\n', position + 1)
+        self.appended = []
+
+    @property
+    def size(self):
+        """Bytes taken by the complete committed records; a torn last one is not counted"""
+        return self.offsets[-1]
+
+    def __len__(self):
+        return len(self.offsets) - 1 + len(self.appended)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        committed = len(self.offsets) - 1
+        if index >= committed:
+            return self.appended[index - committed]
+        return json.loads(self.data[self.offsets[index]:self.offsets[index + 1]])
+
+    def append(self, record):
+        self.appended.append(record)
+
+def log_path(script_path):
+    """The version log kept next to a script's header file"""
+    return os.path.splitext(str(script_path))[0] + LOG_SUFFIX
+
+def _encode(records):
+    return b''.join(json.dumps(record).encode('utf-8') + b'\n' for record in records)
+
+def append_log(path, records, size):
+    """Append records to a log of size bytes and return the new size, once the data is on disk"""
+    data = _encode(records)
+    with open(path, 'ab') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return size + len(data)
+
+def write_log(path, records):
+    """Replace the whole log atomically and return its size"""
+    data = _encode(records)
+    write_atomic(path, data)
+    return len(data)
+
+def write_atomic(path, data):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,345 @@
+import os
+import json
+import time
+import itertools
+from collections import deque, OrderedDict
+from PyQt5.QtCore import QObject, QProcess, QSettings, QTimer, pyqtSignal
+from .headless import RUNNER_PATH
+from .run_metrics import RunMetrics
+
+class WorkerProcess(QObject):
+    """A pre-started interpreter running bbrun_runner.py in worker mode"""
+    ready = pyqtSignal(object)
+    record_received = pyqtSignal(dict)
+    died = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pid = None
+        self.is_ready = False
+        self.busy = False
+        self.runs_completed = 0
+        self.preloaded = set()    # modules already sent in preload requests
+        self.preload_full = False  # the worker reached its preload memory budget
+        self._buffer = b''
+
+        self.process = QProcess(self)
+        self.process.readyReadStandardOutput.connect(self._read_stdout)
+        self.process.readyReadStandardError.connect(self._read_stderr)
+        self.process.finished.connect(self._on_finished)
+        self.process.errorOccurred.connect(self._on_error)
+
+    def start(self):
+        self.process.start("python3", ["-u", RUNNER_PATH, "--worker"])
+
+    def send(self, request):
+        """Send a single JSON request to the worker"""
+        self.process.write((json.dumps(request) + '\n').encode())
+
+    def is_alive(self):
+        return self.process.state() != QProcess.NotRunning
+
+    def stop(self):
+        """Ask the worker to exit, killing it if it is busy"""
+        if not self.is_alive():
+            return
+        if self.busy:
+            self.process.kill()
+        else:
+            self.send({'op': 'exit'})
+            self.process.closeWriteChannel()
+
+    def kill(self):
+        if self.is_alive():
+            self.process.kill()
+
+    def _read_stdout(self):
+        self._buffer += self.process.readAllStandardOutput().data()
+        *lines, self._buffer = self._buffer.split(b'\n')
+        for line in lines:
+            self._handle_line(line.decode(errors='replace'))
+
+    def _handle_line(self, line):
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict) or 'type' not in record:
+                raise ValueError(line)
+        except ValueError:
+            # Only startup output comes before the worker captures fds 1 and 2
+            record = {'type': 'stdout', 'data': line + '\n'}
+
+        if record['type'] == 'ready':
+            self.pid = record.get('pid')
+            self.is_ready = True
+            self.ready.emit(self)
+        else:
+            self.record_received.emit(record)
+
+    def _read_stderr(self):
+        data = self.process.readAllStandardError().data().decode(errors='replace')
+        if data:
+            self.record_received.emit({'type': 'stderr', 'data': data})
+
+    def _on_error(self, error):
+        if error == QProcess.FailedToStart:
+            self._on_finished(-1, QProcess.CrashExit)
+
+    def _on_finished(self, exit_code, exit_status):
+        if self._buffer:
+            self._handle_line(self._buffer.decode(errors='replace'))
+            self._buffer = b''
+        self.is_ready = False
+        self.died.emit(self)
+
+class WorkerPool(QObject):
+    """
+    Keeps a number of warm worker interpreters ready to execute code.
+    Workers are recycled after max_runs executions or when they crash.
+    Idle workers import the modules passed to preload() ahead of the runs
+    that need them, each up to preload_budget bytes of extra memory.
+    """
+    MAX_PRELOAD_MODULES = 32
+
+    def __init__(self, size=None, max_runs=None, parent=None):
+        super().__init__(parent)
+        settings = QSettings('PythonExecutor', 'Executor')
+        self.size = size or int(settings.value('worker_pool_size', 2))
+        self.max_runs = max_runs or int(settings.value('worker_max_runs', 20))
+        self.preload_budget = int(settings.value('preload_memory_mb', 512)) * 1024 * 1024
+        self.preload_modules = OrderedDict()
+        self.workers = []
+        self._waiting = deque()
+        self._shutting_down = False
+
+    def start(self):
+        """Start workers until the pool is full"""
+        self._shutting_down = False
+        while len(self.workers) < self.size:
+            self._spawn()
+
+    def resize(self, size, max_runs):
+        self.size = size
+        self.max_runs = max_runs
+        idle = [w for w in self.workers if not w.busy]
+        while len(self.workers) > self.size and idle:
+            self._retire(idle.pop())
+        self.start()
+
+    def _spawn(self):
+        worker = WorkerProcess(self)
+        worker.ready.connect(self._dispatch)
+        worker.died.connect(self._on_worker_died)
+        worker.record_received.connect(lambda record, w=worker: self._on_worker_record(w, record))
+        self.workers.append(worker)
+        worker.start()
+        return worker
+
+    def _retire(self, worker):
+        if worker in self.workers:
+            self.workers.remove(worker)
+        worker.died.disconnect(self._on_worker_died)
+        worker.stop()
+        QTimer.singleShot(5000, worker.deleteLater)
+
+    def acquire(self, callback):
+        """Call callback(worker) as soon as an idle worker is available"""
+        self._waiting.append(callback)
+        self.start()
+        self._dispatch()
+
+    def withdraw(self, callback):
+        """Remove a callback that is still waiting for a worker"""
+        try:
+            self._waiting.remove(callback)
+        except ValueError:
+            pass
+
+    def interrupt(self, worker, run_id=None):
+        """Stop the code running in a pooled worker; its state is discarded"""
+        worker.kill()
+
+    def kill(self, worker):
+        worker.kill()
+
+    def release(self, worker):
+        """Return a worker after a run, recycling it if it has served enough runs"""
+        worker.busy = False
+        worker.runs_completed += 1
+        if worker.runs_completed >= self.max_runs:
+            self._retire(worker)
+            self.start()
+        self._dispatch()
+
+    def preload(self, modules):
+        """Ask idle workers to import modules; the most recently requested are kept"""
+        for name in modules:
+            self.preload_modules[name] = None
+            self.preload_modules.move_to_end(name)
+        while len(self.preload_modules) > self.MAX_PRELOAD_MODULES:
+            self.preload_modules.popitem(last=False)
+        self._dispatch()
+
+    def _dispatch(self, *_):
+        while self._waiting:
+            worker = next((w for w in self.workers if w.is_ready and not w.busy), None)
+            if worker is None:
+                return
+            worker.busy = True
+            self._waiting.popleft()(worker)
+        self._preload_idle()
+
+    def _preload_idle(self):
+        if self.preload_budget <= 0:
+            return
+        for worker in self.workers:
+            if not worker.is_ready or worker.busy or worker.preload_full:
+                continue
+            modules = [name for name in self.preload_modules if name not in worker.preloaded]
+            if not modules:
+                continue
+            # A preload occupies the worker like a run, so it is never interrupted by one
+            worker.preloaded.update(modules)
+            worker.busy = True
+            worker.send({'op': 'preload', 'modules': modules, 'budget': self.preload_budget,
+                         'cwd': os.getcwd()})
+
+    def _on_worker_record(self, worker, record):
+        if record.get('type') != 'preloaded':
+            return
+        worker.preload_full = record.get('over_budget', False)
+        worker.busy = False
+        self._dispatch()
+
+    def _on_worker_died(self, worker):
+        if worker in self.workers:
+            self.workers.remove(worker)
+        worker.deleteLater()
+        if not self._shutting_down:
+            self.start()
+
+    def shutdown(self):
+        self._shutting_down = True
+        self._waiting.clear()
+        for worker in list(self.workers):
+            self._retire(worker)
+            if not worker.process.waitForFinished(500):
+                worker.kill()
+                worker.process.waitForFinished(500)
+
+class WorkerRun(QObject):
+    """
+    A script execution dispatched to a worker, same interface as ScriptRun.
+    The pool may be a WorkerPool, a PersistentKernel or a PrivilegedWorker.
+    """
+    output_received = pyqtSignal(str)
+    error_received = pyqtSignal(str)
+    finished = pyqtSignal(int, float)
+
+    _ids = itertools.count(1)
+
+    def __init__(self, pool, code, filename='<bbrun>', argv=None, op='run',
+                 first_line=1, env=None, mode=None, request_options=None, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.code = code
+        self.filename = filename
+        self.argv = argv or []
+        self.env = env or {}
+        self.op = op
+        self.mode = mode or ('kernel' if op == 'exec' else 'warm')
+        self.first_line = first_line
+        self.request_options = request_options or {}
+        self.run_id = next(self._ids)
+        self.worker = None
+        self.exit_code = None
+        self.duration = 0.0
+        self.metrics = None
+        self.cancelled = False
+        self._usage = None
+        self._pending = False
+        self._start_time = None
+
+    def start(self):
+        self._pending = True
+        self._start_time = time.monotonic()
+        self.pool.acquire(self._on_worker)
+
+    def _on_worker(self, worker, error=None):
+        self._pending = False
+        if worker is None:
+            # The pool could not provide a worker at all, e.g. sudo authentication failed
+            self.error_received.emit(error or "No worker available\n")
+            self._finish(-1)
+            return
+        self.worker = worker
+        worker.record_received.connect(self._on_record)
+        worker.died.connect(self._on_worker_died)
+        worker.send({
+            'op': self.op,
+            'id': self.run_id,
+            'code': self.code,
+            'first_line': self.first_line,
+            'filename': self.filename,
+            'argv': self.argv,
+            'env': self.env,
+            'cwd': os.getcwd(),
+            **self.request_options
+        })
+
+    def is_running(self):
+        return self._pending or self.worker is not None
+
+    def cancel(self):
+        """Interrupt the run; how that is done is up to the pool"""
+        if not self.is_running():
+            return
+        self.cancelled = True
+        if self.worker is not None:
+            self.pool.interrupt(self.worker, self.run_id)
+        else:
+            self.kill()
+
+    def kill(self):
+        if not self.is_running():
+            return
+        self.cancelled = True
+        if self.worker is not None:
+            self.pool.kill(self.worker)
+        else:
+            self.pool.withdraw(self._on_worker)
+            self._pending = False
+            self._finish(-1)
+
+    def _on_record(self, record):
+        kind = record.get('type')
+        if kind == 'stdout':
+            self.output_received.emit(record.get('data', ''))
+        elif kind == 'stderr':
+            self.error_received.emit(record.get('data', ''))
+        elif kind == 'done' and record.get('id') == self.run_id:
+            self._usage = record.get('metrics')
+            worker = self._detach()
+            self.pool.release(worker)
+            self._finish(record.get('exit_code', 0))
+
+    def _on_worker_died(self, worker):
+        self._detach()
+        if not self.cancelled:
+            self.error_received.emit("Worker process exited unexpectedly\n")
+        self._finish(-1)
+
+    def _detach(self):
+        worker = self.worker
+        if worker is not None:
+            worker.record_received.disconnect(self._on_record)
+            worker.died.disconnect(self._on_worker_died)
+        self.worker = None
+        return worker
+
+    def _finish(self, exit_code):
+        if self.exit_code is not None:
+            return
+        self.exit_code = exit_code
+        self.duration = time.monotonic() - self._start_time
+        self.metrics = RunMetrics(self.duration, self._usage)
+        self.finished.emit(self.exit_code, self.duration)
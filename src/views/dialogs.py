@@ -83,11 +83,17 @@ class SaveScriptDialog(QDialog):
         }
 
 class LoadScriptDialog(QDialog):
+    # Versions listed at a time; content is only read for the selected one
+    VERSIONS_PER_PAGE = 100
+
     def __init__(self, script_manager, parent=None):
         super().__init__(parent)
         self.script_manager = script_manager
         self.selected_script = None
         self.selected_version = None
+        self.current_filepath = None
+        self.version_offset = 0
+        self.version_total = 0
         self.setup_ui()
         self.setWindowTitle("Load Script")
         self.setMinimumWidth(600)
@@ -133,6 +139,18 @@ class LoadScriptDialog(QDialog):
         right_layout.addWidget(QLabel("Version:"))
         right_layout.addWidget(self.version_combo)
 
+        page_layout = QHBoxLayout()
+        self.older_button = QPushButton("< Older")
+        self.older_button.clicked.connect(lambda: self.show_version_page(self.version_offset - self.VERSIONS_PER_PAGE))
+        page_layout.addWidget(self.older_button)
+        self.page_label = QLabel()
+        self.page_label.setAlignment(Qt.AlignCenter)
+        page_layout.addWidget(self.page_label, 1)
+        self.newer_button = QPushButton("Newer >")
+        self.newer_button.clicked.connect(lambda: self.show_version_page(self.version_offset + self.version_combo.count()))
+        page_layout.addWidget(self.newer_button)
+        right_layout.addLayout(page_layout)
+
         # Version details
         self.version_details = QTextEdit()
         self.version_details.setReadOnly(True)
@@ -163,32 +181,37 @@ class LoadScriptDialog(QDialog):
 
     def load_scripts(self):
         self.script_list.clear()
-        self.scripts = self.script_manager.list_scripts()
+        self.scripts = self.script_manager.list_script_entries()
         self.filter_scripts()
 
     def filter_scripts(self):
         self.script_list.clear()
         category = self.category_filter.currentText()
 
-        for filepath, metadata in self.scripts:
+        for entry in self.scripts:
+            filepath, metadata = entry['filepath'], entry['metadata']
             if category != "All Categories" and metadata.get('category') != category:
                 continue
 
             display_name = metadata.get('display_name', metadata.get('name', 'Untitled'))
             item = QListWidgetItem(display_name)
             item.setData(Qt.UserRole, (filepath, metadata))
+            item.setToolTip(f"{entry['version_count'] or 0} versions, {(entry['size'] or 0) / 1024:.1f} KB")
             self.script_list.addItem(item)
 
     def update_script_details(self, current, previous):
         self.version_combo.clear()
         self.metadata_display.clear()
         self.version_details.clear()
+        self.current_filepath = None
+        self.version_total = 0
 
         if not current:
+            self.update_page_controls()
             return
 
+        # The catalog's metadata; versions are read page by page
         filepath, metadata = current.data(Qt.UserRole)
-        content, metadata, versions = self.script_manager.load_script(filepath)
 
         # Display metadata
         metadata_text = f"""
@@ -200,27 +223,66 @@ Last Modified: {metadata.get('last_modified', 'Unknown')}
         """
         self.metadata_display.setText(metadata_text)
 
-        # Populate versions
-        if versions:
-            for version in versions:
-                version_name = f"Version {version['version_number']} - {version['timestamp']}"
-                self.version_combo.addItem(version_name, version)
+        # Start on the page with the most recent version
+        self.current_filepath = filepath
+        _, total = self.script_manager.get_version_headers(filepath, 0, 0)
+        self.show_version_page(max(total - self.VERSIONS_PER_PAGE, 0))
 
-            # Select the most recent version
-            self.version_combo.setCurrentIndex(len(versions) - 1)
+    def show_version_page(self, offset):
+        """
+        Pages are counted back from the newest version, so only the oldest page
+        may be short; a negative offset cuts the page off at version 1.
+        """
+        if self.current_filepath is None:
+            return
+        limit = self.VERSIONS_PER_PAGE
+        if offset < 0:
+            limit += offset
+            offset = 0
+        headers, self.version_total = self.script_manager.get_version_headers(
+            self.current_filepath, offset, limit)
+        self.version_offset = offset
+
+        # Only the selected version's content is read, once the page is filled
+        self.version_combo.blockSignals(True)
+        self.version_combo.clear()
+        for header in headers:
+            version_name = f"Version {header['version_number']} - {header['timestamp']}"
+            self.version_combo.addItem(version_name, header)
+        self.version_combo.setCurrentIndex(len(headers) - 1)
+        self.version_combo.blockSignals(False)
+        self.update_version_details(self.version_combo.currentIndex())
+        self.update_page_controls()
+
+    def update_page_controls(self):
+        count = self.version_combo.count()
+        if count:
+            self.page_label.setText(f"Versions {self.version_offset + 1}-{self.version_offset + count} "
+                                    f"of {self.version_total}")
+        else:
+            self.page_label.setText("")
+        self.older_button.setEnabled(self.version_offset > 0)
+        self.newer_button.setEnabled(self.version_offset + count < self.version_total)
 
     def update_version_details(self, index):
         if index < 0:
+            self.version_details.clear()
             return
 
         version = self.version_combo.itemData(index)
         if version:
+            content = self.script_manager.get_version_content(self.current_filepath, version['version_number'])
+            if content is None:
+                self.version_details.setText("Cannot read this version")
+                return
+            size = f"{version['size']} bytes" if version['size'] is not None else f"{len(content)} characters"
             details = f"""
 Version: {version['version_number']}
 Created: {version['timestamp']}
+Size: {size}
 Content Preview:
 ----------------
-{version['content'][:200]}{'...' if len(version['content']) > 200 else ''}"""
+{content[:200]}{'...' if len(content) > 200 else ''}"""
             self.version_details.setText(details)
 
     def get_selected_script(self):
@@ -229,6 +291,6 @@ Content Preview:
             return None
 
         filepath, metadata = current_item.data(Qt.UserRole)
-        version_idx = self.version_combo.currentIndex() + 1
+        version = self.version_combo.currentData()
 
-        return filepath, version_idx
+        return filepath, version['version_number'] if version else None
@@ -4,6 +4,7 @@ from .output_window import OutputWindow
 from .syntax import PythonSyntaxHighlighter
 from .auto_complete import AutoCompleteEdit
 from .line_numbers import LineNumberArea
+from .results_pane import ResultsPane
 
 __all__ = [
     'CodeEditor',
@@ -11,5 +12,6 @@ __all__ = [
     'OutputWindow',
     'PythonSyntaxHighlighter',
     'AutoCompleteEdit',
-    'LineNumberArea'
+    'LineNumberArea',
+    'ResultsPane'
 ]
\ No newline at end of file
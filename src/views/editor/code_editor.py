@@ -23,6 +23,7 @@ class CodeEditor(AutoCompleteEdit):
         self.blockCountChanged.connect(self.update_line_number_area_width)
         self.updateRequest.connect(self.update_line_number_area)
         self.cursorPositionChanged.connect(self.highlight_current_line)
+        self.document().contentsChange.connect(self.handle_contents_change)
 
         self.update_line_number_area_width(0)
 
@@ -39,8 +40,15 @@ class CodeEditor(AutoCompleteEdit):
 
     def line_number_area_width(self):
         digits = max(1, len(str(self.blockCount())))
-        space = 3 + self.fontMetrics().horizontalAdvance('9') * digits
-        return space
+        space = 6 + self.fontMetrics().horizontalAdvance('9') * digits
+        return space + self.line_number_area.timing_width()
+
+    def set_line_timings(self, timings):
+        """Paint a heat bar and per-line time in the gutter; cleared on the next edit"""
+        self.line_number_area.set_line_timings(timings)
+
+    def clear_line_timings(self):
+        self.line_number_area.clear_line_timings()
 
     def update_line_number_area_width(self, _):
         self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
@@ -53,6 +61,11 @@ class CodeEditor(AutoCompleteEdit):
         if rect.contains(self.viewport().rect()):
             self.update_line_number_area_width(0)
 
+    def handle_contents_change(self, position, removed, added):
+        # Timings refer to line numbers, which stop matching once the text changes
+        if removed or added:
+            self.clear_line_timings()
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
         cr = self.contentsRect()
@@ -1,10 +1,16 @@
 import os
+import ast
 import json
+import shlex
+import textwrap
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QSplitter
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QTextCursor
 from .code_editor import CodeEditor
 from .output_window import OutputWindow
+from .results_pane import ResultsPane
+from services.kernel import PersistentKernel
+from services.import_scanner import ImportScanner
 
 class CodeEditorTab(QWidget):
     def __init__(self, filepath=None, metadata=None, initial_content=''):
@@ -14,6 +20,13 @@ class CodeEditorTab(QWidget):
         self.display_name = self.metadata.get('display_name', 'Untitled')
         self.initial_content = initial_content
         self.last_saved_content = initial_content
+        self.current_run = None
+        self.kernel = None
+        self.memory_timeline = []
+        self.cache_capture = None
+        self.kernel_enabled = False
+        self.import_scanner = ImportScanner()
+        self.watch_session = None
         self.setup_ui()
         self.load_content()
 
@@ -36,10 +49,14 @@ class CodeEditorTab(QWidget):
 
         self.editor = CodeEditor()
         self.output_window = OutputWindow()
+        self.results_pane = ResultsPane()
+        self.results_pane.line_activated.connect(self.goto_line)
+        self.results_pane.hide()
 
         splitter.addWidget(self.editor)
         splitter.addWidget(self.output_window)
-        splitter.setSizes([700, 300])
+        splitter.addWidget(self.results_pane)
+        splitter.setSizes([600, 200, 200])
 
         layout.addWidget(splitter)
 
@@ -158,3 +175,107 @@ class CodeEditorTab(QWidget):
     def refresh_highlights(self):
         """Refresh syntax highlighting"""
         self.editor.highlighter.rehighlight()
+
+    def get_script_filename(self):
+        """Virtual path used as __file__ and in tracebacks when the code is not on disk"""
+        name = "".join(c for c in self.display_name if c.isalnum() or c in ('-', '_', '.')) or 'untitled'
+        if not name.endswith('.py'):
+            name += '.py'
+        return os.path.join(os.getcwd(), name)
+
+    def get_script_arguments(self):
+        """Command line arguments for the script, stored in the tab metadata"""
+        try:
+            return shlex.split(self.metadata.get('arguments', ''))
+        except ValueError:
+            return self.metadata.get('arguments', '').split()
+
+    def get_limits(self):
+        """Resource limits for the script's runs, stored in the tab metadata"""
+        return {k: v for k, v in self.metadata.get('limits', {}).items() if v}
+
+    def get_cache_inputs(self):
+        """Input files whose contents are part of the result cache key"""
+        try:
+            return shlex.split(self.metadata.get('cache_inputs', ''))
+        except ValueError:
+            return self.metadata.get('cache_inputs', '').split()
+
+    def show_report(self, report):
+        """Show an instrument report from a run in the results pane"""
+        if report.get('type') == 'profile':
+            self.results_pane.show_profile(report, self.get_script_filename())
+        elif report.get('type') == 'lines':
+            timings = {int(line): tuple(value) for line, value in report.get('lines', {}).items()}
+            self.editor.set_line_timings(timings)
+            self.results_pane.show_line_timings(report, self.editor.toPlainText().split('\n'))
+        elif report.get('type') == 'memory_sample':
+            self.memory_timeline.append([report['time'], report['current'], report['peak']])
+            self.results_pane.show_memory_timeline(self.memory_timeline)
+        elif report.get('type') == 'memory':
+            self.memory_timeline = []
+            self.results_pane.show_memory(report, self.get_script_filename())
+        elif report.get('type') == 'pipeline':
+            self.results_pane.show_pipeline(report)
+
+    def get_kernel(self):
+        """Return this tab's persistent kernel, starting it if needed"""
+        if self.kernel is None:
+            self.kernel = PersistentKernel(self)
+        self.kernel.start()
+        return self.kernel
+
+    def shutdown_kernel(self):
+        if self.kernel is not None:
+            self.kernel.shutdown()
+            self.kernel.deleteLater()
+            self.kernel = None
+
+    def stop_watching(self):
+        if self.watch_session is not None:
+            self.watch_session.shutdown()
+            self.watch_session.deleteLater()
+            self.watch_session = None
+
+    def get_run_block(self):
+        """
+        Return (code, first_line) for the selection, or for the top-level
+        statement under the cursor when nothing is selected.
+        """
+        cursor = self.editor.textCursor()
+        document = self.editor.document()
+
+        if cursor.hasSelection():
+            first = document.findBlock(cursor.selectionStart()).blockNumber()
+            last = document.findBlock(cursor.selectionEnd()).blockNumber()
+            # A selection ending at the start of a line does not include that line
+            if last > first and document.findBlock(cursor.selectionEnd()).position() == cursor.selectionEnd():
+                last -= 1
+        else:
+            first, last = self._statement_at(cursor.blockNumber())
+
+        lines = self.editor.toPlainText().split('\n')[first:last + 1]
+        return textwrap.dedent('\n'.join(lines)), first + 1
+
+    def _statement_at(self, line_index):
+        """Find the top-level statement spanning line_index (0-based, inclusive range)"""
+        text = self.editor.toPlainText()
+        lines = text.split('\n')
+        try:
+            tree = ast.parse(text)
+        except SyntaxError:
+            # Fall back to the paragraph around the cursor
+            first = last = line_index
+            while first > 0 and lines[first - 1].strip():
+                first -= 1
+            while last < len(lines) - 1 and lines[last + 1].strip():
+                last += 1
+            return first, last
+
+        for node in tree.body:
+            start = node.lineno - 1
+            if getattr(node, 'decorator_list', None):
+                start = node.decorator_list[0].lineno - 1
+            if start <= line_index <= node.end_lineno - 1:
+                return start, node.end_lineno - 1
+        return line_index, line_index
@@ -1,15 +1,51 @@
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import QSize, QPoint
+from PyQt5.QtCore import Qt, QSize, QRect
 from PyQt5.QtGui import QPainter, QColor
 
 class LineNumberArea(QWidget):
+    HEAT_BAR_WIDTH = 4
+
     def __init__(self, editor):
         super().__init__(editor)
         self.code_editor = editor
+        self.line_timings = {}
+        self.max_line_time = 0.0
+        self.setMouseTracking(True)
 
     def sizeHint(self):
         return QSize(self.code_editor.line_number_area_width(), 0)
 
+    def set_line_timings(self, timings):
+        """Show per-line timings: a dict of line number -> (hits, seconds)"""
+        self.line_timings = timings
+        self.max_line_time = max((seconds for _, seconds in timings.values()), default=0.0)
+        self.code_editor.update_line_number_area_width(0)
+        self.update()
+
+    def clear_line_timings(self):
+        if self.line_timings:
+            self.set_line_timings({})
+
+    def timing_width(self):
+        """Extra gutter width used by the heat bar and the per-line ms column"""
+        if not self.line_timings:
+            return 0
+        return self.HEAT_BAR_WIDTH + 6 + self.code_editor.fontMetrics().horizontalAdvance('9999.9ms')
+
+    def heat_color(self, seconds):
+        """Blend from a dim blue to a hot orange as a line's share of the hottest line grows"""
+        ratio = seconds / self.max_line_time if self.max_line_time else 0.0
+        cold, hot = QColor("#264F78"), QColor("#F48771")
+        return QColor(
+            int(cold.red() + (hot.red() - cold.red()) * ratio),
+            int(cold.green() + (hot.green() - cold.green()) * ratio),
+            int(cold.blue() + (hot.blue() - cold.blue()) * ratio)
+        )
+
+    def format_time(self, seconds):
+        ms = seconds * 1000
+        return f"{ms:.1f}ms" if ms < 1000 else f"{ms:.0f}ms"
+
     def paintEvent(self, event):
         self.line_number_area_paint_event(event)
 
@@ -22,16 +58,38 @@ class LineNumberArea(QWidget):
         offset = self.code_editor.contentOffset()
         top = int(self.code_editor.blockBoundingGeometry(block).translated(offset).top())  # Convert to int
         bottom = top + int(self.code_editor.blockBoundingRect(block).height())  # Convert to int
+        line_height = self.code_editor.fontMetrics().height()
+        timing_width = self.timing_width()
 
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible() and bottom >= event.rect().top():
+                timing = self.line_timings.get(block_number + 1)
+                if timing:
+                    hits, seconds = timing
+                    painter.fillRect(0, top, self.HEAT_BAR_WIDTH, bottom - top, self.heat_color(seconds))
+                    painter.setPen(QColor("#6A9955"))
+                    painter.drawText(QRect(self.HEAT_BAR_WIDTH, top, timing_width - self.HEAT_BAR_WIDTH - 2, line_height),
+                                     Qt.AlignRight, self.format_time(seconds))
+
                 number = str(block_number + 1)
                 painter.setPen(QColor("#858585"))
-
-                # Use QPoint for the position with integer coordinates
-                painter.drawText(QPoint(0, top), number)
+                painter.drawText(QRect(timing_width, top, self.width() - timing_width - 3, line_height),
+                                 Qt.AlignRight, number)
 
             block = block.next()
             top = bottom
             bottom = top + int(self.code_editor.blockBoundingRect(block).height())  # Convert to int
             block_number += 1
+
+    def timing_tooltip(self, line):
+        timing = self.line_timings.get(line)
+        if not timing:
+            return ''
+        hits, seconds = timing
+        return f"Line {line}: {hits} hits, {self.format_time(seconds)}"
+
+    def mouseMoveEvent(self, event):
+        if self.line_timings:
+            cursor = self.code_editor.cursorForPosition(event.pos())
+            self.setToolTip(self.timing_tooltip(cursor.blockNumber() + 1))
+        super().mouseMoveEvent(event)
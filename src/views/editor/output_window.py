@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import QTextEdit
-from PyQt5.QtGui import QFont
+from PyQt5.QtGui import QFont, QTextCursor, QTextCharFormat, QColor
 
 class OutputWindow(QTextEdit):
     def __init__(self):
@@ -18,3 +18,34 @@ class OutputWindow(QTextEdit):
             }
         """)
         self.setMinimumHeight(100)
+
+        self.stdout_format = QTextCharFormat()
+        self.stdout_format.setForeground(QColor("#9CDCFE"))
+        self.stderr_format = QTextCharFormat()
+        self.stderr_format.setForeground(QColor("#F48771"))
+        self.info_format = QTextCharFormat()
+        self.info_format.setForeground(QColor("#858585"))
+
+    def append_stream(self, text, text_format=None):
+        """Insert streamed text at the end without adding paragraph breaks"""
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+
+        cursor = self.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text, text_format or self.stdout_format)
+
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def append_stdout(self, text):
+        self.append_stream(text, self.stdout_format)
+
+    def append_stderr(self, text):
+        self.append_stream(text, self.stderr_format)
+
+    def append_info(self, text):
+        """Append a status line such as the exit code summary"""
+        if self.toPlainText() and not self.toPlainText().endswith('\n'):
+            self.append_stream('\n', self.info_format)
+        self.append_stream(text + '\n', self.info_format)
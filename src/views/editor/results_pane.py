@@ -0,0 +1,318 @@
+import os
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView,
+                             QAbstractItemView)
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QColor
+from services.run_metrics import format_bytes
+from services.matrix import ROW_PASSED, ROW_FAILED, ROW_RUNNING, ROW_CANCELLED
+from services.pipeline import NODE_FINISHED, NODE_FAILED, NODE_RUNNING, NODE_CANCELLED
+
+SORT_ROLE = Qt.UserRole + 1
+SPARK_CHARS = '▁▂▃▄▅▆▇█'
+
+def sparkline(values, width=60):
+    """Render values as a row of block characters, resampled to at most width"""
+    if not values:
+        return ''
+    if len(values) > width:
+        step = len(values) / width
+        values = [max(values[int(i * step):int((i + 1) * step)] or [0]) for i in range(width)]
+    top = max(values) or 1
+    return ''.join(SPARK_CHARS[min(len(SPARK_CHARS) - 1, int(v / top * len(SPARK_CHARS)))] for v in values)
+
+class SortableItem(QTableWidgetItem):
+    """Table item that sorts by a numeric key instead of its display text"""
+
+    def __init__(self, text, sort_key=None):
+        super().__init__(text)
+        self.setData(SORT_ROLE, sort_key if sort_key is not None else text)
+
+    def __lt__(self, other):
+        mine, theirs = self.data(SORT_ROLE), other.data(SORT_ROLE)
+        try:
+            return mine < theirs
+        except TypeError:
+            return str(mine) < str(theirs)
+
+class ResultsPane(QWidget):
+    """Sortable table of run results; rows linked to a script line can be clicked"""
+    line_activated = pyqtSignal(int)
+
+    def __init__(self):
+        super().__init__()
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        header = QHBoxLayout()
+        header.setContentsMargins(6, 2, 2, 2)
+        self.title_label = QLabel()
+        self.title_label.setStyleSheet("color: #D4D4D4;")
+        header.addWidget(self.title_label)
+        header.addStretch()
+        close_button = QPushButton("Close")
+        close_button.setFlat(True)
+        close_button.clicked.connect(self.hide)
+        header.addWidget(close_button)
+        layout.addLayout(header)
+
+        self.detail_label = QLabel()
+        self.detail_label.setStyleSheet("color: #9CDCFE; font-family: monospace; padding: 0 6px;")
+        self.detail_label.hide()
+        layout.addWidget(self.detail_label)
+
+        self.table = QTableWidget()
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setStyleSheet("""
+            QTableWidget {
+                background-color: #1E1E1E;
+                color: #D4D4D4;
+                gridline-color: #333333;
+                border: none;
+            }
+        """)
+        self.table.cellClicked.connect(self.handle_click)
+        layout.addWidget(self.table)
+
+        self.setStyleSheet("background-color: #252526;")
+
+    def show_table(self, title, headers, rows, detail=None):
+        """
+        Fill the table. rows is a list of (cells, line) where each cell is a
+        string or a (text, sort_key) tuple and line is a script line or None.
+        detail is an optional line shown between the title and the table.
+        """
+        self.title_label.setText(title)
+        self.show_detail(detail)
+        self.table.setSortingEnabled(False)
+        self.table.clear()
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setRowCount(len(rows))
+
+        for row, (cells, line) in enumerate(rows):
+            for column, cell in enumerate(cells):
+                text, sort_key = cell if isinstance(cell, tuple) else (cell, None)
+                item = SortableItem(text, sort_key)
+                item.setData(Qt.UserRole, line)
+                if line is None:
+                    item.setForeground(Qt.gray)
+                self.table.setItem(row, column, item)
+
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.show()
+
+    def show_detail(self, text):
+        self.detail_label.setText(text or '')
+        self.detail_label.setVisible(bool(text))
+
+    def handle_click(self, row, column):
+        item = self.table.item(row, column)
+        line = item.data(Qt.UserRole) if item else None
+        if line:
+            self.line_activated.emit(line)
+
+    def show_profile(self, report, script_filename):
+        """Render a 'profile' report: hottest functions by cumulative time"""
+        total = report.get('total_time') or 0
+        rows = []
+        for function in report.get('functions', []):
+            in_script = function['file'] == script_filename
+            location = os.path.basename(function['file']) if function['file'] != '~' else 'built-in'
+            calls = function['calls']
+            if function['primitive_calls'] != calls:
+                calls_text = f"{calls}/{function['primitive_calls']}"
+            else:
+                calls_text = str(calls)
+            self_share = function['self_time'] / total * 100 if total else 0
+            rows.append(([
+                function['name'],
+                (f"{location}:{function['line']}", (location, function['line'])),
+                (calls_text, calls),
+                (f"{function['self_time'] * 1000:.2f}", function['self_time']),
+                (f"{function['cumulative_time'] * 1000:.2f}", function['cumulative_time']),
+                (f"{self_share:.1f}%", self_share)
+            ], function['line'] if in_script else None))
+
+        self.show_table(
+            f"Profile: {len(rows)} functions, {total * 1000:.1f} ms total (click a row to jump to the line)",
+            ['Function', 'Location', 'Calls', 'Self (ms)', 'Cumulative (ms)', 'Self %'],
+            rows
+        )
+        self.table.sortItems(4, Qt.DescendingOrder)
+
+    def show_line_timings(self, report, lines_text):
+        """Render a 'lines' report: the hottest lines of the script"""
+        total = report.get('total_time') or 0
+        rows = []
+        for line, (hits, seconds) in report.get('lines', {}).items():
+            line = int(line)
+            source = lines_text[line - 1].strip() if 0 < line <= len(lines_text) else ''
+            share = seconds / total * 100 if total else 0
+            rows.append(([
+                source,
+                (str(line), line),
+                (str(hits), hits),
+                (f"{seconds * 1000:.2f}", seconds),
+                (f"{share:.1f}%", share)
+            ], line))
+
+        self.show_table(
+            f"Line timings: {len(rows)} lines, {total * 1000:.1f} ms total (click a row to jump to the line)",
+            ['Source', 'Line', 'Hits', 'Time (ms)', 'Share'],
+            rows
+        )
+        self.table.sortItems(3, Qt.DescendingOrder)
+
+    def show_memory_timeline(self, timeline):
+        """Show the traced memory timeline as [time, current, peak] samples arrive"""
+        if not timeline:
+            return
+        time_offset, current, peak = timeline[-1]
+        self.show_detail(f"{sparkline([sample[1] for sample in timeline])}  "
+                         f"{format_bytes(current)} now, peak {format_bytes(peak)} at {time_offset:.1f}s")
+        self.show()
+
+    def show_memory(self, report, script_filename):
+        """Render a 'memory' report: top allocation sites still alive at exit"""
+        total = report.get('total_size') or 0
+        rows = []
+        for site in report.get('sites', []):
+            in_script = site['file'] == script_filename
+            location = os.path.basename(site['file'])
+            share = site['size'] / total * 100 if total else 0
+            average = site['size'] / site['count'] if site['count'] else 0
+            rows.append(([
+                (f"{location}:{site['line']}", (location, site['line'])),
+                (format_bytes(site['size']), site['size']),
+                (str(site['count']), site['count']),
+                (format_bytes(int(average)), average),
+                (f"{share:.1f}%", share)
+            ], site['line'] if in_script else None))
+
+        timeline = report.get('timeline', [])
+        peak_at = max(timeline, key=lambda sample: sample[2])[0] if timeline else 0
+        detail = (f"{sparkline([sample[1] for sample in timeline])}  "
+                  f"peak {format_bytes(report.get('peak', 0))} at {peak_at:.1f}s") if len(timeline) > 1 else None
+        self.show_table(
+            f"Memory: {format_bytes(total)} in {len(rows)} sites at exit, "
+            f"peak {format_bytes(report.get('peak', 0))} (click a row to jump to the line)",
+            ['Location', 'Size', 'Blocks', 'Average', 'Share'],
+            rows,
+            detail
+        )
+        self.table.sortItems(1, Qt.DescendingOrder)
+
+    def show_benchmark(self, variants, runs, warmup, mode):
+        """Render benchmark statistics, one row per benchmarked variant"""
+        def ms(value):
+            return (f"{value * 1000:.1f}", value)
+
+        rows = []
+        for variant in variants:
+            wall, cpu = variant.wall, variant.cpu
+            cells = [variant.label, (str(len(variant.wall_times)), len(variant.wall_times))]
+            for stats in (wall, cpu):
+                if stats:
+                    cells += [ms(stats['min']), ms(stats['median']), ms(stats['p95']), ms(stats['stdev'])]
+                else:
+                    cells += ['', '', '', '']
+            cells.append((str(variant.failures), variant.failures))
+            rows.append((cells, None))
+
+        detail = None
+        current, *others = variants
+        if others and current.wall and others[0].wall:
+            ratio = others[0].wall['median'] / current.wall['median'] if current.wall['median'] else 0
+            verdict = f"{ratio:.2f}x faster" if ratio >= 1 else f"{1 / ratio:.2f}x slower" if ratio else "n/a"
+            detail = (f"{current.label} is {verdict} than {others[0].label} "
+                      f"(median wall {current.wall['median'] * 1000:.1f} ms vs "
+                      f"{others[0].wall['median'] * 1000:.1f} ms)")
+
+        self.show_table(
+            f"Benchmark: {runs} runs after {warmup} warmup, {mode} mode (times in ms)",
+            ['Variant', 'Runs', 'Wall min', 'Wall median', 'Wall p95', 'Wall stdev',
+             'CPU min', 'CPU median', 'CPU p95', 'CPU stdev', 'Failures'],
+            rows,
+            detail
+        )
+
+    STATUS_COLORS = {ROW_PASSED: '#6A9955', ROW_FAILED: '#F44747', ROW_RUNNING: '#DCDCAA', ROW_CANCELLED: '#808080'}
+
+    def show_matrix(self, matrix):
+        """Render one row per parameter set of a MatrixRun; update_matrix_row keeps it current"""
+        columns = list(dict.fromkeys(key for row in matrix.rows for key in row.params))
+        self.matrix_columns = columns
+        self.matrix_items = {}
+        rows = [(self._matrix_cells(row, columns), None) for row in matrix.rows]
+        self.show_table(self._matrix_title(matrix),
+                        ['#'] + columns + ['Status', 'Exit', 'Duration (s)', 'Output'], rows)
+        for position in range(self.table.rowCount()):
+            item = self.table.item(position, 0)
+            self.matrix_items[item.data(SORT_ROLE)] = item
+        for row in matrix.rows:
+            self.update_matrix_row(matrix, row)
+
+    def _matrix_title(self, matrix):
+        counts = matrix.counts()
+        summary = ', '.join(f"{count} {status.lower()}" for status, count in counts.items())
+        return f"Matrix run: {len(matrix.rows)} rows ({summary})"
+
+    def _matrix_cells(self, row, columns):
+        last_line = row.output.rstrip('\n').rsplit('\n', 1)[-1]
+        return ([(str(row.index), row.index)]
+                + [row.params.get(column, '') for column in columns]
+                + [row.status,
+                   ('' if row.exit_code is None else str(row.exit_code), row.exit_code if row.exit_code is not None else -1e9),
+                   (f"{row.duration:.2f}" if row.exit_code is not None else '', row.duration),
+                   last_line])
+
+    def update_matrix_row(self, matrix, row):
+        item = getattr(self, 'matrix_items', {}).get(row.index)
+        if item is None:
+            return
+        self.title_label.setText(self._matrix_title(matrix))
+        sorting = self.table.isSortingEnabled()
+        self.table.setSortingEnabled(False)
+        position = self.table.row(item)
+        color = QColor(self.STATUS_COLORS.get(row.status, '#D4D4D4'))
+        for column, cell in enumerate(self._matrix_cells(row, self.matrix_columns)):
+            text, sort_key = cell if isinstance(cell, tuple) else (cell, None)
+            cell_item = self.table.item(position, column)
+            cell_item.setText(text)
+            cell_item.setData(SORT_ROLE, sort_key if sort_key is not None else text)
+            cell_item.setToolTip(row.output if column == self.table.columnCount() - 1 else '')
+            cell_item.setForeground(color)
+        self.table.setSortingEnabled(sorting)
+
+    NODE_COLORS = {NODE_FINISHED: '#6A9955', NODE_FAILED: '#F44747', NODE_RUNNING: '#DCDCAA', NODE_CANCELLED: '#808080'}
+
+    def show_pipeline(self, report):
+        """Render a 'pipeline' report: status and resource usage of every node"""
+        rows = []
+        for node in report.get('nodes', []):
+            usage = node.get('usage') or {}
+            done = node.get('exit_code') is not None
+            cpu = usage.get('user_cpu', 0) + usage.get('system_cpu', 0)
+            rows.append(([
+                node['node'], node.get('script') or '', node['status'],
+                ('' if not done else str(node['exit_code']), node['exit_code'] if done else -1e9),
+                (f"{node['duration']:.2f}" if done else '', node['duration']),
+                (f"{cpu:.2f}" if usage else '', cpu),
+                (format_bytes(usage['max_rss']) if usage else '', usage.get('max_rss', 0))
+            ], None))
+        self.show_table(f"Pipeline: {report.get('name', '')}",
+                        ['Node', 'Script', 'Status', 'Exit', 'Duration (s)', 'CPU (s)', 'Peak RSS'], rows)
+        self.table.setSortingEnabled(False)
+        for position in range(self.table.rowCount()):
+            color = QColor(self.NODE_COLORS.get(self.table.item(position, 2).text(), '#D4D4D4'))
+            for column in range(self.table.columnCount()):
+                self.table.item(position, column).setForeground(color)
+        self.table.setSortingEnabled(True)
@@ -32,6 +32,8 @@ class WindowComponents:
 
         self.window.run_button = QPushButton('Run (F5)')
         self.window.run_sudo_button = QPushButton('Run with Sudo (F6)')
+        self.window.run_profiler_button = QPushButton('Run with Profiler (F7)')
+        self.window.stop_button = QPushButton('Stop (Shift+F5)')
 
         self.window.run_button.setStyleSheet(button_style)
         self.window.run_sudo_button.setStyleSheet(
@@ -39,12 +41,26 @@ class WindowComponents:
             .replace('#3275E4', '#E4A400')
             .replace('#2265D4', '#D49300')
         )
+        self.window.run_profiler_button.setStyleSheet(
+            button_style.replace('#4285F4', '#0F9D58')
+            .replace('#3275E4', '#008D48')
+            .replace('#2265D4', '#007D38')
+        )
+        self.window.stop_button.setStyleSheet(
+            button_style.replace('#4285F4', '#DB4437')
+            .replace('#3275E4', '#CB3427')
+            .replace('#2265D4', '#BB2417')
+        )
 
         self.window.run_button.clicked.connect(self.window.tab_manager.run_code)
         self.window.run_sudo_button.clicked.connect(self.window.tab_manager.run_code_with_sudo)
+        self.window.run_profiler_button.clicked.connect(self.window.tab_manager.run_with_profiler)
+        self.window.stop_button.clicked.connect(self.window.tab_manager.stop_code)
 
         run_layout.addWidget(self.window.run_button)
         run_layout.addWidget(self.window.run_sudo_button)
+        run_layout.addWidget(self.window.run_profiler_button)
+        run_layout.addWidget(self.window.stop_button)
 
         self.window.main_layout.addWidget(run_container)
 
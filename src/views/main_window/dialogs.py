@@ -1,5 +1,6 @@
-from PyQt5.QtWidgets import (QDialog, QFormLayout, QLineEdit,
-                             QDialogButtonBox, QInputDialog, QMessageBox)
+from PyQt5.QtWidgets import (QDialog, QFormLayout, QLineEdit, QSpinBox, QComboBox,
+                             QDialogButtonBox, QInputDialog, QMessageBox, QHBoxLayout,
+                             QPushButton, QFileDialog, QLabel)
 from PyQt5.QtCore import Qt
 import datetime
 
@@ -25,3 +26,158 @@ class TabNameDialog(QDialog):
 
     def get_name(self):
         return self.name_input.text()
+
+class WorkerPoolDialog(QDialog):
+    def __init__(self, size, max_runs, preload_mb=512, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Worker Pool Settings")
+        self.setup_ui(size, max_runs, preload_mb)
+
+    def setup_ui(self, size, max_runs, preload_mb):
+        layout = QFormLayout(self)
+
+        self.size_input = QSpinBox(self)
+        self.size_input.setRange(1, 32)
+        self.size_input.setValue(size)
+        layout.addRow("Warm workers:", self.size_input)
+
+        self.max_runs_input = QSpinBox(self)
+        self.max_runs_input.setRange(1, 10000)
+        self.max_runs_input.setValue(max_runs)
+        layout.addRow("Recycle after runs:", self.max_runs_input)
+
+        self.preload_input = QSpinBox(self)
+        self.preload_input.setRange(0, 65536)
+        self.preload_input.setSuffix(" MB")
+        self.preload_input.setSpecialValueText("Off")
+        self.preload_input.setValue(preload_mb)
+        self.preload_input.setToolTip("Memory each worker may spend importing the current tab's modules ahead of a run")
+        layout.addRow("Import preloading:", self.preload_input)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel,
+            Qt.Horizontal, self)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def get_values(self):
+        return self.size_input.value(), self.max_runs_input.value(), self.preload_input.value()
+
+class ResourceLimitsDialog(QDialog):
+    """Per-script resource limits; 0 means no limit"""
+
+    def __init__(self, limits, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Resource Limits")
+        self.setup_ui(limits)
+
+    def setup_ui(self, limits):
+        layout = QFormLayout(self)
+        self.inputs = {}
+        for field, label, suffix, maximum in [('memory_mb', "Memory:", " MB", 1048576),
+                                              ('cpu_seconds', "CPU time:", " s", 86400),
+                                              ('wall_seconds', "Wall-clock time:", " s", 86400),
+                                              ('output_mb', "Output:", " MB", 65536)]:
+            spin_box = QSpinBox(self)
+            spin_box.setRange(0, maximum)
+            spin_box.setSuffix(suffix)
+            spin_box.setSpecialValueText("No limit")
+            spin_box.setValue(int(limits.get(field) or 0))
+            layout.addRow(label, spin_box)
+            self.inputs[field] = spin_box
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel,
+            Qt.Horizontal, self)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def get_limits(self):
+        return {field: spin_box.value() for field, spin_box in self.inputs.items() if spin_box.value()}
+
+class BenchmarkDialog(QDialog):
+    def __init__(self, runs, warmup, versions=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Benchmark")
+        self.setup_ui(runs, warmup, versions or [])
+
+    def setup_ui(self, runs, warmup, versions):
+        layout = QFormLayout(self)
+
+        self.runs_input = QSpinBox(self)
+        self.runs_input.setRange(1, 1000)
+        self.runs_input.setValue(runs)
+        layout.addRow("Measured runs:", self.runs_input)
+
+        self.warmup_input = QSpinBox(self)
+        self.warmup_input.setRange(0, 100)
+        self.warmup_input.setValue(warmup)
+        layout.addRow("Warmup runs:", self.warmup_input)
+
+        self.version_combo = QComboBox(self)
+        self.version_combo.addItem("Nothing (current buffer only)", None)
+        for version in reversed(versions):
+            self.version_combo.addItem(
+                f"Version {version['version_number']} - {version['timestamp']}", version)
+        self.version_combo.setEnabled(bool(versions))
+        layout.addRow("Compare with:", self.version_combo)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel,
+            Qt.Horizontal, self)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def get_values(self):
+        """Return (runs, warmup, version) where version is a saved version header or None"""
+        return self.runs_input.value(), self.warmup_input.value(), self.version_combo.currentData()
+
+class MatrixRunDialog(QDialog):
+    def __init__(self, path='', template='', max_parallel=4, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Matrix Run")
+        self.setup_ui(path, template, max_parallel)
+
+    def setup_ui(self, path, template, max_parallel):
+        layout = QFormLayout(self)
+
+        file_layout = QHBoxLayout()
+        self.path_input = QLineEdit(path, self)
+        self.path_input.setMinimumWidth(300)
+        file_layout.addWidget(self.path_input)
+        browse_button = QPushButton("Browse...", self)
+        browse_button.clicked.connect(self.browse)
+        file_layout.addWidget(browse_button)
+        layout.addRow("Parameters (CSV/JSON):", file_layout)
+
+        self.template_input = QLineEdit(template, self)
+        self.template_input.setPlaceholderText("e.g. --shot {shot} --date {date}  (empty: every column as --name value)")
+        layout.addRow("Arguments:", self.template_input)
+
+        hint = QLabel("Columns named $NAME are exported as environment variables.", self)
+        hint.setStyleSheet("color: #888;")
+        layout.addRow("", hint)
+
+        self.parallel_input = QSpinBox(self)
+        self.parallel_input.setRange(1, 256)
+        self.parallel_input.setValue(max_parallel)
+        layout.addRow("Parallel runs:", self.parallel_input)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel,
+            Qt.Horizontal, self)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def browse(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Parameter Rows", self.path_input.text(), "Parameter files (*.csv *.json);;All files (*)")
+        if path:
+            self.path_input.setText(path)
+
+    def get_values(self):
+        return self.path_input.text().strip(), self.template_input.text().strip(), self.parallel_input.value()
@@ -0,0 +1,95 @@
+from PyQt5.QtWidgets import (QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
+                             QTableWidget, QTableWidgetItem, QPlainTextEdit, QPushButton,
+                             QCheckBox, QLabel, QHeaderView, QAbstractItemView)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+from services.run_metrics import format_bytes
+
+class RunHistoryPanel(QDockWidget):
+    """Dock widget listing past runs of the current tab's script"""
+    COLUMNS = ['Time', 'Version', 'Hash', 'Mode', 'Exit', 'Wall', 'CPU', 'Peak RSS', 'Regression']
+
+    def __init__(self, history, parent=None):
+        super().__init__("Run History", parent)
+        self.setObjectName("RunHistoryPanel")
+        self.history = history
+        self.script = None
+        self.filepath = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        container = QWidget()
+        layout = QVBoxLayout(container)
+
+        filter_layout = QHBoxLayout()
+        self.script_label = QLabel()
+        filter_layout.addWidget(self.script_label)
+        filter_layout.addStretch()
+        self.failed_only = QCheckBox("Failed only")
+        self.failed_only.toggled.connect(self.refresh)
+        filter_layout.addWidget(self.failed_only)
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh)
+        filter_layout.addWidget(refresh_button)
+        layout.addLayout(filter_layout)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(len(self.COLUMNS) - 1, QHeaderView.Stretch)
+        self.table.currentCellChanged.connect(self.show_output)
+        splitter.addWidget(self.table)
+
+        self.output_view = QPlainTextEdit()
+        self.output_view.setReadOnly(True)
+        self.output_view.setPlaceholderText("Select a run to see its output")
+        splitter.addWidget(self.output_view)
+        splitter.setSizes([300, 150])
+        layout.addWidget(splitter)
+
+        self.setWidget(container)
+
+    def show_script(self, script, filepath=None):
+        """Show the history of a script, identified by its path when it was saved"""
+        self.script = script
+        self.filepath = filepath
+        self.script_label.setText(script or '')
+        self.refresh()
+
+    def refresh(self, *_):
+        if not self.isVisible() or not (self.script or self.filepath):
+            return
+        runs = self.history.runs(self.script, self.filepath, failed_only=self.failed_only.isChecked())
+        self.table.setRowCount(len(runs))
+        for row, run in enumerate(runs):
+            metrics = run['metrics']
+            values = [
+                run['timestamp'][:19].replace('T', ' '),
+                '' if run['version'] is None else str(run['version']),
+                (run['content_hash'] or '')[:8],
+                ' '.join(filter(None, (run['mode'], run['instrument']))),
+                '' if run['exit_code'] is None else str(run['exit_code']),
+                f"{metrics.wall_time:.2f}s",
+                f"{metrics.cpu_time:.2f}s" if metrics.available else '',
+                format_bytes(metrics.max_rss) if metrics.available else '',
+                run['regression'] or ''
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setData(Qt.UserRole, run)
+                if run['regression']:
+                    item.setForeground(QColor('#F44747'))
+                self.table.setItem(row, column, item)
+        self.output_view.clear()
+
+    def show_output(self, row, *_):
+        item = self.table.item(row, 0)
+        run = item.data(Qt.UserRole) if item else None
+        self.output_view.setPlainText(run['output'] or '' if run else '')
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
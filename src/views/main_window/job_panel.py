@@ -0,0 +1,98 @@
+from PyQt5.QtWidgets import (QDockWidget, QWidget, QVBoxLayout, QHBoxLayout,
+                             QTableWidget, QTableWidgetItem, QPushButton,
+                             QLabel, QSpinBox, QHeaderView, QAbstractItemView)
+from PyQt5.QtCore import Qt
+from services.scheduler import JOB_RUNNING, JOB_QUEUED
+
+class JobQueuePanel(QDockWidget):
+    """Dock widget listing scheduled jobs with their status"""
+    COLUMNS = ['#', 'Name', 'Priority', 'Status', 'Exit Code', 'Duration']
+
+    def __init__(self, scheduler, parent=None):
+        super().__init__("Job Queue", parent)
+        self.setObjectName("JobQueuePanel")
+        self.scheduler = scheduler
+        self.setup_ui()
+
+        self.scheduler.job_added.connect(self.refresh)
+        self.scheduler.job_updated.connect(self.refresh)
+
+    def setup_ui(self):
+        container = QWidget()
+        layout = QVBoxLayout(container)
+
+        parallel_layout = QHBoxLayout()
+        parallel_layout.addWidget(QLabel("Max parallel jobs:"))
+        self.parallel_input = QSpinBox()
+        self.parallel_input.setRange(1, 256)
+        self.parallel_input.setValue(self.scheduler.max_parallel)
+        self.parallel_input.valueChanged.connect(self.scheduler.set_max_parallel)
+        parallel_layout.addWidget(self.parallel_input)
+        parallel_layout.addStretch()
+        layout.addLayout(parallel_layout)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        buttons = [
+            ('Cancel', self.cancel_selected),
+            ('Priority +', lambda: self.change_priority(1)),
+            ('Priority -', lambda: self.change_priority(-1)),
+            ('Clear Finished', self.clear_finished)
+        ]
+        for label, handler in buttons:
+            button = QPushButton(label)
+            button.clicked.connect(handler)
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+
+        self.setWidget(container)
+
+    def refresh(self, *_):
+        """Rebuild the table: running jobs first, then the queue in start order, then history"""
+        running = [j for j in self.scheduler.jobs if j.status == JOB_RUNNING]
+        queued = self.scheduler.queued_jobs()
+        done = [j for j in reversed(self.scheduler.jobs) if not j.is_running()]
+        jobs = running + queued + done
+
+        selected = self.selected_job()
+        self.table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            values = [
+                str(job.job_id),
+                job.name,
+                str(job.priority),
+                job.status,
+                '' if job.exit_code is None else str(job.exit_code),
+                f"{job.duration:.2f}s" if not job.is_running() and job.run else ''
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setData(Qt.UserRole, job)
+                self.table.setItem(row, column, item)
+            if job is selected:
+                self.table.selectRow(row)
+
+    def selected_job(self):
+        item = self.table.item(self.table.currentRow(), 0)
+        return item.data(Qt.UserRole) if item else None
+
+    def cancel_selected(self):
+        job = self.selected_job()
+        if job:
+            job.cancel()
+
+    def change_priority(self, delta):
+        job = self.selected_job()
+        if job and job.status == JOB_QUEUED:
+            self.scheduler.set_priority(job, job.priority + delta)
+
+    def clear_finished(self):
+        self.scheduler.clear_finished()
+        self.refresh()
@@ -1,9 +1,11 @@
-from PyQt5.QtWidgets import QAction
+from PyQt5.QtWidgets import QAction, QActionGroup
 from PyQt5.QtGui import QKeySequence
 import os
 import platform
 import subprocess
+from services.executor import EXECUTION_MODES
 from .pip_dialogs import RequirementsEditor, PipExecutorDialog
+from .dialogs import WorkerPoolDialog
 
 class MenuManager:
     def __init__(self, window):
@@ -48,14 +50,110 @@ class MenuManager:
         rename_action.triggered.connect(self.window.tab_manager.rename_current_tab)
         menu.addAction(rename_action)
 
+        menu.addSeparator()
+        search_action = QAction('&Search Scripts...', self.window)
+        search_action.setShortcut('Ctrl+Shift+F')
+        search_action.triggered.connect(self.window.search_panel.focus_query)
+        menu.addAction(search_action)
+
     def create_run_menu(self, menu):
         actions = [
             ('&Run', 'F5', self.window.tab_manager.run_code),
-            ('Run with &Sudo', 'F6', self.window.tab_manager.run_code_with_sudo)
+            ('Run with &Sudo', 'F6', self.window.tab_manager.run_code_with_sudo),
+            ('End Sudo Sessi&on', None, self.window.tab_manager.end_sudo_session),
+            ('Run with &Profiler', 'F7', self.window.tab_manager.run_with_profiler),
+            ('Run with &Line Timings', 'Ctrl+F7', self.window.tab_manager.run_with_line_profiler),
+            ('Run with &Memory Profiler', 'Shift+F7', self.window.tab_manager.run_with_memory_profiler),
+            ('&Benchmark...', 'Ctrl+B', self.window.tab_manager.run_benchmark),
+            ('Matri&x Run...', 'Ctrl+Shift+M', self.window.tab_manager.run_matrix),
+            ('Pipe&lines...', 'Ctrl+Shift+L', self.window.tab_manager.run_pipeline),
+            (None, None, None),
+            ('S&top', 'Shift+F5', self.window.tab_manager.stop_code),
+            ('&Kill', 'Ctrl+Shift+F5', self.window.tab_manager.kill_code),
+            (None, None, None),
+            ('Run &All Tabs', 'Ctrl+F5', self.window.tab_manager.run_all_tabs),
+            ('Script A&rguments...', None, self.window.tab_manager.set_script_arguments),
+            ('Resource L&imits...', None, self.window.tab_manager.set_resource_limits)
         ]
 
         self.add_actions(menu, actions)
 
+        queue_action = self.window.job_panel.toggleViewAction()
+        queue_action.setText('Job &Queue')
+        queue_action.setShortcut('Ctrl+J')
+        menu.addAction(queue_action)
+
+        history_action = self.window.history_panel.toggleViewAction()
+        history_action.setText('Run &History')
+        history_action.setShortcut('Ctrl+H')
+        menu.addAction(history_action)
+
+        menu.addSeparator()
+        self.cache_action = QAction('&Cache Results', self.window)
+        self.cache_action.setCheckable(True)
+        self.cache_action.triggered.connect(self.window.tab_manager.toggle_result_cache)
+        menu.addAction(self.cache_action)
+
+        cache_actions = [
+            ('Cached In&puts...', None, self.window.tab_manager.set_cache_inputs),
+            ('Clear Result Cache', None, self.window.tab_manager.clear_result_cache)
+        ]
+        self.add_actions(menu, cache_actions)
+
+        self.watch_action = QAction('&Watch && Re-run', self.window)
+        self.watch_action.setCheckable(True)
+        self.watch_action.setShortcut('Ctrl+Shift+W')
+        self.watch_action.triggered.connect(self.window.tab_manager.toggle_watch_mode)
+        menu.addAction(self.watch_action)
+
+        menu.addSeparator()
+        self.kernel_action = QAction('Use Persistent &Kernel', self.window)
+        self.kernel_action.setCheckable(True)
+        self.kernel_action.triggered.connect(self.window.tab_manager.toggle_kernel_mode)
+        menu.addAction(self.kernel_action)
+
+        kernel_actions = [
+            ('Run Selection in Kernel', 'Ctrl+Return', self.window.tab_manager.run_in_kernel),
+            ('&Interrupt Kernel', 'Ctrl+Shift+I', self.window.tab_manager.interrupt_kernel),
+            ('Restart K&ernel', 'Ctrl+Shift+K', self.window.tab_manager.restart_kernel)
+        ]
+        self.add_actions(menu, kernel_actions)
+
+        menu.addSeparator()
+        self.create_execution_mode_menu(menu.addMenu('Execution &Mode'))
+
+    def create_execution_mode_menu(self, menu):
+        executor = self.window.script_executor
+        group = QActionGroup(self.window)
+        for mode, label in EXECUTION_MODES.items():
+            action = QAction(label, self.window)
+            action.setCheckable(True)
+            action.setChecked(mode == executor.default_mode)
+            action.triggered.connect(lambda checked, m=mode: executor.set_default_mode(m))
+            group.addAction(action)
+            menu.addAction(action)
+
+        menu.addSeparator()
+        pool_action = QAction('Worker Pool Settings...', self.window)
+        pool_action.triggered.connect(self.show_worker_pool_settings)
+        menu.addAction(pool_action)
+
+    def show_worker_pool_settings(self):
+        executor = self.window.script_executor
+        pool = executor.get_worker_pool()
+        dialog = WorkerPoolDialog(pool.size, pool.max_runs, pool.preload_budget // (1024 * 1024), self.window)
+        if dialog.exec_():
+            executor.configure_worker_pool(*dialog.get_values())
+
+    def update_tab_actions(self, tab):
+        """Sync per-tab checkable actions with the selected tab"""
+        if hasattr(self, 'kernel_action'):
+            self.kernel_action.setChecked(tab.kernel_enabled)
+        if hasattr(self, 'watch_action'):
+            self.watch_action.setChecked(tab.watch_session is not None)
+        if hasattr(self, 'cache_action'):
+            self.cache_action.setChecked(bool(tab.metadata.get('cache_results')))
+
     def create_pip_menu(self, menu):
         # Requirements editor action
         req_action = QAction('Edit Requirements...', self.window)
@@ -0,0 +1,218 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit,
+                             QListWidget, QListWidgetItem, QPushButton, QTableWidget,
+                             QTableWidgetItem, QComboBox, QSpinBox, QLabel, QHeaderView,
+                             QDialogButtonBox, QMessageBox, QAbstractItemView)
+from PyQt5.QtCore import Qt
+from services.pipeline import Pipeline, PipelineError
+import shlex
+
+class PipelineEditDialog(QDialog):
+    """Edit the nodes and edges of one pipeline"""
+
+    def __init__(self, definition, script_names, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Edit Pipeline")
+        self.script_names = script_names
+        self.setup_ui(Pipeline.from_dict(definition))
+
+    def setup_ui(self, pipeline):
+        layout = QVBoxLayout(self)
+
+        form = QFormLayout()
+        self.name_input = QLineEdit(pipeline.name, self)
+        form.addRow("Name:", self.name_input)
+        self.description_input = QLineEdit(pipeline.description, self)
+        form.addRow("Description:", self.description_input)
+        layout.addLayout(form)
+
+        layout.addWidget(QLabel("Nodes (version 0 runs the current version):", self))
+        self.nodes_table = QTableWidget(0, 4, self)
+        self.nodes_table.setHorizontalHeaderLabels(['Id', 'Script', 'Version', 'Arguments'])
+        self.nodes_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.nodes_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.nodes_table.verticalHeader().setVisible(False)
+        layout.addWidget(self.nodes_table)
+        layout.addLayout(self.row_buttons(self.add_node, self.nodes_table))
+
+        layout.addWidget(QLabel("Edges (stdout of From is piped into stdin of To):", self))
+        self.edges_table = QTableWidget(0, 2, self)
+        self.edges_table.setHorizontalHeaderLabels(['From', 'To'])
+        self.edges_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.edges_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.edges_table.verticalHeader().setVisible(False)
+        layout.addWidget(self.edges_table)
+        layout.addLayout(self.row_buttons(self.add_edge, self.edges_table))
+
+        for node in pipeline.nodes:
+            self.add_node(node)
+        for source, target in pipeline.edges:
+            self.add_edge([source, target])
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel,
+            Qt.Horizontal, self)
+        buttons.accepted.connect(self.validate_and_accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.resize(700, 500)
+
+    def row_buttons(self, add, table):
+        buttons = QHBoxLayout()
+        add_button = QPushButton("Add", self)
+        add_button.clicked.connect(lambda: add())
+        buttons.addWidget(add_button)
+        remove_button = QPushButton("Remove", self)
+        remove_button.clicked.connect(lambda: table.removeRow(table.currentRow()))
+        buttons.addWidget(remove_button)
+        buttons.addStretch()
+        return buttons
+
+    def add_node(self, node=None):
+        node = node or {'id': f"node{self.nodes_table.rowCount() + 1}", 'script': '', 'version': 0, 'arguments': []}
+        row = self.nodes_table.rowCount()
+        self.nodes_table.insertRow(row)
+        self.nodes_table.setItem(row, 0, QTableWidgetItem(node['id']))
+
+        script_combo = QComboBox(self)
+        script_combo.setEditable(True)
+        script_combo.addItems(self.script_names)
+        script_combo.setCurrentText(node.get('script', ''))
+        self.nodes_table.setCellWidget(row, 1, script_combo)
+
+        version_input = QSpinBox(self)
+        version_input.setRange(0, 100000)
+        version_input.setValue(node.get('version') or 0)
+        self.nodes_table.setCellWidget(row, 2, version_input)
+
+        self.nodes_table.setItem(row, 3, QTableWidgetItem(shlex.join(node.get('arguments') or [])))
+
+    def add_edge(self, edge=None):
+        source, target = edge or ['', '']
+        row = self.edges_table.rowCount()
+        self.edges_table.insertRow(row)
+        self.edges_table.setItem(row, 0, QTableWidgetItem(source))
+        self.edges_table.setItem(row, 1, QTableWidgetItem(target))
+
+    def cell_text(self, table, row, column):
+        item = table.item(row, column)
+        return item.text().strip() if item else ''
+
+    def get_definition(self):
+        nodes = []
+        for row in range(self.nodes_table.rowCount()):
+            nodes.append({
+                'id': self.cell_text(self.nodes_table, row, 0),
+                'script': self.nodes_table.cellWidget(row, 1).currentText().strip(),
+                'version': self.nodes_table.cellWidget(row, 2).value() or None,
+                'arguments': shlex.split(self.cell_text(self.nodes_table, row, 3))
+            })
+        edges = [[self.cell_text(self.edges_table, row, 0), self.cell_text(self.edges_table, row, 1)]
+                 for row in range(self.edges_table.rowCount())]
+        return Pipeline(self.name_input.text().strip(), nodes, edges,
+                        self.description_input.text().strip()).to_dict()
+
+    def validate_and_accept(self):
+        try:
+            definition = self.get_definition()
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Pipeline", f"Cannot parse arguments: {e}")
+            return
+        if not definition['name']:
+            QMessageBox.warning(self, "Invalid Pipeline", "Please enter a pipeline name.")
+            return
+        try:
+            Pipeline.from_dict(definition).validate()
+        except PipelineError as e:
+            QMessageBox.warning(self, "Invalid Pipeline", str(e))
+            return
+        self.accept()
+
+class PipelineDialog(QDialog):
+    """List saved pipelines; Run closes the dialog with the selected one in selected_pipeline"""
+
+    def __init__(self, script_manager, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Pipelines")
+        self.script_manager = script_manager
+        self.selected_pipeline = None
+        self.setup_ui()
+        self.refresh()
+
+    def setup_ui(self):
+        layout = QHBoxLayout(self)
+
+        self.pipeline_list = QListWidget(self)
+        self.pipeline_list.itemDoubleClicked.connect(lambda item: self.edit_pipeline())
+        layout.addWidget(self.pipeline_list)
+
+        buttons = QVBoxLayout()
+        for label, handler in [('New...', self.new_pipeline),
+                               ('Edit...', self.edit_pipeline),
+                               ('Delete', self.delete_pipeline),
+                               ('Run', self.run_pipeline)]:
+            button = QPushButton(label, self)
+            button.clicked.connect(handler)
+            buttons.addWidget(button)
+        buttons.addStretch()
+        close_button = QPushButton("Close", self)
+        close_button.clicked.connect(self.reject)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+        self.resize(500, 300)
+
+    def refresh(self):
+        self.pipeline_list.clear()
+        for filepath, definition in self.script_manager.list_pipelines():
+            label = definition.get('name', '')
+            if definition.get('description'):
+                label += f" - {definition['description']}"
+            item = QListWidgetItem(label)
+            item.setData(Qt.UserRole, (filepath, definition))
+            self.pipeline_list.addItem(item)
+
+    def current(self):
+        item = self.pipeline_list.currentItem()
+        return item.data(Qt.UserRole) if item else (None, None)
+
+    def script_names(self):
+        scripts = self.script_manager.list_scripts()
+        return sorted(f"{metadata.get('category', '')}/{metadata.get('name', '')}" for _, metadata in scripts)
+
+    def new_pipeline(self):
+        self.edit({'name': '', 'nodes': [], 'edges': []})
+
+    def edit_pipeline(self):
+        filepath, definition = self.current()
+        if definition is not None:
+            self.edit(definition, filepath)
+
+    def edit(self, definition, filepath=None):
+        dialog = PipelineEditDialog(definition, self.script_names(), self)
+        if not dialog.exec_():
+            return
+        updated = dict(definition, **dialog.get_definition())
+        new_path = self.script_manager.save_pipeline(updated)
+        if new_path is None:
+            QMessageBox.critical(self, "Error", "Failed to save pipeline")
+            return
+        if filepath and filepath != new_path:
+            # Renamed
+            self.script_manager.delete_pipeline(filepath)
+        self.refresh()
+
+    def delete_pipeline(self):
+        filepath, definition = self.current()
+        if filepath is None:
+            return
+        reply = QMessageBox.question(
+            self, "Delete Pipeline", f"Delete pipeline '{definition.get('name', '')}'?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            self.script_manager.delete_pipeline(filepath)
+            self.refresh()
+
+    def run_pipeline(self):
+        _, definition = self.current()
+        if definition is not None:
+            self.selected_pipeline = definition
+            self.accept()
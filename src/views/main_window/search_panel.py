@@ -0,0 +1,150 @@
+import re
+from PyQt5.QtWidgets import (QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
+                             QPushButton, QCheckBox, QLabel, QTreeWidget, QTreeWidgetItem)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor
+
+class ScriptSearchPanel(QDockWidget):
+    """
+    Dock widget searching the content of every saved version and the metadata
+    of all scripts. Scripts the index does not have yet are indexed in small
+    batches between events before the first search.
+    """
+    open_requested = pyqtSignal(str, int, object)  # filepath, line number, version or None for current
+    INDEX_BATCH = 20
+
+    def __init__(self, script_manager, parent=None):
+        super().__init__("Search Scripts", parent)
+        self.setObjectName("ScriptSearchPanel")
+        self.script_manager = script_manager
+        self.pending = []
+        self.indexed = 0
+        self.search_requested = False
+        self.index_timer = QTimer(self)
+        self.index_timer.setInterval(0)
+        self.index_timer.timeout.connect(self.index_batch)
+        self.setup_ui()
+
+    def setup_ui(self):
+        container = QWidget()
+        layout = QVBoxLayout(container)
+
+        query_layout = QHBoxLayout()
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Search scripts and their history")
+        self.query_input.returnPressed.connect(self.search)
+        query_layout.addWidget(self.query_input)
+        search_button = QPushButton("Search")
+        search_button.clicked.connect(self.search)
+        query_layout.addWidget(search_button)
+        layout.addLayout(query_layout)
+
+        options_layout = QHBoxLayout()
+        self.regex_check = QCheckBox("Regex")
+        options_layout.addWidget(self.regex_check)
+        self.case_check = QCheckBox("Match case")
+        options_layout.addWidget(self.case_check)
+        options_layout.addStretch()
+        self.status_label = QLabel()
+        options_layout.addWidget(self.status_label)
+        layout.addLayout(options_layout)
+
+        self.results = QTreeWidget()
+        self.results.setHeaderLabels(["Script / Line", "Where"])
+        self.results.setColumnWidth(0, 320)
+        self.results.itemActivated.connect(self.open_item)
+        layout.addWidget(self.results)
+
+        self.setWidget(container)
+
+    def focus_query(self):
+        self.show()
+        self.raise_()
+        self.query_input.setFocus()
+        self.query_input.selectAll()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.start_indexing()
+
+    def start_indexing(self):
+        """Look for scripts the index is missing and index them in the background"""
+        if self.index_timer.isActive():
+            return
+        try:
+            self.pending = self.script_manager.pending_search_updates()
+        except Exception as e:
+            print(f"Error reading search index: {e}")
+            self.pending = []
+        self.indexed = 0
+        if self.pending:
+            self.index_timer.start()
+        self.update_status()
+
+    def index_batch(self):
+        batch, self.pending = self.pending[:self.INDEX_BATCH], self.pending[self.INDEX_BATCH:]
+        for entry in batch:
+            self.script_manager.index_script(entry['filepath'])
+        self.indexed += len(batch)
+        if not self.pending:
+            self.index_timer.stop()
+            if self.search_requested:
+                self.search()
+        self.update_status()
+
+    def update_status(self):
+        if self.index_timer.isActive():
+            self.status_label.setText(f"Indexing {self.indexed}/{self.indexed + len(self.pending)}")
+        elif not self.search_requested:
+            self.status_label.setText('')
+
+    def search(self):
+        query = self.query_input.text()
+        if not query:
+            return
+        if self.index_timer.isActive():
+            # Searched once indexing is done
+            self.search_requested = True
+            return
+        self.search_requested = False
+        # Pick up scripts saved since indexing, normally just a catalog check
+        for entry in self.script_manager.pending_search_updates():
+            self.script_manager.index_script(entry['filepath'])
+        try:
+            results = self.script_manager.search_index.search(
+                query, regex=self.regex_check.isChecked(), case_sensitive=self.case_check.isChecked())
+        except re.error as e:
+            self.status_label.setText(f"Invalid regex: {e}")
+            return
+        self.show_results(results)
+
+    def show_results(self, results):
+        self.results.clear()
+        for result in results:
+            metadata = result['metadata']
+            name = metadata.get('display_name', metadata.get('name', ''))
+            script_item = QTreeWidgetItem([f"{metadata.get('category', '')}/{name}",
+                                           f"{result['hit_count']} lines"])
+            script_item.setData(0, Qt.UserRole, (result['filepath'], 1, None))
+            if result['metadata_match']:
+                script_item.setToolTip(0, metadata.get('description', ''))
+                script_item.setText(1, f"{result['hit_count']} lines, metadata")
+            for hit in result['hits']:
+                if hit['current']:
+                    where, version = 'current', None
+                else:
+                    where, version = f"v{hit['first_version']}-v{hit['last_version']}", hit['last_version']
+                hit_item = QTreeWidgetItem([f"{hit['line_number']}: {hit['text'].strip()}", where])
+                hit_item.setToolTip(0, hit['text'])
+                hit_item.setData(0, Qt.UserRole, (result['filepath'], hit['line_number'], version))
+                if version is not None:
+                    hit_item.setForeground(0, QColor('gray'))
+                script_item.addChild(hit_item)
+            self.results.addTopLevelItem(script_item)
+            script_item.setExpanded(True)
+        self.status_label.setText(f"{len(results)} scripts")
+
+    def open_item(self, item, column=0):
+        target = item.data(0, Qt.UserRole)
+        if target:
+            self.open_requested.emit(*target)
@@ -1,9 +1,19 @@
 from PyQt5.QtWidgets import (QTabWidget, QMessageBox, QInputDialog,
                              QLineEdit)
+from PyQt5.QtCore import QSettings, QTimer
+from services.benchmark import Benchmark
+from services.matrix import MatrixRun, load_parameter_rows, default_template
+from services.executor import EXECUTION_MODES
+from services.result_cache import format_age
+from services.run_history import content_hash
+from services.pipeline import Pipeline, PipelineError, resolve_sources
+from services.pipeline_run import PipelineRun
+from services.hot_reload import HotReloadSession
 from ..editor import CodeEditorTab
 from ..editor.custom_tabbar import CustomTabBar
 from ..dialogs import SaveScriptDialog, LoadScriptDialog
-from .dialogs import TabNameDialog
+from .dialogs import TabNameDialog, BenchmarkDialog, MatrixRunDialog, ResourceLimitsDialog
+from .pipeline_dialog import PipelineDialog
 import os
 import datetime
 
@@ -12,6 +22,11 @@ class TabManager:
         self.window = window
         self._unsaved_marker = " *"
         self._ignore_text_changed = False  # Flag to prevent initial load from triggering unsaved
+        # Import preloading waits until typing pauses
+        self.preload_timer = QTimer()
+        self.preload_timer.setSingleShot(True)
+        self.preload_timer.setInterval(1000)
+        self.preload_timer.timeout.connect(self.preload_imports)
         self.setup_tab_widget()
 
     def setup_tab_widget(self):
@@ -50,6 +65,8 @@ class TabManager:
         index = self.tab_widget.indexOf(tab)
         if index >= 0:
             self.update_tab_unsaved_status(index)
+        if tab is self.tab_widget.currentWidget():
+            self.preload_timer.start()
 
     def update_tab_unsaved_status(self, index):
         """Update the visual status of a tab to show unsaved changes"""
@@ -201,26 +218,49 @@ class TabManager:
             result = dialog.get_selected_script()
             if result:
                 filepath, version = result
+                self.open_script_file(filepath, version)
+
+    def open_script_file(self, filepath, version=None):
+        """Open a saved script in a tab, or switch to its tab when it is already open"""
+        for i in range(self.tab_widget.count()):
+            tab = self.tab_widget.widget(i)
+            if tab.filepath == filepath:
+                self.tab_widget.setCurrentIndex(i)
+                return tab
+
+        # Load the script with the selected version
+        content, metadata, _ = self.window.script_manager.load_script(filepath, version)
+        if content is None:
+            return None
+        self._ignore_text_changed = True  # Prevent change detection during load
+        tab = CodeEditorTab(filepath, metadata)
+        tab.editor.setPlainText(content)
+        tab.last_saved_content = content  # Set initial saved content
+        display_name = metadata.get('display_name', metadata.get('name', 'Untitled'))
+        self.tab_widget.addTab(tab, display_name)
+        self.tab_widget.setCurrentWidget(tab)
+        self.setup_text_changed_handler(self.tab_widget.indexOf(tab))
+        self._ignore_text_changed = False  # Re-enable change detection
+        return tab
 
-                # Check if already open
-                for i in range(self.tab_widget.count()):
-                    tab = self.tab_widget.widget(i)
-                    if tab.filepath == filepath:
-                        self.tab_widget.setCurrentIndex(i)
-                        return
-
-                # Load the script with the selected version
-                content, metadata, _ = self.window.script_manager.load_script(filepath, version)
-                if content is not None:
-                    self._ignore_text_changed = True  # Prevent change detection during load
-                    tab = CodeEditorTab(filepath, metadata)
-                    tab.editor.setPlainText(content)
-                    tab.last_saved_content = content  # Set initial saved content
-                    display_name = metadata.get('display_name', metadata.get('name', 'Untitled'))
-                    self.tab_widget.addTab(tab, display_name)
-                    self.tab_widget.setCurrentWidget(tab)
-                    self.setup_text_changed_handler(self.tab_widget.indexOf(tab))
-                    self._ignore_text_changed = False  # Re-enable change detection
+    def open_script_at(self, filepath, line_number, version=None):
+        """
+        Show a search hit: the script's tab at line_number, or for a line of
+        an older version that version's content in a new untitled tab
+        """
+        if version is None:
+            tab = self.open_script_file(filepath)
+        else:
+            content = self.window.script_manager.get_version_content(filepath, version)
+            if content is None:
+                return
+            name = os.path.splitext(os.path.basename(filepath))[0]
+            tab = self.new_tab()
+            tab.editor.setPlainText(content)
+            self.tab_widget.setTabText(self.tab_widget.indexOf(tab), f"{name} v{version}")
+        if tab is not None:
+            tab.goto_line(line_number)
+            tab.editor.setFocus()
 
     def close_tab(self, index):
         """Handle tab close request"""
@@ -245,6 +285,11 @@ class TabManager:
             elif reply == QMessageBox.Cancel:
                 return
 
+        if tab.current_run is not None:
+            tab.current_run.kill()
+        tab.shutdown_kernel()
+        tab.stop_watching()
+
         if self.tab_widget.count() > 1:
             self.tab_widget.removeTab(index)
         else:
@@ -275,31 +320,480 @@ class TabManager:
         """Execute current tab's code"""
         current_tab = self.tab_widget.currentWidget()
         if current_tab:
-            code = current_tab.editor.toPlainText()
-            current_tab.output_window.clear()
-            self.window.script_executor.run_script(
-                code,
-                current_tab.output_window.append
-            )
+            if current_tab.kernel_enabled:
+                self.run_in_kernel()
+            elif current_tab.metadata.get('cache_results'):
+                self.run_cached(current_tab)
+            else:
+                self.start_run(current_tab)
+
+    def run_cached(self, tab):
+        """Replay the output of an identical earlier run, or run and cache the result"""
+        if tab.current_run is not None and tab.current_run.is_running():
+            self.window.status_bar.showMessage('Script is already running - stop it first (Shift+F5)', 3000)
+            return
+        cache = self.window.result_cache
+        key = cache.key(tab.editor.toPlainText(), tab.get_script_arguments(), tab.get_cache_inputs())
+        cached = cache.get(key)
+        if cached is None:
+            self.start_run(tab, cache_key=key)
+            return
+
+        tab.output_window.clear()
+        for stream, text in cached.segments:
+            if stream == 'stderr':
+                tab.output_window.append_stderr(text)
+            else:
+                tab.output_window.append_stdout(text)
+        summary = (f"Process finished with exit code {cached.exit_code} | cached ({format_age(cached.age)}, "
+                   f"originally {cached.duration:.2f}s)")
+        tab.output_window.append_info(summary)
+        self.window.status_bar.showMessage(f"{tab.display_name}: {summary}", 10000)
+
+    def toggle_result_cache(self, enabled):
+        """Opt the current tab in or out of the result cache"""
+        current_tab = self.tab_widget.currentWidget()
+        if current_tab:
+            current_tab.metadata['cache_results'] = enabled
+            self.window.status_bar.showMessage(
+                'Result cache enabled' if enabled else 'Result cache disabled', 2000)
+
+    def set_cache_inputs(self):
+        """Edit the input files that invalidate the current tab's cached results"""
+        current_tab = self.tab_widget.currentWidget()
+        if not current_tab:
+            return
+        inputs, ok = QInputDialog.getText(
+            self.window, 'Cached Inputs',
+            'Input files read by the script (relative to the working directory):',
+            text=current_tab.metadata.get('cache_inputs', ''))
+        if ok:
+            current_tab.metadata['cache_inputs'] = inputs.strip()
+
+    def clear_result_cache(self):
+        self.window.result_cache.clear()
+        self.window.status_bar.showMessage('Result cache cleared', 2000)
 
     def run_code_with_sudo(self):
-        """Execute current tab's code with sudo privileges"""
+        """Execute current tab's code in the privileged worker, authenticating it if needed"""
         current_tab = self.tab_widget.currentWidget()
         if current_tab:
+            if self.window.script_executor.has_sudo_session():
+                self.start_run(current_tab, sudo=True)
+                return
             password, ok = QInputDialog.getText(
                 self.window, 'Sudo Password',
                 'Enter your sudo password:',
                 QLineEdit.Password)
 
             if ok:
-                code = current_tab.editor.toPlainText()
-                current_tab.output_window.clear()
-                self.window.script_executor.run_script(
-                    code,
-                    current_tab.output_window.append,
-                    sudo=True,
-                    password=password
-                )
+                # Authenticate here so the password never sits in a queued job's options
+                self.window.script_executor.get_privileged_worker(password)
+                self.start_run(current_tab, sudo=True)
+
+    def end_sudo_session(self):
+        """Stop the privileged worker; the next sudo run asks for the password again"""
+        self.window.script_executor.end_sudo_session()
+        self.window.status_bar.showMessage('Sudo session ended', 2000)
+
+    def run_with_profiler(self):
+        """Execute current tab's code under cProfile and show the hottest functions"""
+        current_tab = self.tab_widget.currentWidget()
+        if current_tab:
+            self.start_run(current_tab, instrument='profile')
+
+    def run_with_line_profiler(self):
+        """Execute current tab's code recording time per line, shown in the gutter"""
+        current_tab = self.tab_widget.currentWidget()
+        if current_tab:
+            current_tab.editor.clear_line_timings()
+            self.start_run(current_tab, instrument='lines')
+
+    def run_with_memory_profiler(self):
+        """Execute current tab's code under tracemalloc and show the top allocation sites"""
+        current_tab = self.tab_widget.currentWidget()
+        if current_tab:
+            current_tab.memory_timeline = []
+            self.start_run(current_tab, instrument='memory')
+
+    def run_benchmark(self):
+        """Run the current buffer repeatedly, optionally against a saved version"""
+        current_tab = self.tab_widget.currentWidget()
+        if not current_tab:
+            return
+        if current_tab.current_run is not None and current_tab.current_run.is_running():
+            self.window.status_bar.showMessage('Script is already running - stop it first (Shift+F5)', 3000)
+            return
+
+        settings = QSettings('PythonExecutor', 'Executor')
+        versions = []
+        if current_tab.filepath:
+            versions, _ = self.window.script_manager.get_version_headers(current_tab.filepath)
+        dialog = BenchmarkDialog(int(settings.value('benchmark_runs', 10)),
+                                 int(settings.value('benchmark_warmup', 1)),
+                                 versions, self.window)
+        if not dialog.exec_():
+            return
+        runs, warmup, version = dialog.get_values()
+        settings.setValue('benchmark_runs', runs)
+        settings.setValue('benchmark_warmup', warmup)
+
+        variants = [('Current buffer', current_tab.editor.toPlainText())]
+        if version is not None:
+            content = self.window.script_manager.get_version_content(
+                current_tab.filepath, version['version_number'])
+            if content is None:
+                QMessageBox.warning(self.window, "Benchmark",
+                                    f"Cannot read version {version['version_number']}")
+                return
+            variants.append((f"Version {version['version_number']}", content))
+
+        benchmark = Benchmark(
+            self.window.script_executor, variants, runs, warmup, current_tab,
+            filename=current_tab.get_script_filename(),
+            argv=current_tab.get_script_arguments())
+        benchmark.progress.connect(lambda done, total: self.window.status_bar.showMessage(
+            f"Benchmarking {current_tab.display_name}: run {done}/{total}"))
+        benchmark.finished.connect(lambda: self.on_benchmark_finished(current_tab, benchmark))
+
+        current_tab.output_window.clear()
+        current_tab.output_window.append_info(
+            f"Benchmarking {len(variants)} variant(s): {warmup} warmup + {runs} measured runs each")
+        current_tab.current_run = benchmark
+        benchmark.start()
+
+    def on_benchmark_finished(self, tab, benchmark):
+        tab.current_run = None
+        mode = EXECUTION_MODES.get(self.window.script_executor.default_mode, '')
+        for variant in benchmark.variants:
+            if variant.failures:
+                tab.output_window.append_stderr(
+                    f"{variant.label} failed {variant.failures} time(s), last error:\n{variant.last_error}\n")
+        if benchmark.cancelled:
+            tab.output_window.append_info("Benchmark stopped")
+        tab.results_pane.show_benchmark(benchmark.variants, benchmark.runs, benchmark.warmup, mode)
+        benchmark.deleteLater()
+        self.window.status_bar.showMessage(f"{tab.display_name}: benchmark finished", 5000)
+
+    def run_matrix(self):
+        """Run the current tab's code once per row of a CSV/JSON parameter file"""
+        current_tab = self.tab_widget.currentWidget()
+        if not current_tab:
+            return
+        if current_tab.current_run is not None and current_tab.current_run.is_running():
+            self.window.status_bar.showMessage('Script is already running - stop it first (Shift+F5)', 3000)
+            return
+
+        dialog = MatrixRunDialog(current_tab.metadata.get('matrix_file', ''),
+                                 current_tab.metadata.get('matrix_arguments', ''),
+                                 self.window.job_scheduler.max_parallel, self.window)
+        if not dialog.exec_():
+            return
+        path, template, max_parallel = dialog.get_values()
+        current_tab.metadata['matrix_file'] = path
+        current_tab.metadata['matrix_arguments'] = template
+
+        try:
+            rows = load_parameter_rows(path)
+            if not template and rows:
+                template = default_template(list(dict.fromkeys(k for row in rows for k in row)))
+            matrix = MatrixRun(self.window.script_executor, current_tab.editor.toPlainText(), rows,
+                               template, max_parallel, current_tab,
+                               filename=current_tab.get_script_filename(),
+                               limits=current_tab.get_limits())
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self.window, "Matrix Run", f"Cannot read parameter rows: {e}")
+            return
+        if not matrix.rows:
+            QMessageBox.information(self.window, "Matrix Run", "The parameter file has no rows.")
+            return
+
+        matrix.row_updated.connect(lambda row: self.on_matrix_row_updated(current_tab, matrix, row))
+        matrix.finished.connect(lambda: self.on_matrix_finished(current_tab, matrix))
+        current_tab.output_window.clear()
+        current_tab.output_window.append_info(
+            f"Matrix run: {len(matrix.rows)} rows from {os.path.basename(path)}, {max_parallel} at a time")
+        current_tab.results_pane.show_matrix(matrix)
+        current_tab.current_run = matrix
+        matrix.start()
+
+    def on_matrix_row_updated(self, tab, matrix, row):
+        tab.results_pane.update_matrix_row(matrix, row)
+        if row.exit_code is None:
+            return
+        done = sum(1 for r in matrix.rows if r.exit_code is not None)
+        arguments = ' '.join(row.argv)
+        tab.output_window.append_info(
+            f"[{done}/{len(matrix.rows)}] row {row.index} {row.status.lower()} "
+            f"(exit {row.exit_code}, {row.duration:.2f}s): {arguments}")
+        self.window.status_bar.showMessage(f"Matrix run {tab.display_name}: {done}/{len(matrix.rows)} done")
+
+    def on_matrix_finished(self, tab, matrix):
+        tab.current_run = None
+        counts = ', '.join(f"{count} {status.lower()}" for status, count in matrix.counts().items())
+        summary = f"Matrix run finished: {counts}"
+        tab.output_window.append_info(summary)
+        self.window.status_bar.showMessage(f"{tab.display_name}: {summary}", 10000)
+        matrix.deleteLater()
+
+    def run_pipeline(self):
+        """Manage saved pipelines and run the chosen one, streaming into the current tab"""
+        current_tab = self.tab_widget.currentWidget()
+        if not current_tab:
+            return
+        dialog = PipelineDialog(self.window.script_manager, self.window)
+        if not dialog.exec_() or dialog.selected_pipeline is None:
+            return
+        if current_tab.current_run is not None and current_tab.current_run.is_running():
+            self.window.status_bar.showMessage('Script is already running - stop it first (Shift+F5)', 3000)
+            return
+
+        pipeline = Pipeline.from_dict(dialog.selected_pipeline)
+        try:
+            pipeline.validate()
+            sources = resolve_sources(self.window.script_manager, pipeline)
+        except PipelineError as e:
+            QMessageBox.warning(self.window, "Pipeline", str(e))
+            return
+        run = PipelineRun(pipeline, sources, current_tab)
+        current_tab.output_window.clear()
+        current_tab.output_window.append_info(
+            f"Pipeline {pipeline.name}: {len(pipeline.nodes)} nodes, {len(pipeline.edges)} edges")
+        current_tab.results_pane.show_pipeline(run.report())
+        self.start_run(current_tab, run=run, clear_output=False)
+
+    def preload_imports(self):
+        """Have warm workers import what the current tab imports, rescanning only changed import lines"""
+        current_tab = self.tab_widget.currentWidget()
+        if not current_tab or not hasattr(self.window, 'script_executor'):
+            return
+        modules, _ = current_tab.import_scanner.scan(current_tab.editor.toPlainText())
+        if modules:
+            self.window.script_executor.preload(modules)
+
+    def run_in_kernel(self):
+        """Run the selection or current block in the tab's persistent kernel"""
+        current_tab = self.tab_widget.currentWidget()
+        if not current_tab:
+            return
+
+        code, first_line = current_tab.get_run_block()
+        if not code.strip():
+            return
+
+        kernel = current_tab.get_kernel()
+        if kernel.is_busy():
+            self.window.status_bar.showMessage('Kernel is busy - interrupt it first', 3000)
+            return
+        run = kernel.run(code, filename=current_tab.get_script_filename(), first_line=first_line)
+        last_line = first_line + code.rstrip('\n').count('\n')
+        current_tab.output_window.append_info(
+            f"In [{kernel.execution_count}]: lines {first_line}-{last_line}")
+        self.start_run(current_tab, run=run, clear_output=False)
+
+    def toggle_watch_mode(self, enabled):
+        """Re-run the current tab whenever its saved script or a local module it imports changes"""
+        current_tab = self.tab_widget.currentWidget()
+        if not current_tab:
+            return
+        if not enabled:
+            current_tab.stop_watching()
+            self.window.status_bar.showMessage('Watch mode disabled', 2000)
+            return
+        if current_tab.watch_session is None:
+            session = HotReloadSession(current_tab.filepath, current_tab)
+            session.rerun_requested.connect(lambda reloaded: self.run_watched(current_tab))
+            current_tab.watch_session = session
+        self.window.status_bar.showMessage('Watch mode enabled', 2000)
+        self.run_watched(current_tab)
+
+    def run_watched(self, tab):
+        """Run the tab in its watch session, restarting a run that is still going"""
+        session = tab.watch_session
+        if session is None:
+            return
+        if tab.current_run is not None and tab.current_run.is_running():
+            # on_run_finished starts the rerun once this run has stopped
+            session.rerun_pending = True
+            tab.current_run.cancel()
+            return
+        session.set_script_path(tab.filepath)
+        reloaded = sorted(session.invalidated)
+        run = session.run(tab.editor.toPlainText(), filename=tab.get_script_filename(),
+                          argv=tab.get_script_arguments())
+        self.start_run(tab, run=run)
+        if reloaded:
+            tab.output_window.append_info(f"Reloaded {', '.join(reloaded)}")
+
+    def toggle_kernel_mode(self, enabled):
+        """Make Run use the current tab's persistent kernel"""
+        current_tab = self.tab_widget.currentWidget()
+        if current_tab:
+            current_tab.kernel_enabled = enabled
+            if enabled:
+                current_tab.get_kernel()
+            self.window.status_bar.showMessage(
+                'Persistent kernel enabled' if enabled else 'Persistent kernel disabled', 2000)
+
+    def interrupt_kernel(self):
+        current_tab = self.tab_widget.currentWidget()
+        if current_tab and current_tab.kernel is not None:
+            current_tab.kernel.interrupt()
+
+    def restart_kernel(self):
+        current_tab = self.tab_widget.currentWidget()
+        if current_tab:
+            current_tab.get_kernel().restart()
+            current_tab.output_window.append_info('Kernel restarted')
+
+    def start_run(self, tab, run=None, clear_output=True, cache_key=None, **run_options):
+        """
+        Start a non-blocking run of the tab's code, streaming into its output window.
+        With a cache_key the output is captured and stored in the result cache
+        if the run succeeds.
+        """
+        if tab.current_run is not None and tab.current_run.is_running():
+            self.window.status_bar.showMessage('Script is already running - stop it first (Shift+F5)', 3000)
+            return None
+
+        if clear_output:
+            tab.output_window.clear()
+        output_callback = tab.output_window.append_stdout
+        error_callback = tab.output_window.append_stderr
+        tab.cache_capture = None
+        if cache_key is not None:
+            segments = []
+            tab.cache_capture = (cache_key, segments)
+            output_callback = self.capture_output(segments, 'stdout', output_callback)
+            error_callback = self.capture_output(segments, 'stderr', error_callback)
+        callbacks = dict(
+            error_callback=error_callback,
+            report_callback=tab.show_report,
+            finished_callback=lambda exit_code, duration: self.on_run_finished(tab, exit_code, duration)
+        )
+        if run is None:
+            run = self.window.job_scheduler.submit(
+                tab.display_name,
+                tab.editor.toPlainText(),
+                output_callback=output_callback,
+                filename=tab.get_script_filename(),
+                argv=tab.get_script_arguments(),
+                **callbacks,
+                **dict({'limits': tab.get_limits()}, **run_options)
+            )
+            position = self.window.job_scheduler.queue_position(run)
+            if position:
+                tab.output_window.append_info(f"Queued at position {position}")
+        else:
+            run = self.window.script_executor.execute_run(run, output_callback, **callbacks)
+        tab.current_run = run
+        self.window.status_bar.showMessage(f"Running {tab.display_name}...")
+        return run
+
+    def capture_output(self, segments, stream, callback):
+        """Wrap an output callback so the text is also collected for the result cache"""
+        def capture(text):
+            if segments and segments[-1][0] == stream:
+                segments[-1][1] += text
+            else:
+                segments.append([stream, text])
+            callback(text)
+        return capture
+
+    def on_run_finished(self, tab, exit_code, duration):
+        """Report the exit code, duration and resource usage of a finished run"""
+        run = tab.current_run
+        cancelled = run is not None and run.cancelled
+        metrics = getattr(run, 'metrics', None)
+        limit = getattr(run, 'limit_exceeded', None)
+        tab.current_run = None
+        if tab.cache_capture is not None:
+            cache_key, segments = tab.cache_capture
+            tab.cache_capture = None
+            if exit_code == 0 and not cancelled:
+                self.window.result_cache.put(cache_key, segments, exit_code, duration)
+        if cancelled:
+            summary = f"Process stopped after {duration:.2f}s"
+        elif limit:
+            summary = f"Process killed after {duration:.2f}s: exceeded {limit}"
+        elif metrics is not None and metrics.available:
+            summary = f"Process finished with exit code {exit_code} | {metrics.summary()}"
+        else:
+            summary = f"Process finished with exit code {exit_code} in {duration:.2f}s"
+        regression = None
+        if metrics is not None and not cancelled:
+            code = getattr(run, 'code', None) or tab.editor.toPlainText()
+            _, regression = self.window.run_history.record(
+                tab.display_name, code, exit_code, metrics,
+                mode=getattr(run, 'mode', None) or self.window.script_executor.default_mode,
+                filepath=tab.filepath,
+                version=self.saved_version_number(tab, code),
+                output=tab.output_window.toPlainText(),
+                instrument=getattr(run, 'instrument', None))
+        tab.output_window.append_info(summary)
+        self.window.status_bar.showMessage(f"{tab.display_name}: {summary}", 10000)
+        if regression:
+            tab.output_window.append_stderr(f"Performance regression: {regression}\n")
+            self.window.status_bar.showMessage(f"{tab.display_name}: {regression}", 10000)
+        if tab is self.tab_widget.currentWidget():
+            self.window.history_panel.show_script(tab.display_name, tab.filepath)
+        if tab.watch_session is not None and tab.watch_session.rerun_pending:
+            QTimer.singleShot(0, lambda: self.run_watched(tab))
+
+    def saved_version_number(self, tab, code):
+        """Number of the saved version of the tab's script whose content is code, if any"""
+        if not tab.filepath:
+            return None
+        script_manager = self.window.script_manager
+        code_hash = content_hash(code)
+        headers, _ = script_manager.get_version_headers(tab.filepath)
+        for header in reversed(headers):
+            if header['hash'] == code_hash:
+                return header['version_number']
+            # Versions saved before hashes were recorded
+            if header['hash'] is None and script_manager.get_version_content(
+                    tab.filepath, header['version_number']) == code:
+                return header['version_number']
+        return None
+
+    def set_script_arguments(self):
+        """Edit the sys.argv arguments passed to the current tab's script"""
+        current_tab = self.tab_widget.currentWidget()
+        if not current_tab:
+            return
+        arguments, ok = QInputDialog.getText(
+            self.window, 'Script Arguments',
+            'Arguments passed in sys.argv:',
+            text=current_tab.metadata.get('arguments', ''))
+        if ok:
+            current_tab.metadata['arguments'] = arguments.strip()
+
+    def set_resource_limits(self):
+        """Edit the memory, CPU, wall-clock and output limits of the current tab's script"""
+        current_tab = self.tab_widget.currentWidget()
+        if not current_tab:
+            return
+        dialog = ResourceLimitsDialog(current_tab.get_limits(), self.window)
+        if dialog.exec_():
+            current_tab.metadata['limits'] = dialog.get_limits()
+
+    def run_all_tabs(self):
+        """Queue every open tab; the scheduler runs them in parallel"""
+        for i in range(self.tab_widget.count()):
+            self.start_run(self.tab_widget.widget(i))
+
+    def stop_code(self):
+        """Stop the current tab's running script"""
+        current_tab = self.tab_widget.currentWidget()
+        if current_tab and current_tab.current_run is not None:
+            current_tab.current_run.cancel()
+            self.window.status_bar.showMessage('Stopping script...', 2000)
+
+    def kill_code(self):
+        """Kill the current tab's running script immediately"""
+        current_tab = self.tab_widget.currentWidget()
+        if current_tab and current_tab.current_run is not None:
+            current_tab.current_run.kill()
 
     def on_tab_changed(self, index):
         """Handle tab selection change"""
@@ -307,6 +801,11 @@ class TabManager:
             current_tab = self.tab_widget.widget(index)
             filepath = current_tab.filepath or "Untitled"
             self.window.status_bar.showMessage(f"Current file: {filepath}")
+            if hasattr(self.window, 'menu_manager'):
+                self.window.menu_manager.update_tab_actions(current_tab)
+            if hasattr(self.window, 'history_panel'):
+                self.window.history_panel.show_script(current_tab.display_name, current_tab.filepath)
+            self.preload_timer.start()
 
     def on_tab_moved(self, from_index, to_index):
         """Handle tab reordering"""
@@ -1,12 +1,18 @@
 from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import Qt, QTimer
 import os
 from services.script_manager import ScriptManager
 from services.session_manager import SessionManager
 from services.executor import ScriptExecutor
+from services.scheduler import JobScheduler
+from services.run_history import RunHistory
+from services.result_cache import ResultCache
 from .components import WindowComponents
 from .menu import MenuManager
 from .tab_manager import TabManager
+from .job_panel import JobQueuePanel
+from .history_panel import RunHistoryPanel
+from .search_panel import ScriptSearchPanel
 from ..editor import CodeEditorTab
 
 class PythonExecutor(QMainWindow):
@@ -19,6 +25,9 @@ class PythonExecutor(QMainWindow):
         self.script_manager = ScriptManager()
         self.session_manager = SessionManager(self)
         self.script_executor = ScriptExecutor()
+        self.job_scheduler = JobScheduler(self.script_executor, self)
+        self.run_history = RunHistory()
+        self.result_cache = ResultCache()
 
         # Create main layout first
         main_widget = QWidget()
@@ -35,6 +44,20 @@ class PythonExecutor(QMainWindow):
         self.tab_manager = TabManager(self)
         self.menu_manager = MenuManager(self)
 
+        # Job queue dock, hidden until requested
+        self.job_panel = JobQueuePanel(self.job_scheduler, self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.job_panel)
+        self.job_panel.hide()
+
+        self.history_panel = RunHistoryPanel(self.run_history, self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.history_panel)
+        self.history_panel.hide()
+
+        self.search_panel = ScriptSearchPanel(self.script_manager, self)
+        self.search_panel.open_requested.connect(self.tab_manager.open_script_at)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.search_panel)
+        self.search_panel.hide()
+
         # Setup the window
         self.menu_manager.create_menu_bar()
         self.components.setup_run_buttons()
@@ -126,6 +149,12 @@ class PythonExecutor(QMainWindow):
             self.tab_manager.new_tab()
 
     def closeEvent(self, event):
+        self.job_scheduler.shutdown()
+        self.script_executor.cancel_all()
+        for i in range(self.tab_manager.tab_widget.count()):
+            self.tab_manager.tab_widget.widget(i).shutdown_kernel()
+            self.tab_manager.tab_widget.widget(i).stop_watching()
         self.session_manager.save_session(self.tab_manager.tab_widget)
         self.components.save_geometry()
+        self.run_history.close()
         event.accept()
\ No newline at end of file